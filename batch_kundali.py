@@ -0,0 +1,157 @@
+# batch_kundali.py
+# Headless bulk kundali generation for events and camps.
+# Usage:
+#   python batch_kundali.py people.csv --out kundalis/
+#   python batch_kundali.py people.jsonl --zip kundalis.zip --workers 8
+#   python batch_kundali.py people.csv --zip - > kundalis.zip
+#
+# Input rows carry name, place, dob, tob and optionally tz (manual UTC offset
+# in hours; blank = from the place's timezone). CSV needs a header row; JSONL
+# is one object per line. dob: YYYY-MM-DD, DD-MM-YYYY or DD/MM/YYYY;
+# tob: HH:MM or HH:MM:SS.
+#
+# Rows are fanned out over a ProcessPoolExecutor. Input is read lazily and at
+# most workers * MAX_PENDING_PER_WORKER rows are in flight, and each finished
+# DOCX is written straight to its file / ZIP entry, so memory stays flat
+# however long the input is. Shared indexes (ingress, transit, gazetteer,
+# timezone polygons) are warmed in the parent before the pool starts.
+
+import argparse
+import csv
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from kundali_pipeline import generate_kundali, kundali_filename, request_from_record, warm_up
+
+MAX_PENDING_PER_WORKER = 4
+
+
+def read_records(path):
+    """Yield (row_no, dict) lazily from a .csv or .jsonl file ('-' = JSONL on stdin)."""
+    if path == "-":
+        f = sys.stdin
+    else:
+        f = open(path, newline="", encoding="utf-8-sig")
+    try:
+        if path.lower().endswith(".csv"):
+            for i, row in enumerate(csv.DictReader(f), 1):
+                yield i, {k.strip().lower(): v for k, v in row.items() if k}
+        else:
+            for i, line in enumerate(f, 1):
+                if line.strip():
+                    yield i, {k.lower(): v for k, v in json.loads(line).items()}
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _render(row_no, rec, api_key):
+    """Worker task: (row_no, filename, docx bytes, seconds) or (row_no, name, None, error)."""
+    t0 = time.perf_counter()
+    try:
+        req = request_from_record(rec)
+        data = generate_kundali(req, api_key)
+        return row_no, f"{row_no:05d}_{kundali_filename(req.name)}", data, time.perf_counter() - t0
+    except Exception as e:
+        return row_no, rec.get("name"), None, f"{type(e).__name__}: {e}"
+
+
+class _DirWriter:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.out_dir, filename), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class _ZipWriter:
+    """Entries are compressed and flushed as they arrive; '-' streams the ZIP to stdout."""
+
+    def __init__(self, path):
+        self._zf = zipfile.ZipFile(sys.stdout.buffer if path == "-" else path, "w",
+                                   compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, filename, data):
+        self._zf.writestr(filename, data)
+
+    def close(self):
+        self._zf.close()
+
+
+def run_batch(records, writer, api_key="", workers=None, log=sys.stderr):
+    """Generate every record through a process pool; returns the summary dict."""
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * MAX_PENDING_PER_WORKER
+    ok = failed = 0
+    durations, failures = [], []
+    t_start = time.perf_counter()
+    warm_up()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        def drain():
+            nonlocal ok, failed
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                row_no, filename, data, info = fut.result()
+                if data is None:
+                    failed += 1
+                    failures.append((row_no, filename, info))
+                    print(f"row {row_no}: {info}", file=log)
+                    continue
+                writer.write(filename, data)
+                ok += 1
+                durations.append(info)
+
+        for row_no, rec in records:
+            pending.add(pool.submit(_render, row_no, rec, api_key))
+            if len(pending) >= max_pending:
+                drain()
+        while pending:
+            drain()
+    writer.close()
+
+    elapsed = time.perf_counter() - t_start
+    durations.sort()
+    return {
+        'ok': ok, 'failed': failed, 'workers': workers, 'elapsed_s': elapsed,
+        'docs_per_s': ok / elapsed if elapsed > 0 else 0.0,
+        'mean_doc_s': statistics.fmean(durations) if durations else 0.0,
+        'p95_doc_s': durations[math.ceil(0.95 * len(durations)) - 1] if durations else 0.0,  # nearest rank
+        'failures': failures,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate kundali DOCX files in bulk.")
+    ap.add_argument("input", help=".csv or .jsonl with name, place, dob, tob[, tz] ('-' = JSONL on stdin)")
+    dest = ap.add_mutually_exclusive_group(required=True)
+    dest.add_argument("--out", help="directory for the .docx files")
+    dest.add_argument("--zip", help="write one ZIP instead ('-' = stdout)")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--api-key", default=os.environ.get("GEOAPIFY_API_KEY", ""),
+                    help="Geoapify key for places missing from the offline gazetteer")
+    args = ap.parse_args(argv)
+
+    writer = _ZipWriter(args.zip) if args.zip else _DirWriter(args.out)
+    s = run_batch(read_records(args.input), writer, args.api_key, args.workers)
+    print(f"{s['ok']} generated, {s['failed']} failed in {s['elapsed_s']:.1f}s with {s['workers']} workers: "
+          f"{s['docs_per_s']:.1f} docs/s, mean {s['mean_doc_s'] * 1000:.0f} ms/doc, "
+          f"p95 {s['p95_doc_s'] * 1000:.0f} ms/doc", file=sys.stderr)
+    return 1 if s['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
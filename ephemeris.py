@@ -0,0 +1,344 @@
+# ephemeris.py
+# Swiss Ephemeris access for MRIDAASTRO (sidereal / Lahiri, mean node).
+# Usage:
+#   from ephemeris import sidereal_positions, ascendant_sign, sidereal_positions_batch
+#   jd, ay, sidelons = sidereal_positions(dt_utc)          # one chart, dict per planet
+#   batch = sidereal_positions_batch(dts_utc, lats, lons)   # many charts, NumPy columns
+#   batch = sidereal_positions_interp(dts_utc, lats, lons)  # very many: daily anchors, interpolated
+#   cache_stats()                                           # {'hits':..,'misses':..,...}
+#
+# The batch API sets the Swiss Ephemeris state once and walks the bodies in the
+# outer loop, so thousands of charts cost one set_sid_mode call and 8 tight
+# calc_ut loops instead of 8 scattered calls + a mode reset per chart.
+#
+# Single-chart calls go through a process-wide LRU (shared by every Streamlit
+# session) keyed on (Julian day rounded to JD_PRECISION digits, body, flags).
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+import datetime
+import os
+import threading
+
+import numpy as np
+
+# --- Swiss Ephemeris import (with fallback) ---
+try:
+    import swisseph as swe  # pip install pyswisseph
+except Exception:
+    try:
+        import pyswisseph as swe  # alternate package name on some envs
+    except Exception:
+        swe = None  # will guard later if truly unavailable
+# --- End swe import ---
+
+AYANAMSHA_VAL = swe.SIDM_LAHIRI if swe is not None else 1
+
+# Planet order used everywhere in the app (Ke is derived from Ra, not computed)
+PLANET_CODES = ('Su', 'Mo', 'Ma', 'Me', 'Ju', 'Ve', 'Sa', 'Ra', 'Ke')
+_BODIES = (
+    ('Su', 'SUN'), ('Mo', 'MOON'), ('Ma', 'MARS'), ('Me', 'MERCURY'),
+    ('Ju', 'JUPITER'), ('Ve', 'VENUS'), ('Sa', 'SATURN'), ('Ra', 'MEAN_NODE'),
+)
+
+# Julian day of the Unix epoch (1970-01-01T00:00 UT)
+_JD_UNIX_EPOCH = 2440587.5
+
+# Where derived ephemeris tables (transit table, ingress index) are persisted
+CACHE_DIR = os.environ.get(
+    "MRIDAASTRO_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+
+def _require_swe():
+    if swe is None:
+        raise RuntimeError("Swiss Ephemeris not available. Install pyswisseph.")
+
+
+def set_sidereal_locked():
+    _require_swe()
+    swe.set_sid_mode(AYANAMSHA_VAL, 0, 0)
+
+
+def sidereal_flags():
+    return swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
+
+
+def julday_utc(dt_utc):
+    """Julian day (UT) for a naive UTC datetime."""
+    return swe.julday(dt_utc.year, dt_utc.month, dt_utc.day,
+                      dt_utc.hour + dt_utc.minute/60 + dt_utc.second/3600)
+
+
+# ===== Memoized ephemeris layer =====
+
+# Digits of the Julian day kept in cache keys: 5 -> ~0.9 s, 3 -> ~1.4 min, 2 -> ~14 min
+JD_PRECISION = int(os.environ.get("MRIDAASTRO_EPH_JD_PRECISION", "5"))
+EPH_CACHE_SIZE = int(os.environ.get("MRIDAASTRO_EPH_CACHE_SIZE", "4096"))
+
+
+class EphemerisCache:
+    """Thread-safe bounded LRU for Swiss Ephemeris results with hit/miss counters."""
+
+    def __init__(self, maxsize=EPH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()  # outside the lock: swe calls can be slow on cold files
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data),
+                    'maxsize': self.maxsize, 'hit_rate': (self.hits / total) if total else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear(); self.hits = 0; self.misses = 0
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_CACHE = EphemerisCache()
+
+
+def configure_cache(maxsize=None, jd_precision=None):
+    """Change the shared cache bound and/or the default Julian-day rounding."""
+    global JD_PRECISION
+    if maxsize is not None:
+        _CACHE.resize(int(maxsize))
+    if jd_precision is not None:
+        JD_PRECISION = int(jd_precision)
+
+
+def cache_stats():
+    return _CACHE.stats()
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
+def _round_jd(jd, precision):
+    return round(jd, JD_PRECISION if precision is None else precision)
+
+
+def calc_ut_cached(jd, body, flags, precision=None):
+    """swe.calc_ut through the shared LRU; evaluated at the rounded Julian day."""
+    jd_r = _round_jd(jd, precision)
+    def compute():
+        set_sidereal_locked()
+        xx, _ = swe.calc_ut(jd_r, body, flags)
+        return tuple(xx)
+    return _CACHE.get_or_compute((jd_r, body, flags), compute)
+
+
+def ayanamsa_ut_cached(jd, precision=None):
+    """swe.get_ayanamsa_ut through the shared LRU (keyed on the locked sidereal mode)."""
+    jd_r = _round_jd(jd, precision)
+    def compute():
+        set_sidereal_locked()
+        return swe.get_ayanamsa_ut(jd_r)
+    return _CACHE.get_or_compute((jd_r, 'ayanamsa', AYANAMSHA_VAL), compute)
+
+
+def _compute_positions(jd_r, flags, precision):
+    out = {}
+    for code, body in _BODIES:
+        xx = calc_ut_cached(jd_r, getattr(swe, body), flags, precision)  # Mean node locked for Ra
+        out[code] = xx[0] % 360.0
+    out['Ke'] = (out['Ra'] + 180.0) % 360.0
+    return ayanamsa_ut_cached(jd_r, precision), out
+
+
+def sidereal_positions(dt_utc, jd_precision=None):
+    """Return (jd, ayanamsa, {code: sidereal longitude}) for one UTC moment.
+
+    Planet positions and ayanamsa come from the shared cache, evaluated at the
+    Julian day rounded to jd_precision digits (default JD_PRECISION); the
+    returned jd is the exact one so the ascendant stays precise.
+    """
+    _require_swe()
+    jd = julday_utc(dt_utc)
+    flags = sidereal_flags()
+    jd_r = _round_jd(jd, jd_precision)
+    ay, out = _CACHE.get_or_compute((jd_r, 'chart', flags),
+                                    lambda: _compute_positions(jd_r, flags, jd_precision))
+    return jd, ay, dict(out)
+
+
+def ascendant_sign(jd, lat, lon, ay):
+    cusps, ascmc = swe.houses_ex(jd, lat, lon, b'P'); asc_trop = ascmc[0]; asc_sid = (asc_trop - ay) % 360.0
+    return int(asc_sid // 30) + 1, asc_sid
+
+
+# ===== Batch API =====
+
+class EphemerisBatch(NamedTuple):
+    """Columnar result of sidereal_positions_batch.
+
+    lon / speed have shape (N, 9) with columns in PLANET_CODES order;
+    asc_sid / lagna_sign are None when no coordinates were given.
+    """
+    jd: np.ndarray
+    ayanamsa: np.ndarray
+    lon: np.ndarray
+    speed: np.ndarray
+    asc_sid: Optional[np.ndarray] = None
+    lagna_sign: Optional[np.ndarray] = None
+    codes: tuple = PLANET_CODES
+
+    def column(self, code):
+        """Sidereal longitudes of one planet across the batch."""
+        return self.lon[:, self.codes.index(code)]
+
+    def sidelons(self, i):
+        """Per-chart dict view, matching sidereal_positions()[2]."""
+        return {c: float(v) for c, v in zip(self.codes, self.lon[i])}
+
+
+def julday_utc_array(dts_utc):
+    """Vectorised Julian day (UT) for naive UTC datetimes or datetime64 values."""
+    arr = np.asarray(dts_utc, dtype='datetime64[us]')
+    micros = arr.astype(np.int64).astype(np.float64)
+    return micros / 86400e6 + _JD_UNIX_EPOCH
+
+
+def datetime_from_jd(jd):
+    """Naive UTC datetime for a Julian day (UT); inverse of julday_utc."""
+    return datetime.datetime(1970, 1, 1) + datetime.timedelta(days=float(jd) - _JD_UNIX_EPOCH)
+
+
+def datetime64_from_jd(jd):
+    """datetime64[us] array for Julian days (UT); inverse of julday_utc_array."""
+    micros = np.rint((np.asarray(jd, dtype=np.float64) - _JD_UNIX_EPOCH) * 86400e6).astype(np.int64)
+    return micros.astype('datetime64[us]')
+
+
+def sidereal_longitude_batch(jd, code):
+    """Sidereal longitudes of one planet for an array of Julian days (UT)."""
+    _require_swe()
+    jd = np.asarray(jd, dtype=np.float64).ravel()
+    body = dict(_BODIES)['Ra' if code == 'Ke' else code]
+    body_id = getattr(swe, body)
+    set_sidereal_locked(); flags = sidereal_flags()
+    calc_ut = swe.calc_ut
+    out = np.empty(jd.shape[0], dtype=np.float64)
+    for i in range(jd.shape[0]):
+        out[i] = calc_ut(jd[i], body_id, flags)[0][0]
+    if code == 'Ke':
+        out += 180.0
+    return out % 360.0
+
+
+def sidereal_positions_batch(dts_utc, lat=None, lon=None):
+    """Compute sidereal positions for many UTC moments in one call.
+
+    Bypasses the single-chart LRU: batch inputs rarely repeat and would only
+    evict the hot entries the app relies on.
+    dts_utc: sequence of naive UTC datetimes or a datetime64 array.
+    lat/lon: optional scalars or arrays (broadcast to the batch) for the ascendant.
+    """
+    _require_swe()
+    jd = julday_utc_array(dts_utc).ravel()
+    n = jd.shape[0]
+    lons = np.empty((n, len(PLANET_CODES)), dtype=np.float64)
+    speeds = np.empty((n, len(PLANET_CODES)), dtype=np.float64)
+    ay = np.empty(n, dtype=np.float64)
+
+    set_sidereal_locked(); flags = sidereal_flags()
+    calc_ut = swe.calc_ut
+    for col, (_code, body) in enumerate(_BODIES):
+        body_id = getattr(swe, body)
+        lon_col = lons[:, col]; spd_col = speeds[:, col]
+        for i in range(n):
+            xx, _ = calc_ut(jd[i], body_id, flags)
+            lon_col[i] = xx[0]; spd_col[i] = xx[3]
+    get_ay = swe.get_ayanamsa_ut
+    for i in range(n):
+        ay[i] = get_ay(jd[i])
+
+    lons %= 360.0
+    ke = PLANET_CODES.index('Ke'); ra = PLANET_CODES.index('Ra')
+    lons[:, ke] = (lons[:, ra] + 180.0) % 360.0
+    speeds[:, ke] = speeds[:, ra]
+
+    asc_sid = lagna = None
+    if lat is not None and lon is not None:
+        asc_sid, lagna = ascendant_batch(jd, ay, lat, lon)
+
+    return EphemerisBatch(jd=jd, ayanamsa=ay, lon=lons, speed=speeds,
+                          asc_sid=asc_sid, lagna_sign=lagna)
+
+
+def ascendant_batch(jd, ay, lat, lon):
+    """(asc_sid, lagna_sign) arrays for Julian days (UT) with their ayanamsas; lat/lon broadcast."""
+    _require_swe()
+    n = jd.shape[0]
+    lat_a = np.broadcast_to(np.asarray(lat, dtype=np.float64), (n,))
+    lon_a = np.broadcast_to(np.asarray(lon, dtype=np.float64), (n,))
+    asc_trop = np.empty(n, dtype=np.float64)
+    houses_ex = swe.houses_ex
+    for i in range(n):
+        _cusps, ascmc = houses_ex(jd[i], lat_a[i], lon_a[i], b'P')
+        asc_trop[i] = ascmc[0]
+    asc_sid = (asc_trop - ay) % 360.0
+    return asc_sid, (asc_sid // 30).astype(np.int64) + 1
+
+
+def sidereal_positions_interp(dts_utc, lat=None, lon=None, anchor_days=1.0):
+    """sidereal_positions_batch for large samples: exact positions on an anchor grid, interpolated.
+
+    Planets are computed only at multiples of anchor_days spanning the batch
+    and each chart is filled in by cubic Hermite interpolation from the two
+    neighbouring anchors (longitudes plus daily speeds). With daily anchors
+    the Moon stays within a few thousandths of a degree, the other grahas far
+    closer; the ascendant is still computed exactly per chart.
+    """
+    jd = julday_utc_array(dts_utc).ravel()
+    if jd.shape[0] == 0:
+        return sidereal_positions_batch(dts_utc, lat, lon)
+    k0 = np.floor(jd.min() / anchor_days)
+    k = np.arange(k0, np.floor(jd.max() / anchor_days) + 2)
+    grid = sidereal_positions_batch(datetime64_from_jd(k * anchor_days))
+
+    i = np.minimum((np.floor(jd / anchor_days) - k0).astype(np.intp), k.shape[0] - 2)
+    t = ((jd - k[i] * anchor_days) / anchor_days)[:, None]
+    p0, v0 = grid.lon[i], grid.speed[i] * anchor_days
+    p1, v1 = grid.lon[i + 1], grid.speed[i + 1] * anchor_days
+    p1 = p0 + (p1 - p0 + 180.0) % 360.0 - 180.0        # shortest way round (no wrap at 360)
+    t2, t3 = t * t, t * t * t
+    lons = ((2 * t3 - 3 * t2 + 1) * p0 + (t3 - 2 * t2 + t) * v0
+            + (-2 * t3 + 3 * t2) * p1 + (t3 - t2) * v1) % 360.0
+    speeds = (1 - t) * grid.speed[i] + t * grid.speed[i + 1]
+    ke = PLANET_CODES.index('Ke'); ra = PLANET_CODES.index('Ra')
+    lons[:, ke] = (lons[:, ra] + 180.0) % 360.0
+    tt = t[:, 0]
+    ay = (1 - tt) * grid.ayanamsa[i] + tt * grid.ayanamsa[i + 1]
+
+    asc_sid = lagna = None
+    if lat is not None and lon is not None:
+        asc_sid, lagna = ascendant_batch(jd, ay, lat, lon)
+
+    return EphemerisBatch(jd=jd, ayanamsa=ay, lon=lons, speed=speeds,
+                          asc_sid=asc_sid, lagna_sign=lagna)
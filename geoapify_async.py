@@ -0,0 +1,215 @@
+# geoapify_async.py
+# asyncio Geoapify geocoding client: pooled keep-alive connections, request
+# coalescing, a concurrency cap and a token-bucket rate limit.
+# Usage:
+#   client = AsyncGeoapifyClient(api_key)
+#   lat, lon, formatted = await client.geocode("Jaipur, Rajasthan, India")
+#   # from synchronous code (Streamlit sessions, workers):
+#   lat, lon, formatted = geocode_blocking("Jaipur, Rajasthan, India", api_key)
+#
+# Concurrent lookups of the same place (same coalescing key) share one
+# in-flight request. At most max_connections requests run at once, each on a
+# persistent http.client connection taken from a small LIFO pool, and requests
+# start no faster than the token bucket allows (Geoapify's free plan allows
+# 5 requests/s). The blocking bridge runs one event loop on a daemon thread
+# so that every session in the process shares the pool, limiter and
+# in-flight table.
+
+from __future__ import annotations
+import asyncio
+import collections
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+GEOAPIFY_BASE_URL = os.environ.get("MRIDAASTRO_GEOAPIFY_URL", "https://api.geoapify.com")
+GEOAPIFY_TIMEOUT_S = 15
+GEOAPIFY_MAX_CONNECTIONS = int(os.environ.get("MRIDAASTRO_GEOAPIFY_MAX_CONNECTIONS", "4"))
+GEOAPIFY_RATE_PER_S = float(os.environ.get("MRIDAASTRO_GEOAPIFY_RATE_PER_S", "5"))
+GEOAPIFY_BURST = int(os.environ.get("MRIDAASTRO_GEOAPIFY_BURST", "5"))
+
+
+# What a reused keep-alive connection raises when the server has already closed it
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+def coalesce_key(place):
+    return " ".join((place or "").lower().split())
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens/s, holding at most `burst`."""
+
+    def __init__(self, rate=GEOAPIFY_RATE_PER_S, burst=GEOAPIFY_BURST):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:  # waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, reused most-recent first."""
+
+    def __init__(self, base_url=GEOAPIFY_BASE_URL, size=GEOAPIFY_MAX_CONNECTIONS, timeout=GEOAPIFY_TIMEOUT_S):
+        u = urllib.parse.urlsplit(base_url)
+        self._cls = http.client.HTTPSConnection if u.scheme == "https" else http.client.HTTPConnection
+        self.host, self.port, self.timeout, self.size = u.hostname, u.port, timeout, size
+        self._idle = collections.deque()
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def get(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.opened += 1
+        return self._cls(self.host, self.port, timeout=self.timeout)
+
+    def put(self, conn):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+
+
+class AsyncGeoapifyClient:
+    """Geoapify /v1/geocode/search with pooling, coalescing, a concurrency cap and rate limiting."""
+
+    def __init__(self, api_key, base_url=GEOAPIFY_BASE_URL, max_connections=GEOAPIFY_MAX_CONNECTIONS,
+                 rate_per_s=GEOAPIFY_RATE_PER_S, burst=GEOAPIFY_BURST, timeout=GEOAPIFY_TIMEOUT_S):
+        self.api_key = api_key
+        self._pool = _ConnectionPool(base_url, max_connections, timeout)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="geoapify")
+        self._sem = asyncio.Semaphore(max_connections)
+        self._bucket = TokenBucket(rate_per_s, burst)
+        self._inflight = {}
+        self.requests = self.coalesced = self.errors = 0
+
+    async def geocode(self, place, key=None):
+        """(lat, lon, formatted) for place; joins an identical in-flight lookup if there is one."""
+        if not self.api_key:
+            raise RuntimeError("Geoapify key missing. Add GEOAPIFY_API_KEY in Secrets.")
+        key = key or coalesce_key(place)
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            return await asyncio.shield(fut)
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await self._fetch(place)
+        except BaseException as e:
+            self.errors += 1
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved: there may be no other waiter
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _fetch(self, place):
+        async with self._sem:
+            await self._bucket.acquire()
+            self.requests += 1
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._request, place)
+
+    def _request(self, place):
+        q = urllib.parse.urlencode({"text": place, "format": "json", "limit": 1, "apiKey": self.api_key})
+        path = "/v1/geocode/search?" + q
+        for attempt in (0, 1):
+            conn = self._pool.get()
+            reused = conn.sock is not None   # http.client connects lazily: a new one has no socket yet
+            try:
+                conn.request("GET", path, headers={"Accept": "application/json"})
+                resp = conn.getresponse()
+                body = resp.read()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if attempt or not reused:
+                    raise
+                continue  # the server closed an idle keep-alive connection: retry once on a fresh one
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                raise     # timeouts and the rest: never retried, the caller's deadline covers one attempt
+            if resp.will_close:
+                conn.close()
+            else:
+                self._pool.put(conn)
+            if resp.status != 200:
+                raise RuntimeError(f"Geoapify error {resp.status}.")
+            j = json.loads(body.decode())
+            if j.get("results"):
+                res = j["results"][0]
+                return float(res["lat"]), float(res["lon"]), res.get("formatted", place)
+            raise RuntimeError("Place not found.")
+
+    def stats(self):
+        return {'requests': self.requests, 'coalesced': self.coalesced, 'errors': self.errors,
+                'inflight': len(self._inflight), 'connections_opened': self._pool.opened}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._pool.close()
+
+
+_LOOP = None
+_CLIENTS = {}
+_LOCK = threading.Lock()
+
+
+def _background_loop():
+    global _LOOP
+    if _LOOP is None:
+        with _LOCK:
+            if _LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="geoapify-loop", daemon=True).start()
+                _LOOP = loop
+    return _LOOP
+
+
+def get_geoapify_client(api_key):
+    """Process-wide client for this key, bound to the background loop."""
+    client = _CLIENTS.get(api_key)
+    if client is None:
+        loop = _background_loop()
+
+        async def make():
+            return AsyncGeoapifyClient(api_key)
+        with _LOCK:
+            client = _CLIENTS.get(api_key)
+            if client is None:
+                client = _CLIENTS[api_key] = asyncio.run_coroutine_threadsafe(make(), loop).result()
+    return client
+
+
+def geocode_blocking(place, api_key, key=None, timeout=GEOAPIFY_TIMEOUT_S * 2):
+    """Synchronous geocode through the shared async client (safe from any thread)."""
+    if not api_key:
+        raise RuntimeError("Geoapify key missing. Add GEOAPIFY_API_KEY in Secrets.")
+    client = get_geoapify_client(api_key)
+    return asyncio.run_coroutine_threadsafe(client.geocode(place, key), _background_loop()).result(timeout)
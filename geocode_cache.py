@@ -0,0 +1,126 @@
+# geocode_cache.py
+# Persistent SQLite cache in front of the Geoapify geocoder.
+# Usage:
+#   from geocode_cache import get_geocode_cache
+#   lat, lon, formatted = get_geocode_cache().fetch(place, lambda: geocode_geoapify(place, key))
+#   get_geocode_cache().stats()   # hits / stale_served / misses / errors / size
+#
+# Entries are keyed on the normalized place string. Fresh entries (younger than
+# the TTL) skip the network; expired ones are refreshed, and if Geoapify times
+# out or errors the stale entry is served instead of failing generation.
+# The table is trimmed to max_entries by least-recent access.
+
+from __future__ import annotations
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+
+from ephemeris import CACHE_DIR
+
+GEOCODE_CACHE_DB = os.environ.get("MRIDAASTRO_GEOCODE_DB", os.path.join(CACHE_DIR, "geocode.sqlite3"))
+GEOCODE_TTL_S = int(os.environ.get("MRIDAASTRO_GEOCODE_TTL_DAYS", "30")) * 86400
+GEOCODE_MAX_ENTRIES = int(os.environ.get("MRIDAASTRO_GEOCODE_MAX_ENTRIES", "5000"))
+
+
+class GeocodeCache:
+    """Thread-safe SQLite store of place -> (lat, lon, formatted) with TTL and size limit."""
+
+    def __init__(self, path=GEOCODE_CACHE_DB, ttl_s=GEOCODE_TTL_S, max_entries=GEOCODE_MAX_ENTRIES):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.hits = self.stale_served = self.misses = self.errors = 0
+        self._lock = threading.Lock()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with self._connect() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS geocode ("
+                        " key TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL,"
+                        " formatted TEXT, created REAL NOT NULL, accessed REAL NOT NULL)")
+            con.execute("CREATE INDEX IF NOT EXISTS geocode_accessed ON geocode(accessed)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """A connection for one transaction (committed unless it raises), closed afterwards."""
+        con = sqlite3.connect(self.path, timeout=5)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def get(self, key):
+        """Return ((lat, lon, formatted), is_fresh) or None."""
+        with self._lock, self._connect() as con:
+            row = con.execute("SELECT lat, lon, formatted, created FROM geocode WHERE key=?", (key,)).fetchone()
+            if row is None:
+                return None
+            con.execute("UPDATE geocode SET accessed=? WHERE key=?", (time.time(), key))
+        lat, lon, formatted, created = row
+        return (lat, lon, formatted), (time.time() - created) < self.ttl_s
+
+    def put(self, key, value):
+        lat, lon, formatted = value
+        now = time.time()
+        with self._lock, self._connect() as con:
+            con.execute("INSERT OR REPLACE INTO geocode(key, lat, lon, formatted, created, accessed)"
+                        " VALUES (?, ?, ?, ?, ?, ?)", (key, float(lat), float(lon), formatted, now, now))
+            con.execute("DELETE FROM geocode WHERE key IN (SELECT key FROM geocode"
+                        " ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def fetch(self, key, compute):
+        """Cached value for key; compute() on miss/expiry, stale entry if compute() fails."""
+        try:
+            cached = self.get(key)
+        except sqlite3.Error:
+            cached = None  # unreadable cache behaves like a miss
+        if cached is not None and cached[1]:
+            self._count('hits')
+            return cached[0]
+        try:
+            value = compute()
+        except Exception:
+            self._count('errors')
+            if cached is not None:
+                self._count('stale_served')
+                return cached[0]
+            raise
+        self._count('misses')
+        try:
+            self.put(key, value)
+        except sqlite3.Error:
+            pass  # a cache write failure must never fail the lookup
+        return value
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        try:
+            with self._connect() as con:
+                size = con.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        return {'hits': self.hits, 'stale_served': self.stale_served, 'misses': self.misses,
+                'errors': self.errors, 'size': size, 'max_entries': self.max_entries, 'ttl_s': self.ttl_s}
+
+
+_CACHE = None
+_LOCK = threading.Lock()
+
+
+def get_geocode_cache():
+    """Shared cache instance, or None if the cache dir is not writable."""
+    global _CACHE
+    if _CACHE is None:
+        with _LOCK:
+            if _CACHE is None:
+                try:
+                    _CACHE = GeocodeCache()
+                except (OSError, sqlite3.Error):
+                    _CACHE = False
+    return _CACHE or None
@@ -0,0 +1,171 @@
+# geocoding.py
+# Place-of-birth lookup for MRIDAASTRO.
+# Usage:
+#   from geocoding import geocode, resolve_place
+#   lat, lon, formatted = geocode("Jaipur, Rajasthan, India", api_key)
+#   rp = resolve_place("Jaipur, Rajasthan, India", api_key)   # + rp.tz_name
+#
+# Lookups go to a bundled offline gazetteer first (assets/gazetteer.csv:
+# city, state, country, lat, lon, IANA timezone, aliases), held in memory as a
+# dict for exact names plus a sorted key list for bisect prefix search.
+# Geoapify is only called for names the gazetteer does not know, through the
+# persistent cache in geocode_cache.py (TTL, stale-on-error) and the pooled,
+# coalescing client in geoapify_async.py.
+
+from __future__ import annotations
+import bisect
+import csv
+import os
+import re
+import threading
+from typing import NamedTuple
+
+from geoapify_async import geocode_blocking
+from geocode_cache import get_geocode_cache
+from tz_resolver import DEFAULT_TZ, timezone_at
+
+GAZETTEER_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "gazetteer.csv")
+
+# Common ways users write the country part of a place
+COUNTRY_ALIASES = {
+    'in': 'india', 'bharat': 'india', 'hindustan': 'india',
+    'us': 'united states', 'usa': 'united states', 'united states of america': 'united states',
+    'uk': 'united kingdom', 'great britain': 'united kingdom', 'england': 'united kingdom',
+    'uae': 'united arab emirates', 'ksa': 'saudi arabia',
+}
+
+
+class GazetteerEntry(NamedTuple):
+    city: str
+    state: str
+    country: str
+    lat: float
+    lon: float
+    tz: str
+
+    @property
+    def formatted(self):
+        parts = [self.city]
+        if self.state and self.state != self.city:
+            parts.append(self.state)
+        parts.append(self.country)
+        return ", ".join(parts)
+
+
+def normalize_place(place):
+    """Lower-case, drop punctuation except commas, collapse whitespace around parts."""
+    s = re.sub(r"[^\w\s,]", " ", (place or "").lower())
+    parts = [" ".join(p.split()) for p in s.split(",")]
+    return ", ".join(p for p in parts if p)
+
+
+class OfflineGazetteer:
+    """In-memory place index: exact lookups by city/qualifiers, prefix search by bisect."""
+
+    def __init__(self, entries, aliases=None):
+        self.entries = list(entries)
+        self._by_city = {}
+        for i, e in enumerate(self.entries):
+            self._by_city.setdefault(normalize_place(e.city), []).append(i)
+        for alias, i in (aliases or []):
+            self._by_city.setdefault(normalize_place(alias), []).append(i)
+        # Full "city, state, country" keys (and alias variants) for prefix search
+        keyed = set()
+        for name, idxs in self._by_city.items():
+            for i in idxs:
+                e = self.entries[i]
+                keyed.add((normalize_place(f"{name}, {e.state}, {e.country}"), i))
+                keyed.add((normalize_place(f"{name}, {e.country}"), i))
+        self._keys = sorted(keyed)
+        self._key_strs = [k for k, _ in self._keys]
+
+    @classmethod
+    def from_csv(cls, path=GAZETTEER_CSV):
+        entries, aliases = [], []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                entries.append(GazetteerEntry(row['city'], row['state'], row['country'],
+                                              float(row['lat']), float(row['lon']), row['tz']))
+                for a in filter(None, (row.get('aliases') or '').split('|')):
+                    aliases.append((a, len(entries) - 1))
+        return cls(entries, aliases)
+
+    def _matches(self, e, qualifier):
+        q = COUNTRY_ALIASES.get(qualifier, qualifier)
+        return q in (normalize_place(e.state), normalize_place(e.country))
+
+    def lookup(self, place):
+        """Best entry for "City[, State][, Country]", or None if unknown/ambiguous-by-qualifier."""
+        parts = normalize_place(place).split(", ")
+        idxs = self._by_city.get(parts[0])
+        if not idxs:
+            return None
+        quals = parts[1:]
+        for i in idxs:  # file order = preference order (bigger cities first)
+            e = self.entries[i]
+            if all(self._matches(e, q) for q in quals):
+                return e
+        return None
+
+    def complete(self, prefix, limit=10):
+        """Entries whose "city, state, country" key starts with prefix (for suggestions)."""
+        p = normalize_place(prefix)
+        out, seen = [], set()
+        j = bisect.bisect_left(self._key_strs, p)
+        while j < len(self._keys) and self._key_strs[j].startswith(p) and len(out) < limit:
+            i = self._keys[j][1]
+            if i not in seen:
+                seen.add(i); out.append(self.entries[i])
+            j += 1
+        return out
+
+
+_GAZETTEER = None
+_GAZ_LOCK = threading.Lock()
+
+
+def get_gazetteer():
+    """Shared gazetteer, loaded once per process (empty if the CSV is missing)."""
+    global _GAZETTEER
+    if _GAZETTEER is None:
+        with _GAZ_LOCK:
+            if _GAZETTEER is None:
+                try:
+                    _GAZETTEER = OfflineGazetteer.from_csv()
+                except Exception:
+                    _GAZETTEER = OfflineGazetteer([])
+    return _GAZETTEER
+
+
+def geocode_geoapify(place, api_key):
+    """Geoapify lookup through the shared pooled, rate-limited client (one request per place in flight)."""
+    return geocode_blocking(place, api_key, key=normalize_place(place))
+
+
+def geocode(place, api_key):
+    """(lat, lon, formatted) from the offline gazetteer, falling back to Geoapify."""
+    e = get_gazetteer().lookup(place)
+    if e is not None:
+        return e.lat, e.lon, e.formatted
+    cache = get_geocode_cache()
+    if cache is None:
+        return geocode_geoapify(place, api_key)
+    return cache.fetch(normalize_place(place), lambda: geocode_geoapify(place, api_key))
+
+
+class ResolvedPlace(NamedTuple):
+    """One geocode result with its IANA timezone, reused for UTC offset and generation."""
+    query: str
+    lat: float
+    lon: float
+    formatted: str
+    tz_name: str
+
+
+def resolve_place(place, api_key):
+    """Geocode once and attach the timezone (from the gazetteer when known)."""
+    e = get_gazetteer().lookup(place)
+    if e is not None:
+        return ResolvedPlace(place, e.lat, e.lon, e.formatted, e.tz)
+    lat, lon, formatted = geocode(place, api_key)
+    return ResolvedPlace(place, lat, lon, formatted, timezone_at(lat, lon, DEFAULT_TZ))
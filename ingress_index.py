@@ -0,0 +1,220 @@
+# ingress_index.py
+# Sign-ingress index for the slow planets (Saturn, Jupiter) over the app's
+# full 1800–2100 date range, plus lifetime Sade Sati / Dhaiyya timelines.
+# Usage:
+#   from ingress_index import sade_sati_timeline, sign_at
+#   for ph in sade_sati_timeline(moon_sign, birth_utc, birth_utc + 100 years):
+#       ph['status'], ph['phase'], ph['start'], ph['end']
+#   sade_sati_status(sign_at('Sa', now_utc), moon_sign)   # (status, phase) right now
+#
+# Ingresses (retrograde re-entries included) are located by scanning the
+# sidereal longitude every SCAN_STEP_DAYS and bisecting each bracket where the
+# sign changes. The index is built once, saved to the cache dir and shared by
+# all sessions; a timeline is then a couple of bisect lookups and a short walk.
+
+from __future__ import annotations
+import bisect
+import datetime
+import os
+import threading
+
+import numpy as np
+
+from ephemeris import (CACHE_DIR, AYANAMSHA_VAL, julday_utc_array, datetime_from_jd,
+                       sidereal_longitude_batch)
+
+INDEX_START = datetime.datetime(1800, 1, 1)
+INDEX_END = datetime.datetime(2101, 1, 1)
+SLOW_PLANETS = ('Sa', 'Ju')
+# A re-entry shorter than one scan step (a station within arc-seconds of a
+# cusp) would be skipped; 2 days keeps the one-off build to a few seconds.
+# Bisection then pins each crossing to ~1 s.
+SCAN_STEP_DAYS = 2.0
+ROOT_TOL_DAYS = 1e-5
+
+SADE_SATI = "साढ़ेसाती"
+DHAIYYA = "शनि ढैय्या"
+SADE_SATI_PHASES = {11: "प्रथम चरण", 0: "द्वितीय चरण", 1: "तृतीय चरण"}
+
+
+def _signed_gap(lon, boundary):
+    """Signed angular distance lon - boundary in (-180, 180]."""
+    return (lon - boundary + 180.0) % 360.0 - 180.0
+
+
+def _find_crossing(code, t0, t1, boundary):
+    """Bisect [t0, t1] for the moment the planet crosses `boundary` (degrees)."""
+    g0 = _signed_gap(sidereal_longitude_batch([t0], code)[0], boundary)
+    while t1 - t0 > ROOT_TOL_DAYS:
+        tm = 0.5 * (t0 + t1)
+        gm = _signed_gap(sidereal_longitude_batch([tm], code)[0], boundary)
+        if (gm < 0) == (g0 < 0):
+            t0, g0 = tm, gm
+        else:
+            t1 = tm
+    return t1
+
+
+def build_ingresses(code, start=INDEX_START, end=INDEX_END, step=SCAN_STEP_DAYS):
+    """Return (jd, sign) arrays: jd[0] is `start` with the sign held there, then one row per ingress."""
+    jd0, jd1 = julday_utc_array([start, end])
+    grid = np.arange(jd0, jd1 + step, step)
+    lon = sidereal_longitude_batch(grid, code)
+    sign = (lon // 30).astype(np.int64) + 1
+    out_jd = [grid[0]]; out_sign = [int(sign[0])]
+    for i in np.nonzero(sign[1:] != sign[:-1])[0]:
+        s0, s1 = int(sign[i]), int(sign[i + 1])
+        # Direct motion crosses the start of s1; retrograde motion crosses the start of s0
+        forward = (s1 - s0) % 12 == 1
+        boundary = ((s1 - 1) * 30.0) if forward else ((s0 - 1) * 30.0)
+        out_jd.append(_find_crossing(code, grid[i], grid[i + 1], boundary))
+        out_sign.append(s1)
+    return np.asarray(out_jd, dtype=np.float64), np.asarray(out_sign, dtype=np.int8)
+
+
+class IngressIndex:
+    """Per-planet sorted ingress instants (Julian day UT) and the sign entered."""
+
+    def __init__(self, tables):
+        self.tables = tables  # code -> (jd array, sign array)
+        self._jd_lists = {c: t[0].tolist() for c, t in tables.items()}
+
+    def ingresses(self, code):
+        """Sorted ingress instants (Julian day UT) for code; the first is INDEX_START."""
+        return self._jd_lists[code]
+
+    def sign_at_jd(self, code, jd):
+        i = bisect.bisect_right(self._jd_lists[code], jd) - 1
+        return int(self.tables[code][1][max(i, 0)])
+
+    def segments(self, code, jd_start, jd_end):
+        """Yield (sign, seg_start_jd, seg_end_jd) covering [jd_start, jd_end)."""
+        jds = self._jd_lists[code]; signs = self.tables[code][1]
+        i = max(bisect.bisect_right(jds, jd_start) - 1, 0)
+        last = bisect.bisect_left(jds, jd_end)
+        for k in range(i, max(last, i + 1)):
+            seg_start = max(jds[k], jd_start)
+            seg_end = min(jds[k + 1], jd_end) if k + 1 < len(jds) else jd_end
+            if seg_end > seg_start:
+                yield int(signs[k]), seg_start, seg_end
+
+
+def _index_path():
+    return os.path.join(
+        CACHE_DIR, f"ingress_{INDEX_START.year}-{INDEX_END.year}_step{SCAN_STEP_DAYS:g}_sid{AYANAMSHA_VAL}.npz")
+
+
+def load_or_build_index():
+    path = _index_path()
+    if os.path.exists(path):
+        try:
+            with np.load(path) as z:
+                return IngressIndex({c: (z[f"{c}_jd"], z[f"{c}_sign"]) for c in SLOW_PLANETS})
+        except Exception:
+            pass  # stale/corrupt file: rebuild below
+    tables = {c: build_ingresses(c) for c in SLOW_PLANETS}
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, **{f"{c}_{k}": v for c, (jd, sg) in tables.items() for k, v in (('jd', jd), ('sign', sg))})
+        os.replace(tmp, path)
+    except Exception:
+        pass  # read-only disk: keep the in-memory index
+    return IngressIndex(tables)
+
+
+_INDEX = None
+_LOCK = threading.Lock()
+_WARM_LOCK = threading.Lock()
+_WARMING = threading.Event()   # set while warm_in_background's build is running
+
+
+def get_ingress_index():
+    global _INDEX
+    if _INDEX is None:
+        with _LOCK:
+            if _INDEX is None:
+                _INDEX = load_or_build_index()
+    return _INDEX
+
+
+def sign_at(code, dt_utc):
+    """Rasi sign (1..12) of Saturn/Jupiter at a naive UTC datetime."""
+    return get_ingress_index().sign_at_jd(code, float(julday_utc_array([dt_utc])[0]))
+
+
+def sade_sati_status(saturn_sign, moon_sign):
+    """(status, phase) for transit Saturn's sign against the natal Moon sign; (None, None) if neither."""
+    d = (saturn_sign - moon_sign) % 12
+    if d in SADE_SATI_PHASES:
+        return SADE_SATI, SADE_SATI_PHASES[d]
+    if d in (3, 7):
+        return DHAIYYA, None
+    return None, None
+
+
+def sade_sati_timeline(moon_sign, start_utc, end_utc):
+    """Every Sade Sati phase and Dhaiyya between start_utc and end_utc (naive UTC).
+
+    sade_sati_status per Saturn sign: d = (Saturn sign - Moon sign) % 12,
+    d in (11, 0, 1) -> Sade Sati phases, d in (3, 7) -> Dhaiyya. Retrograde
+    re-entries show up as separate entries.
+    """
+    jd_start, jd_end = (float(x) for x in julday_utc_array([start_utc, end_utc]))
+    out = []
+    for sat, s, e in get_ingress_index().segments('Sa', jd_start, jd_end):
+        status, phase = sade_sati_status(sat, moon_sign)
+        if status is None:
+            continue
+        out.append({'status': status, 'phase': phase, 'saturn_sign': sat,
+                    'start': datetime_from_jd(s), 'end': datetime_from_jd(e)})
+    return out
+
+
+def index_building():
+    """True while the background build started by warm_in_background() is still running."""
+    return _WARMING.is_set() and _INDEX is None
+
+
+def index_covers(dt_utc):
+    """True if the index is ready and dt_utc (naive UTC) lies within it."""
+    return not index_building() and INDEX_START <= dt_utc < INDEX_END
+
+
+def current_period(moon_sign, at_utc):
+    """The timeline entry containing at_utc (with its full start/end), or None.
+
+    Also None while the background build is running, instead of waiting for it.
+    """
+    if index_building():
+        return None
+    jd = float(julday_utc_array([at_utc])[0])
+    idx = get_ingress_index()
+    jds = idx.ingresses('Sa')
+    k = max(bisect.bisect_right(jds, jd) - 1, 0)
+    start = datetime_from_jd(jds[k])
+    end = datetime_from_jd(jds[k + 1]) if k + 1 < len(jds) else INDEX_END
+    hits = sade_sati_timeline(moon_sign, start, end)
+    return hits[0] if hits else None
+
+
+def _warm():
+    try:
+        get_ingress_index()
+    except Exception:
+        pass  # later callers build (and report) it themselves
+    finally:
+        _WARMING.clear()
+
+
+def warm_in_background():
+    """Load (or build) the shared index on a daemon thread, once per process.
+
+    Safe to call on every Streamlit rerun; until it finishes current_period()
+    returns None rather than blocking.
+    """
+    with _WARM_LOCK:
+        if _INDEX is not None or _WARMING.is_set():
+            return
+        _WARMING.set()
+    threading.Thread(target=_warm, name="ingress-index", daemon=True).start()
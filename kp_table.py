@@ -0,0 +1,108 @@
+# kp_table.py
+# KP (Krishnamurti) star / sub / sub-sub lords from precomputed boundary tables.
+# Usage:
+#   from kp_table import kp_lords, kp_lords_batch
+#   star, sub, subsub = kp_lords(123.456)                 # ('Ke', 'Su', 'Me')
+#   idx = kp_lords_batch(lons)                            # lons: any-shape array of sidereal longitudes
+#   KP_LORDS[idx['sub']]                                  # same shape, planet codes
+#
+# The zodiac is cut into the 249 KP subs: 27 nakshatras x 9 subs in
+# Vimshottari proportion starting from the nakshatra lord, with the six
+# subs that straddle a sign boundary split in two. Sub starts are kept in a
+# sorted array, so a lookup is one bisect (scalar) or one
+# numpy.searchsorted (batch). The 2187 sub-subs (each sub split again the
+# same way) are tabulated on first use. A boundary longitude belongs to the
+# sub that starts there.
+
+from __future__ import annotations
+import functools
+from bisect import bisect_right
+
+import numpy as np
+
+from vimshottari import ORDER, YEARS, CYCLE_YEARS
+
+NAK = 360.0 / 27.0
+KP_LORDS = np.array(ORDER)
+
+
+def _split(start, span, lord):
+    """(start, span, lord) of the nine Vimshottari divisions of [start, start+span) beginning at lord."""
+    k = ORDER.index(lord)
+    out = []
+    t = start
+    for j in range(9):
+        L = ORDER[(k + j) % 9]
+        s = span * YEARS[L] / CYCLE_YEARS
+        out.append((t, s, L))
+        t += s
+    return out
+
+
+def _build_subs():
+    starts, star, sub, sign, parent = [], [], [], [], []
+    for ni in range(27):
+        lord = ORDER[ni % 9]
+        for j, (s, span, L) in enumerate(_split(ni * NAK, NAK, lord)):
+            cuts = [s]
+            b = (int(s // 30) + 1) * 30.0   # next sign boundary
+            if s < b < s + span - 1e-9:
+                cuts.append(b)
+            for c in cuts:
+                starts.append(c); star.append(ORDER.index(lord)); sub.append(ORDER.index(L))
+                sign.append(int(c // 30) + 1); parent.append(ni * 9 + j)
+    return (np.array(starts), np.array(star, dtype=np.int8), np.array(sub, dtype=np.int8),
+            np.array(sign, dtype=np.int8), np.array(parent, dtype=np.int16))
+
+
+SUB_STARTS, SUB_STAR, SUB_LORD, SUB_SIGN, SUB_PARENT = _build_subs()   # 249 rows
+_SUB_STARTS_LIST = SUB_STARTS.tolist()
+_SUB_STAR_CODES = [ORDER[i] for i in SUB_STAR]
+_SUB_LORD_CODES = [ORDER[i] for i in SUB_LORD]
+
+
+@functools.lru_cache(maxsize=1)
+def subsub_table():
+    """(starts, lord index) of the 2187 sub-subs, sorted by start."""
+    starts, lords = [], []
+    for ni in range(27):
+        for s, span, L in _split(ni * NAK, NAK, ORDER[ni % 9]):
+            for ss, _, LL in _split(s, span, L):
+                starts.append(ss); lords.append(ORDER.index(LL))
+    return np.array(starts), np.array(lords, dtype=np.int8)
+
+
+@functools.lru_cache(maxsize=1)
+def _subsub_lists():
+    starts, lords = subsub_table()
+    return starts.tolist(), [ORDER[i] for i in lords]
+
+
+def kp_sub_index(lon_sid):
+    """0..248: which of the 249 KP subs lon_sid falls in."""
+    return bisect_right(_SUB_STARTS_LIST, lon_sid % 360.0) - 1
+
+
+def kp_lords(lon_sid, depth=3):
+    """(star lord, sub lord[, sub-sub lord]) codes for one sidereal longitude."""
+    lon = lon_sid % 360.0
+    i = bisect_right(_SUB_STARTS_LIST, lon) - 1
+    if depth < 3:
+        return _SUB_STAR_CODES[i], _SUB_LORD_CODES[i]
+    ss_starts, ss_lords = _subsub_lists()
+    return _SUB_STAR_CODES[i], _SUB_LORD_CODES[i], ss_lords[bisect_right(ss_starts, lon) - 1]
+
+
+def kp_lords_batch(lons, depth=3):
+    """Vectorised lookup for an array of longitudes (e.g. charts x planets).
+
+    Returns {'sub_no', 'sign', 'star', 'sub'[, 'subsub']}: arrays of lons' shape.
+    sub_no is 1..249; star/sub/subsub are indexes into ORDER (KP_LORDS[...] gives codes).
+    """
+    lon = np.mod(np.asarray(lons, dtype=float), 360.0)
+    i = np.searchsorted(SUB_STARTS, lon, side='right') - 1
+    out = {'sub_no': i + 1, 'sign': SUB_SIGN[i], 'star': SUB_STAR[i], 'sub': SUB_LORD[i]}
+    if depth >= 3:
+        ss_starts, ss_lords = subsub_table()
+        out['subsub'] = ss_lords[np.searchsorted(ss_starts, lon, side='right') - 1]
+    return out
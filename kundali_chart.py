@@ -0,0 +1,448 @@
+# kundali_chart.py
+# Chart computations for MRIDAASTRO: sidereal positions -> signs, houses,
+# planet statuses, KP lords, Vimshottari periods and the प्रमुख बिंदु checks.
+# Usage:
+#   from kundali_chart import compute_chart
+#   chart = compute_chart(dt_local, lat, lon, tz_name="Asia/Kolkata")
+#   chart.sidelons['Mo'], chart.lagna_sign, chart.nav_lagna_sign
+#   ctx = ChartContext.from_chart(chart)     # signs/houses/statuses/KP lords, each computed once
+#   ctx.statuses['Ma'], ctx.rasi_house_planets, detect_chandal(ctx)
+#
+# No Streamlit or python-docx imports here, so the module is safe to use from
+# the app, the batch CLI and worker processes alike.
+
+import datetime
+from typing import NamedTuple
+
+import pytz
+
+from ephemeris import sidereal_positions, ascendant_sign
+from ingress_index import index_covers, sade_sati_status, sign_at
+from transit_table import transit_positions
+from tz_resolver import timezone_at
+from tz_offsets import local_to_utc, utc_offset_hours
+from kp_table import kp_lords
+from vargas import varga_sign, varga_signs
+from vimshottari import YEAR_DAYS, DashaTree  # YEAR_DAYS re-exported for kundali_pipeline
+
+HN = {'Su':'सूर्य','Mo':'चंद्र','Ma':'मंगल','Me':'बुध','Ju':'गुरु','Ve':'शुक्र','Sa':'शनि','Ra':'राहु','Ke':'केतु'}
+
+# Compact Hindi abbreviations for planet boxes
+HN_ABBR = {'Su':'सू','Mo':'चं','Ma':'मं','Me':'बु','Ju':'गु','Ve':'शु','Sa':'श','Ra':'रा','Ke':'के'}
+
+# ==== Status helpers (Rāśi vs Navāṁśa aware) ====
+SIGN_LORD = {1:'Ma',2:'Ve',3:'Me',4:'Mo',5:'Su',6:'Me',7:'Ve',8:'Ma',9:'Ju',10:'Sa',11:'Sa',12:'Ju'}
+EXALT_SIGN = {'Su':1,'Mo':2,'Ma':10,'Me':6,'Ju':4,'Ve':12,'Sa':7,'Ra':2,'Ke':8}
+DEBIL_SIGN = {'Su':7,'Mo':8,'Ma':4,'Me':12,'Ju':10,'Ve':6,'Sa':1,'Ra':8,'Ke':2}
+# --- Combustion settings ---
+# Only the SUN causes combustion. Rahu/Ketu never combust. Moon CAN be combust (by Sun) if within orb.
+# Set this to True if you want to mark combustion ONLY when the Sun and the planet are in the SAME rāśi sign.
+REQUIRE_SAME_SIGN_FOR_COMBUST = False  # change to True if that matches your tradition
+
+COMBUST_ORB = {'Mo':12.0,'Ma':17.0,'Me':12.0,'Ju':11.0,'Ve':10.0,'Sa':15.0}
+
+def _min_circ_angle(a, b):
+    d = abs((a - b) % 360.0)
+    return d if d <= 180.0 else 360.0 - d
+
+def _xml_text(s):
+    return (str(s).replace("&","&amp;").replace("<","&lt;").replace(">","&gt;"))
+
+def planet_rasi_sign(lon_sid):
+    return int(lon_sid // 30) + 1  # 1..12
+
+PLANETS = ['Su','Mo','Ma','Me','Ju','Ve','Sa','Ra','Ke']
+
+class ChartContext:
+    """Derived values of one chart: rasi, navamsa, houses, statuses (dignity, combustion),
+    KP nakshatra/sub lords and the marked house maps. Each is computed on first access
+    and kept, so builders, detectors and table writers that share a context never
+    recompute them."""
+    __slots__ = ('sidelons', 'lagna_sign', 'nav_lagna_sign',
+                 '_rasi', '_nav', '_statuses', '_houses', '_nav_houses', '_kp', '_rasi_map', '_nav_map')
+
+    def __init__(self, sidelons, lagna_sign=None, nav_lagna_sign=None):
+        self.sidelons = sidelons
+        self.lagna_sign = lagna_sign
+        self.nav_lagna_sign = nav_lagna_sign
+        self._rasi = self._nav = self._statuses = self._houses = self._nav_houses = None
+        self._kp = self._rasi_map = self._nav_map = None
+
+    @classmethod
+    def from_chart(cls, chart):
+        return cls(chart.sidelons, chart.lagna_sign, chart.nav_lagna_sign)
+
+    @property
+    def rasi(self):
+        """code -> rasi sign (1..12)."""
+        if self._rasi is None:
+            self._rasi = {code: planet_rasi_sign(lon) for code, lon in self.sidelons.items()}
+        return self._rasi
+
+    @property
+    def nav(self):
+        """code -> navamsa sign (1..12), all planets in one varga_signs call."""
+        if self._nav is None:
+            codes = list(self.sidelons)
+            self._nav = dict(zip(codes, varga_signs([self.sidelons[c] for c in codes], 9).tolist()))
+        return self._nav
+
+    @property
+    def houses(self):
+        """code -> rasi-chart house from lagna."""
+        if self._houses is None:
+            self._houses = {code: _house_from_lagna(sign, self.lagna_sign) for code, sign in self.rasi.items()}
+        return self._houses
+
+    @property
+    def nav_houses(self):
+        """code -> navamsa-chart house from the navamsa lagna."""
+        if self._nav_houses is None:
+            self._nav_houses = {code: _house_from_lagna(sign, self.nav_lagna_sign) for code, sign in self.nav.items()}
+        return self._nav_houses
+
+    @property
+    def kp(self):
+        """code -> (nakshatra lord, KP sub lord)."""
+        if self._kp is None:
+            self._kp = {code: kp_lords(lon, depth=2) for code, lon in self.sidelons.items()}
+        return self._kp
+
+    @property
+    def statuses(self):
+        """Per-planet dict containing both rasi-based and nav-based flags."""
+        if self._statuses is None:
+            self._statuses = self._compute_statuses()
+        return self._statuses
+
+    def _compute_statuses(self):
+        out = {}
+        sidelons, rasi_of, nav_of = self.sidelons, self.rasi, self.nav
+        sun_lon = sidelons.get('Su', 0.0)
+        for code in PLANETS:
+            lon = sidelons[code]
+            rasi = rasi_of[code]
+            nav = nav_of[code]
+            varg = (rasi == nav)
+            # Combustion: Sun only, optional same-sign constraint
+            combust = False
+            if code in COMBUST_ORB and code != 'Su':
+                sep = _min_circ_angle(lon, sun_lon)
+                if not REQUIRE_SAME_SIGN_FOR_COMBUST or (rasi == planet_rasi_sign(sun_lon)):
+                    combust = (sep <= COMBUST_ORB[code])
+
+            out[code] = {
+                'rasi': rasi,
+                'nav': nav,
+                'vargottama': varg,
+                'combust': combust,
+                'self_rasi': (SIGN_LORD.get(rasi) == code),
+                'self_nav':  (SIGN_LORD.get(nav)  == code),
+                'exalt_rasi': (EXALT_SIGN.get(code) == rasi),
+                'exalt_nav':  (EXALT_SIGN.get(code) == nav),
+                'debil_rasi': (DEBIL_SIGN.get(code) == rasi),
+                'debil_nav':  (DEBIL_SIGN.get(code) == nav),
+            }
+            # Nodes (Rahu/Ketu): do not mark exaltation/debilitation
+            if code in ('Ra','Ke'):
+                out[code]['exalt_rasi'] = False
+                out[code]['exalt_nav'] = False
+                out[code]['debil_rasi'] = False
+                out[code]['debil_nav'] = False
+        return out
+
+    @property
+    def rasi_house_planets(self):
+        """house -> [{'txt', 'flags'}] for the lagna chart (see build_rasi_house_planets_marked)."""
+        if self._rasi_map is None:
+            house_map = {i: [] for i in range(1, 13)}
+            stats, houses = self.statuses, self.houses
+            for code in PLANETS:
+                fl = _make_flags('rasi', stats[code])
+                house_map[houses[code]].append({'txt': fmt_planet_label(code, fl), 'flags': fl})
+            self._rasi_map = house_map
+        return self._rasi_map
+
+    @property
+    def navamsa_house_planets(self):
+        """house -> [{'txt', 'flags'}] for the navamsa chart (see build_navamsa_house_planets_marked)."""
+        if self._nav_map is None:
+            house_map = {i: [] for i in range(1, 13)}
+            stats, houses = self.statuses, self.nav_houses
+            sun_nav = stats['Su']['nav']  # Sun's Navāṁśa sign
+            for code in PLANETS:
+                fl = _make_flags('nav', stats[code])   # nav-based self/exalt/debil
+                # Navāṁśa combust rule: planet combust iff shares Nav sign with Sun
+                fl['combust'] = code not in ('Su','Ra','Ke') and stats[code]['nav'] == sun_nav
+                house_map[houses[code]].append({'txt': fmt_planet_label(code, fl), 'flags': fl})
+            self._nav_map = house_map
+        return self._nav_map
+
+
+def _as_context(sidelons, lagna_sign=None, nav_lagna_sign=None):
+    """The ChartContext itself, or a fresh one around a plain sidelons dict."""
+    if isinstance(sidelons, ChartContext):
+        return sidelons
+    return ChartContext(sidelons, lagna_sign, nav_lagna_sign)
+
+def compute_statuses_all(sidelons):
+    """Return per-planet dict containing both rasi-based and nav-based flags."""
+    return _as_context(sidelons).statuses
+
+def _make_flags(view, st):
+    """Reduce the big dict to the fields used by the renderer for a given chart view."""
+    if view == 'nav':
+        return {
+            'self': st['self_nav'],
+            'exalted': st['exalt_nav'],
+            'debilitated': st['debil_nav'],
+            'vargottama': st['vargottama'],
+            'combust': False,
+        }
+    # default: rasi
+    return {
+        'self': st['self_rasi'],
+        'exalted': st['exalt_rasi'],
+        'debilitated': st['debil_rasi'],
+        'vargottama': st['vargottama'],
+        'combust': st['combust'],
+    }
+
+def fmt_planet_label(code, flags):
+    base = HN_ABBR.get(code, code)
+    if flags.get('exalted'): base += '↑'
+    if flags.get('debilitated'): base += '↓'
+    if flags.get('combust'): base += '^'
+    return base
+
+
+
+def planet_navamsa_house(lon_sid, nav_lagna_sign):
+    # Return 1..12 house index in Navamsa for a planet
+    nav_sign = navamsa_sign_from_lon_sid(lon_sid)  # 1..12
+    return ((nav_sign - nav_lagna_sign) % 12) + 1
+
+def build_navamsa_house_planets(sidelons, nav_lagna_sign):
+    # Map: house -> list of planet abbreviations in Navamsa
+    house_map = {i: [] for i in range(1, 13)}
+    for code in ['Su','Mo','Ma','Me','Ju','Ve','Sa','Ra','Ke']:
+        h = planet_navamsa_house(sidelons[code], nav_lagna_sign)
+        house_map[h].append(HN_ABBR.get(code, code))
+    return house_map
+
+
+def build_rasi_house_planets_marked(sidelons, lagna_sign):
+    ctx = _as_context(sidelons, lagna_sign)
+    if ctx.lagna_sign != lagna_sign:
+        ctx = ChartContext(ctx.sidelons, lagna_sign, ctx.nav_lagna_sign)
+    return ctx.rasi_house_planets
+
+def build_navamsa_house_planets_marked(sidelons, nav_lagna_sign):
+    ctx = _as_context(sidelons, nav_lagna_sign=nav_lagna_sign)
+    if ctx.nav_lagna_sign != nav_lagna_sign:
+        ctx = ChartContext(ctx.sidelons, ctx.lagna_sign, nav_lagna_sign)
+    return ctx.navamsa_house_planets
+
+
+def build_rasi_house_planets(sidelons, lagna_sign):
+    # Map: house -> list of planet abbreviations in Rasi (Lagna) chart
+    house_map = {i: [] for i in range(1, 13)}
+    for code in ['Su','Mo','Ma','Me','Ju','Ve','Sa','Ra','Ke']:
+        sign = int(sidelons[code] // 30) + 1  # 1..12
+        h = ((sign - lagna_sign) % 12) + 1
+        house_map[h].append(HN_ABBR.get(code, code))
+    return house_map
+
+def dms_exact(deg):
+    d = int(deg); m_float = (deg - d) * 60.0; m = int(m_float); s = (m_float - m) * 60.0
+    return d, m, s
+
+def fmt_deg_sign(lon_sid):
+    sign=int(lon_sid//30) + 1; deg_in_sign = lon_sid % 30.0
+    d,m,s=dms_exact(deg_in_sign); s_rounded = int(round(s))
+    if s_rounded == 60: s_rounded = 0; m += 1
+    if m == 60: m = 0; d += 1; 
+    if d == 30: d = 0
+    return sign, f"{d:02d}°{m:02d}'{s_rounded:02d}\""
+
+def kp_sublord(lon_sid):
+    """(nakshatra lord, KP sub lord) for a sidereal longitude (one bisect in kp_table)."""
+    return kp_lords(lon_sid, depth=2)
+
+def get_timezone_offset_simple(lat, lon, tzname=None, dt_local=None):
+    """UTC offset (hours) for auto-population, from the compiled tz transition index.
+
+    With dt_local (the birth wall time) the historical offset is returned
+    (LMT / war time / DST); without it, the offset in force now.
+    """
+    try:
+        if tzname is None:
+            tzname = timezone_at(lat, lon)
+        if not tzname:
+            print(f"DEBUG: No timezone at {lat},{lon}, defaulting to 0.0")
+            return 0.0
+        if dt_local is not None:
+            return round(local_to_utc(tzname, dt_local)[1], 4)
+        return round(utc_offset_hours(tzname), 4)
+    except Exception as e:
+        print(f"DEBUG: Timezone detection failed: {e}")
+        return 0.0
+
+def tz_from_latlon(lat, lon, dt_local, tzname=None):
+    if tzname is None:
+        tzname = timezone_at(lat, lon)
+
+    # Fallback if no timezone detected by TimezoneFinder
+    if not tzname:
+        tzname = "Etc/UTC"
+        print(f"DEBUG: No timezone detected by TimezoneFinder, falling back to UTC")
+
+    # Create a fresh naive datetime to avoid any timezone issues
+    clean_dt = datetime.datetime(dt_local.year, dt_local.month, dt_local.day,
+                                 dt_local.hour, dt_local.minute, dt_local.second)
+    try:
+        dt_utc_naive, offset_hours = local_to_utc(tzname, clean_dt)
+        return tzname, offset_hours, dt_utc_naive
+    except Exception as e:
+        print(f"DEBUG: Timezone processing error: {e}, falling back to UTC")
+        return "Etc/UTC", 0.0, clean_dt
+
+def navamsa_sign_from_lon_sid(lon_sid):
+    return varga_sign(lon_sid, 9)
+
+class PositionRow(NamedTuple):
+    """One row of the ग्रह स्थिति table, formatted for the document (the rashi as its sign number)."""
+    graha: str
+    rashi: int      # 1..12, printed as the number
+    ansh: str
+    nakshatra: str
+    sub_nakshatra: str
+
+POSITION_HEADERS = ("ग्रह", "राशि", "अंश", "नक्षत्र", "उप‑नक्षत्र")
+
+def positions_table_no_symbol(sidelons):
+    ctx = _as_context(sidelons)
+    rows=[]
+    for code in PLANETS:
+        sign, deg_str = fmt_deg_sign(ctx.sidelons[code]); nak_lord, sub_lord = ctx.kp[code]
+        rows.append(PositionRow(HN[code], sign, deg_str, HN[nak_lord], HN[sub_lord]))
+    return rows
+
+# Vimshottari periods come from vimshottari.DashaTree; this keeps the flat
+# mahadasha list the DOCX table and the JSON summary use.
+MAHADASHA_TABLE_YEARS = 100
+
+def build_mahadashas_days_utc(birth_utc_dt, moon_sid, years=MAHADASHA_TABLE_YEARS):
+    tree = DashaTree(birth_utc_dt, moon_sid, years)
+    return [{"planet": p.lord, "start": p.start, "end": p.end, "days": p.span if i else tree.balance_days}
+            for i, p in enumerate(tree.mahadashas)]
+
+def _utc_to_local(dt_utc, tzname, tz_hours, used_manual):
+    if used_manual: return dt_utc + datetime.timedelta(hours=tz_hours)
+    try:
+        tz = pytz.timezone(tzname); return tz.fromutc(dt_utc.replace(tzinfo=pytz.utc))
+    except Exception:
+        return dt_utc + datetime.timedelta(hours=tz_hours)
+
+def _house_from_lagna(sign:int, lagna_sign:int)->int:
+    return ((sign - lagna_sign) % 12) + 1  # 1..12
+
+def _english_bhav_label(h:int)->str:
+    try:
+        h_int = int(h)
+    except Exception:
+        return f"{h}वाँ भाव"
+    return f"{h_int}वाँ भाव"
+
+def detect_muntha_house(lagna_sign:int, dob_dt):
+    # Approx: years elapsed since birth to today -> advance houses from lagna
+    try:
+        from datetime import datetime, timezone
+        years = datetime.now(timezone.utc).year - dob_dt.year
+        return ((lagna_sign - 1 + years) % 12) + 1
+    except Exception:
+        return None
+
+TRANSIT_JD_PRECISION = 2  # ~14 min buckets; Saturn never changes sign that fast
+
+def detect_sade_sati_or_dhaiyya(sidelons:dict, transit_dt=None):
+    # Returns: (status, phase) where status in {"साढ़ेसाती", "शनि ढैय्या", None}
+    # Uses *transit Saturn* vs *natal Moon*. Phase only if साढ़ेसाती: "प्रथम चरण" / "द्वितीय चरण" / "तृतीय चरण".
+    try:
+        # Natal Moon sign
+        moon = _as_context(sidelons).rasi['Mo']
+        # Transit Saturn sign at transit_dt (or now)
+        from datetime import datetime, timezone
+        if transit_dt is None:
+            tdt = datetime.now(timezone.utc)
+        else:
+            tdt = transit_dt
+        tdt = tdt.replace(tzinfo=None) if hasattr(tdt, 'tzinfo') else tdt
+        # Saturn's sign from the ingress index (exact on ingress days, and the same
+        # answer current_period gives); while it is still building, or outside
+        # its range, from the daily transit table or the ephemeris
+        if index_covers(tdt):
+            sat = sign_at('Sa', tdt)
+        else:
+            trans = transit_positions(tdt)
+            if trans is None:
+                # Coarse Julian-day rounding: every session asking for "now" shares one cache entry
+                _jd, _ay, trans = sidereal_positions(tdt, jd_precision=TRANSIT_JD_PRECISION)
+            sat = planet_rasi_sign(trans['Sa'])
+        return sade_sati_status(sat, moon)
+    except Exception:
+        return None, None
+
+def _yoga_holds(sidelons, key, lagna_sign=None)->bool:
+    # The rules themselves live in yogas.py (declarative, batch-evaluated)
+    try:
+        from yogas import yoga_hits
+        return yoga_hits(sidelons, lagna_sign)[key]
+    except Exception:
+        return False
+
+def detect_kaalsarp(sidelons:dict)->bool:
+    return _yoga_holds(sidelons, 'kaalsarp')
+
+def detect_chandal(sidelons:dict)->bool:
+    return _yoga_holds(sidelons, 'chandal')
+
+def detect_pitru(sidelons:dict)->bool:
+    return _yoga_holds(sidelons, 'pitru')
+
+def detect_neech_bhang(sidelons:dict, lagna_sign:int)->bool:
+    return _yoga_holds(sidelons, 'neech_bhang', lagna_sign)
+
+
+class KundaliChart(NamedTuple):
+    """Everything the DOCX needs for one birth moment and place."""
+    dt_local: datetime.datetime
+    dt_utc: datetime.datetime
+    tzname: str
+    tz_hours: float
+    used_manual: bool
+    lat: float
+    lon: float
+    jd: float
+    ayanamsa: float
+    sidelons: dict
+    lagna_sign: int
+    asc_sid: float
+    nav_lagna_sign: int
+
+
+def compute_chart(dt_local, lat, lon, tz_name=None, tz_hours=None):
+    """Chart for a naive local birth time; tz_hours (manual UTC offset) overrides tz_name."""
+    dt_local = dt_local.replace(tzinfo=None)
+    used_manual = False
+    if tz_hours is not None:
+        tz_hours = float(tz_hours)
+        dt_utc = dt_local - datetime.timedelta(hours=tz_hours)
+        tzname = f"UTC{tz_hours:+.2f} (manual)"
+        used_manual = True
+    else:
+        tzname, tz_hours, dt_utc = tz_from_latlon(lat, lon, dt_local, tz_name)
+    jd, ay, sidelons = sidereal_positions(dt_utc)
+    lagna_sign, asc_sid = ascendant_sign(jd, lat, lon, ay)
+    return KundaliChart(dt_local, dt_utc, tzname, tz_hours, used_manual, lat, lon, jd, ay,
+                        sidelons, lagna_sign, asc_sid, navamsa_sign_from_lon_sid(asc_sid))
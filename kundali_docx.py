@@ -0,0 +1,1297 @@
+# kundali_docx.py
+# python-docx building blocks for the kundali document: page template,
+# table styling, section header bars, the VML North-Indian charts and the
+# प्रमुख बिंदु / फलित sections.
+# Usage:
+#   from kundali_docx import make_document, kundali_with_planets, add_pramukh_bindu_section
+#   doc = make_document()
+#   para._p.addnext(kundali_with_planets(size_pt=256, lagna_sign=5, house_planets=hp))
+
+import copy
+import functools
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from docx import Document as _WordDocument
+from docx.enum.table import WD_ROW_HEIGHT_RULE
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn
+from docx.shared import Inches, Mm, Pt, RGBColor
+
+from vml_fragments import VmlFragment
+from ingress_index import current_period as sade_sati_current_period
+from kundali_chart import (_english_bhav_label, _as_context, detect_muntha_house,
+                           detect_sade_sati_or_dhaiyya)
+from yogas import chart_yogas
+
+# ===== Background Template Helper (stable image) =====
+TEMPLATE_DOCX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bg_template.docx")
+
+def make_document():
+    try:
+        if os.path.exists(TEMPLATE_DOCX):
+            return _WordDocument(TEMPLATE_DOCX)
+    except Exception:
+        pass
+    return _WordDocument()
+
+def apply_page_setup(doc):
+    """Static setup every kundali gets: A4, margins, Normal style fonts, page background."""
+    sec = doc.sections[0]; sec.page_width = Mm(210); sec.page_height = Mm(297)
+    margin = Mm(10); sec.left_margin = sec.right_margin = margin; sec.top_margin = Mm(8); sec.bottom_margin = Mm(8)
+
+    # Enhanced document styling
+    style = doc.styles['Normal']; style.font.name = LATIN_FONT; style.font.size = Pt(BASE_FONT_PT)
+    style._element.rPr.rFonts.set(qn('w:eastAsia'), HINDI_FONT); style._element.rPr.rFonts.set(qn('w:cs'), HINDI_FONT)
+
+    # Set subtle page background
+    try:
+        set_page_background(doc, 'FEFEFE')  # Very light gray background
+    except Exception:
+        pass
+    return doc
+
+# The template is parsed and set up once; each request gets a deep copy of
+# that in-memory package (about half the cost of re-reading the .docx, and
+# no disk I/O). The file's mtime is re-checked at most every
+# TEMPLATE_RECHECK_S so an edited template is picked up without a restart.
+TEMPLATE_RECHECK_S = 2.0
+
+def _template_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+class DocumentSkeleton:
+    """bg_template.docx with apply_page_setup() done, cloned per request."""
+
+    def __init__(self, path=TEMPLATE_DOCX):
+        self.path = path
+        self.mtime = _template_mtime(path)
+        self._doc = apply_page_setup(make_document())
+
+    def new_document(self):
+        return copy.deepcopy(self._doc)
+
+    def is_stale(self):
+        return _template_mtime(self.path) != self.mtime
+
+_SKELETON = None
+_SKELETON_CHECKED = 0.0
+_SKELETON_LOCK = threading.Lock()
+
+def invalidate_template():
+    """Drop the cached skeleton; the next new_document() re-reads the template."""
+    global _SKELETON
+    with _SKELETON_LOCK:
+        _SKELETON = None
+
+def get_skeleton():
+    global _SKELETON, _SKELETON_CHECKED
+    now = time.monotonic()
+    sk = _SKELETON
+    if sk is not None and now - _SKELETON_CHECKED < TEMPLATE_RECHECK_S:
+        return sk
+    with _SKELETON_LOCK:
+        if _SKELETON is None or _SKELETON.is_stale():
+            _SKELETON = DocumentSkeleton()
+        _SKELETON_CHECKED = now
+        return _SKELETON
+
+def new_document():
+    """A fresh, fully set-up kundali document (clone of the cached template skeleton)."""
+    return get_skeleton().new_document()
+# ===== End Background Template Helper =====
+
+# --- One-page layout switch ---
+ONE_PAGE = True
+
+# --- Appearance configuration ---
+# Sizing (pt) — tuned smaller to reduce white space
+NUM_W_PT = 10       # house number box width (was 12)
+NUM_H_PT = 12       # house number box height (was 14)
+PLANET_W_PT = 20    # planet label box width (was 16)
+PLANET_H_PT = 16    # planet label box height (was 14)
+GAP_X_PT = 3        # horizontal gap between planet boxes (was 4)
+OFFSET_Y_PT = 10    # vertical offset below number box (was 12)
+
+# ===== MODERN CHART STYLING OPTIONS =====
+# Options: "plain", "bordered", "shaded", "bordered_shaded"
+HOUSE_NUM_STYLE = "bordered_shaded"
+HOUSE_NUM_BORDER_PT = 1.0
+HOUSE_NUM_SHADE = "#f8f9fa"  # Light gray for modern look
+
+# Modern color scheme for charts
+CHART_COLORS = {
+    'house_border': '#194A6D',     # Deep blue
+    'house_fill': '#f8f9fa',      # Light gray
+    'planet_benefic': '#2E8B57',  # Sea green for benefic planets
+    'planet_malefic': '#DC143C',  # Crimson for malefic planets
+    'planet_neutral': '#4682B4',  # Steel blue for neutral planets
+    'number_bg': '#ffffff',       # White for house numbers
+    'text_primary': '#2d3748',    # Dark gray for text
+}
+
+# --- Reliable cell shading (works in all Word views) ---
+def shade_cell(cell, fill_hex="FFFFFF"):
+    return
+
+def shade_header_row(table, fill_hex="FFFFFF"):
+    return
+
+
+# --- Single-pass finalization ---
+# Zero paragraph spacing and zero table cell margins are applied in one walk
+# of the body's lxml tree rather than per table through python-docx proxies.
+_W_P, _W_TBL, _W_TR, _W_TC = qn('w:p'), qn('w:tbl'), qn('w:tr'), qn('w:tc')
+_W_PPR, _W_SPACING, _W_BEFORE, _W_AFTER = qn('w:pPr'), qn('w:spacing'), qn('w:before'), qn('w:after')
+
+def _zero_paragraph_spacing(p):
+    pPr = p.find(_W_PPR)
+    spacing = pPr.find(_W_SPACING) if pPr is not None else None
+    if spacing is None:  # python-docx inserts pPr/spacing at their schema positions
+        spacing = p.get_or_add_pPr().get_or_add_spacing()
+    spacing.set(_W_BEFORE, '0')
+    spacing.set(_W_AFTER, '0')
+
+def _zero_tbl_cell_margins(tbl):
+    tblPr = tbl.tblPr
+    for el in tblPr.findall(qn('w:tblCellMar')):
+        tblPr.remove(el)
+    cellMar = OxmlElement('w:tblCellMar')
+    for side in ('top','left','bottom','right'):
+        m = OxmlElement(f'w:{side}')
+        m.set(qn('w:w'), '0')
+        m.set(qn('w:type'), 'dxa')
+        cellMar.append(m)
+    tblPr.append(cellMar)
+
+def _compact_tbl(tbl, compact):
+    """Zero spacing of the paragraphs directly in tbl's cells (and of nested tables listed in compact)."""
+    for tr in tbl.iterchildren(_W_TR):
+        for tc in tr.iterchildren(_W_TC):
+            for child in tc.iterchildren(_W_P, _W_TBL):
+                if child.tag == _W_P:
+                    _zero_paragraph_spacing(child)
+                elif child in compact:
+                    _compact_tbl(child, compact)
+
+def normalize_document(doc, compact_tables=()):
+    """Final pass before saving, in one walk of the body:
+    Normal style and every body paragraph get zero space before/after; every
+    top-level table gets zero w:tblCellMar and zero spacing on its cell
+    paragraphs. Nested tables passed in compact_tables get the same paragraph
+    compaction."""
+    try:
+        st = doc.styles["Normal"].paragraph_format
+        st.space_before = Pt(0)
+        st.space_after = Pt(0)
+        st.line_spacing = 1.0
+    except Exception:
+        pass
+    compact = {t._tbl for t in compact_tables}
+    for child in doc.element.body.iterchildren(_W_P, _W_TBL):
+        if child.tag == _W_P:
+            _zero_paragraph_spacing(child)
+        else:
+            _zero_tbl_cell_margins(child)
+            _compact_tbl(child, compact)
+
+def set_page_background(doc, hex_color):
+    try:
+        bg = OxmlElement('w:background')
+        bg.set(qn('w:color'), hex_color)
+        doc.element.insert(0, bg)
+    except Exception:
+        pass
+
+
+# --- Phalit ruled lines (25 rows) ---
+
+def set_cell_margins(cell, **margins):
+    """Set per-cell inner margins in dxa (1/20 pt), e.g. set_cell_margins(cell, top=0, left=360)."""
+    tcPr = cell._tc.get_or_add_tcPr()
+    tcMar = tcPr.find(qn('w:tcMar'))
+    if tcMar is None:
+        tcMar = OxmlElement('w:tcMar')
+        tcPr.append(tcMar)
+    for side, val in margins.items():
+        el = tcMar.find(qn(f'w:{side}'))
+        if el is None:
+            el = OxmlElement(f'w:{side}')
+            tcMar.append(el)
+        el.set(qn('w:w'), str(int(val)))
+        el.set(qn('w:type'), 'dxa')
+
+def add_phalit_section(container_cell, width_inches=3.60, rows=25):
+    # Add beautiful cylindrical gradient header bar for फलित section
+    create_cylindrical_section_header(container_cell, "फलित", width_pt=260)
+
+    t = container_cell.add_table(rows=rows, cols=1); t.autofit = False
+    # Clear table borders so only bottom rules show
+    try:
+        tbl = t._tbl; tblPr = tbl.tblPr
+        tblBorders = OxmlElement('w:tblBorders')
+        for edge in ('top','left','bottom','right','insideH','insideV'):
+            el = OxmlElement(f'w:{edge}'); el.set(qn('w:val'),'nil'); tblBorders.append(el)
+        tblPr.append(tblBorders)
+    except Exception:
+        pass
+    set_col_widths(t, [width_inches])
+    for r in t.rows:
+        r.height_rule = WD_ROW_HEIGHT_RULE.EXACTLY
+        r.height = Pt(14)
+        c = r.cells[0]
+        p = c.paragraphs[0]; run = p.add_run("\u00A0"); run.font.size = Pt(1)
+        tcPr = c._tc.get_or_add_tcPr()
+        for el in list(tcPr):
+            if el.tag.endswith('tcBorders'):
+                tcPr.remove(el)
+        tcBorders = OxmlElement('w:tcBorders')
+        for edge in ('top','left','right'):
+            el = OxmlElement(f'w:{edge}'); el.set(qn('w:val'),'nil'); tcBorders.append(el)
+        el = OxmlElement('w:bottom')
+        el.set(qn('w:val'),'single'); el.set(qn('w:sz'),'8'); el.set(qn('w:space'),'0'); el.set(qn('w:color'),'E67E22')
+        tcBorders.append(el)
+        tcPr.append(tcBorders)
+
+def _bbox_of_poly(poly):
+    xs = [p[0] for p in poly]; ys = [p[1] for p in poly]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def _clamp_in_bbox(left, top, w, h, bbox, pad=0):
+    x0, y0, x1, y1 = bbox
+    left = max(x0 + pad, min(left, x1 - w - pad))
+    top = max(y0 + pad, min(top, y1 - h - pad))
+    return left, top
+
+def _rects_overlap(a, b):
+    return not (a['right'] <= b['left'] or a['left'] >= b['right'] or a['bottom'] <= b['top'] or a['top'] >= b['bottom'])
+
+def _nudge_number_box(base_left, base_top, w, h, S, occupied):
+    cx = S/2.0; cy = S/2.0
+    bx = base_left + w/2.0; by = base_top + h/2.0
+    vx = (bx - cx); vy = (by - cy)
+    n = (vx*vx + vy*vy) ** 0.5 or 1.0
+    ux, uy = vx/n, vy/n  # unit vector outward
+    pad = 2.0
+    for step in range(0, 9):  # try nudges up to ~16pt
+        dx = ux * (step * 2.0)
+        dy = uy * (step * 2.0)
+        l = max(pad, min(S - w - pad, base_left + dx))
+        t = max(pad, min(S - h - pad, base_top + dy))
+        r = {'left': l, 'top': t, 'right': l + w, 'bottom': t + h}
+        hit = False
+        for o in occupied:
+            if _rects_overlap(r, o):
+                hit = True; break
+        if not hit:
+            return l, t
+    return base_left, base_top
+
+BASE_FONT_PT = 7.0
+LATIN_FONT = "Georgia"
+HINDI_FONT = "Mangal"
+
+def _apply_hindi_caption_style(paragraph, size_pt=11, underline=True, bold=True):
+    if not paragraph.runs:
+        paragraph.add_run("")
+    r = paragraph.runs[0]
+    r.bold = bold; r.underline = underline; r.font.size = Pt(size_pt)
+    rpr = r._element.rPr or OxmlElement('w:rPr')
+    if r._element.rPr is None: r._element.append(rpr)
+    rfonts = rpr.find(qn('w:rFonts')) or OxmlElement('w:rFonts')
+    if rpr.find(qn('w:rFonts')) is None: rpr.append(rfonts)
+    rfonts.set(qn('w:eastAsia'), HINDI_FONT)
+
+def rotated_house_labels(lagna_sign):
+    order = [str(((lagna_sign - 1 + i) % 12) + 1) for i in range(12)]
+    return {"1":order[0],"2":order[1],"3":order[2],"4":order[3],"5":order[4],"6":order[5],"7":order[6],"8":order[7],"9":order[8],"10":order[9],"11":order[10],"12":order[11]}
+
+
+# --- Chart VML, parsed once (see vml_fragments.py) ---
+VML_NS = "urn:schemas-microsoft-com:vml"
+CHART_FRAME = VmlFragment('''
+    <w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:pPr><w:spacing w:before="0" w:after="0"/></w:pPr><w:r>
+      <w:pict xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w10="urn:schemas-microsoft-com:office:word"><w10:wrap type="topAndBottom"/>
+        <v:group style="position:relative;margin-left:auto;margin-right:auto;margin-top:0;width:{S}pt;height:{H}pt" coordorigin="0,0" coordsize="{S},{S}">
+          <v:rect style="position:absolute;left:0;top:0;width:{S}pt;height:{S}pt;z-index:1" strokecolor="#CC6600" strokeweight="3pt" fillcolor="#ffdcc8"/>
+          <v:line style="position:absolute;z-index:2" from="{L},{T}" to="{R},{B}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{R},{T}" to="{L},{B}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{M},{T}" to="{R},{M}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{R},{M}" to="{M},{B}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{M},{B}" to="{L},{M}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{L},{M}" to="{M},{T}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+        </v:group>
+      </w:pict>
+    </w:r></w:p>''')
+CHART_NUM_BOX = VmlFragment('''
+        <v:rect xmlns:v="urn:schemas-microsoft-com:vml" style="position:absolute;left:{left}pt;top:{top}pt;width:{w}pt;height:{h}pt;z-index:80" fillcolor="#ffffff" strokecolor="none" strokeweight="0pt">
+          <v:textbox inset="0,0,0,0">
+            <w:txbxContent xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+              <w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:t>{txt}</w:t></w:r></w:p>
+            </w:txbxContent>
+          </v:textbox>
+        </v:rect>''')
+CHART_PLANET_BOX = VmlFragment(
+    "<v:rect xmlns:v=\"urn:schemas-microsoft-com:vml\" style=\"position:absolute;left:{left}pt;top:{top}pt;width:{w}pt;height:{h}pt;z-index:6\" strokecolor=\"none\">"
+    "<v:textbox inset=\"0,0,0,0\">"
+    "<w:txbxContent xmlns:w=\"http://schemas.openxmlformats.org/wordprocessingml/2006/main\">"
+    "<w:p><w:pPr><w:jc w:val=\"center\"/></w:pPr><w:r><w:t>{txt}</w:t></w:r></w:p>"
+    "</w:txbxContent>"
+    "</v:textbox>"
+    "</v:rect>")
+CHART_SELF_OVAL = VmlFragment(
+    "<v:oval xmlns:v=\"urn:schemas-microsoft-com:vml\" style=\"position:absolute;left:{left}pt;top:{top}pt;width:{w}pt;height:{h}pt;z-index:7\" fillcolor=\"none\" strokecolor=\"black\" strokeweight=\"0.75pt\"/>")
+CHART_VARGOTTAMA_BADGE = VmlFragment(
+    "<v:rect xmlns:v=\"urn:schemas-microsoft-com:vml\" style=\"position:absolute;left:{left}pt;top:{top}pt;width:{w}pt;height:{h}pt;z-index:8\" fillcolor=\"#ffffff\" strokecolor=\"black\" strokeweight=\"0.75pt\"/>")
+
+_CHART_GROUP_PATH = '%s/%s/{%s}group' % (qn('w:r'), qn('w:pict'), VML_NS)
+
+# --- Chart geometry, computed once per chart size ---
+# Planet grids are precomputed for up to MAX_PLANETS_PER_HOUSE planets in a
+# house (more than the nine grahas can only come from extra markers, which
+# are laid out on the fly).
+MAX_PLANETS_PER_HOUSE = 9
+PLANET_COLS = 2      # wrap after this many per row
+PLANET_GAP_Y_PT = 2
+PLANET_EDGE_PT = 5   # keep planet boxes this far inside the chart square
+
+def _diamond_houses(S):
+    """House polygons (house 1 at the top) of an S x S North-Indian diamond."""
+    TM=(S/2,0); RM=(S,S/2); BM=(S/2,S); LM=(0,S/2)
+    P_lt=(S/4,S/4); P_rt=(3*S/4,S/4); P_rb=(3*S/4,3*S/4); P_lb=(S/4,3*S/4); O=(S/2,S/2)
+    return {
+        1:(TM,P_rt,O,P_lt),
+        2:((0,0),TM,P_lt),
+        3:((0,0),LM,P_lt),
+        4:(LM,O,P_lt,P_lb),
+        5:(LM,(0,S),P_lb),
+        6:((0,S),BM,P_lb),
+        7:(BM,P_rb,O,P_lb),
+        8:(BM,(S,S),P_rb),
+        9:(RM,(S,S),P_rb),
+        10:(RM,O,P_rt,P_rb),
+        11:((S,0),RM,P_rt),
+        12:(TM,(S,0),P_rt),
+    }
+
+def _centroid(poly):
+    A=Cx=Cy=0.0; n=len(poly)
+    for i in range(n):
+        x1,y1=poly[i]; x2,y2=poly[(i+1)%n]
+        cross=x1*y2 - x2*y1
+        A+=cross; Cx+=(x1+x2)*cross; Cy+=(y1+y2)*cross
+    A*=0.5
+    if abs(A)<1e-9:
+        xs,ys=zip(*poly); return (sum(xs)/n, sum(ys)/n)
+    return (Cx/(6*A), Cy/(6*A))
+
+def _planet_slots(S, x, y, n):
+    """(left, top, w, h) of n planet boxes in rows of PLANET_COLS below the house centroid (x, y)."""
+    p_w, p_h, gap_x, gap_y, M = PLANET_W_PT, PLANET_H_PT, GAP_X_PT, PLANET_GAP_Y_PT, PLANET_EDGE_PT
+    rows = (n + PLANET_COLS - 1) // PLANET_COLS
+    # start rows just below the number box
+    grid_top = y + (p_h/2 + 2) + OFFSET_Y_PT
+    slots = []
+    for idx in range(n):
+        r = idx // PLANET_COLS
+        c = idx % PLANET_COLS
+        # columns in this row (last row can be shorter)
+        cols_this = PLANET_COLS if r < rows - 1 else (n - PLANET_COLS * (rows - 1)) or PLANET_COLS
+        row_w = cols_this * p_w + (cols_this - 1) * gap_x
+        row_left = x - row_w / 2
+        top_box = grid_top + r * (p_h + gap_y) - p_h / 2
+        # keep within chart square bounds with margin and tiny shrink on edges
+        row_left = max(M, min(row_left, S - row_w - M))
+        top_box  = max(M, min(top_box,  S - p_h - M))
+        edge_touch = (row_left <= M + 0.05) or (row_left >= S - row_w - M - 0.05) or (top_box <= M + 0.05) or (top_box >= S - p_h - M - 0.05)
+        pw = p_w - (1 if edge_touch else 0)
+        ph = p_h - (1 if edge_touch else 0)
+        slots.append((row_left + c * (pw + gap_x), top_box, pw, ph))
+    return tuple(slots)
+
+class ChartGeometry(NamedTuple):
+    size: float
+    houses: dict          # house -> polygon
+    centroids: dict       # house -> (x, y)
+    number_boxes: dict    # house -> (left, top) of the house-number box
+    planet_slots: dict    # house -> {n: ((left, top, w, h), ...) for n planets}
+
+    def slots(self, house, n):
+        grid = self.planet_slots[house].get(n)
+        if grid is None:
+            x, y = self.centroids[house]
+            grid = _planet_slots(self.size, x, y, n)
+        return grid
+
+@functools.lru_cache(maxsize=16)
+def chart_geometry(size_pt):
+    """Layout of the North-Indian chart at size_pt: the same for every lagna and chart."""
+    S = size_pt
+    houses = _diamond_houses(S)
+    centroids, number_boxes, planet_slots = {}, {}, {}
+    occupied_rects = []
+    num_w, num_h = NUM_W_PT, NUM_H_PT
+    for k, poly in houses.items():
+        x, y = centroids[k] = _centroid(poly)
+        left, top = _clamp_in_bbox(x - num_w/2, y - num_h/2, num_w, num_h, _bbox_of_poly(poly), pad=2)
+        left, top = _nudge_number_box(left, top, num_w, num_h, S, occupied_rects)
+        occupied_rects.append({'left': left, 'top': top, 'right': left + num_w, 'bottom': top + num_h})
+        number_boxes[k] = (left, top)
+        planet_slots[k] = {n: _planet_slots(S, x, y, n) for n in range(1, MAX_PLANETS_PER_HOUSE + 1)}
+    return ChartGeometry(S, houses, centroids, number_boxes, planet_slots)
+
+@functools.lru_cache(maxsize=64)
+def _chart_layer(S, lagna_sign):
+    """Frame, diagonals and the 12 house-number boxes: fixed for a chart size and lagna."""
+    geo = chart_geometry(S)
+    labels = rotated_house_labels(lagna_sign)
+    frame = CHART_FRAME.render(S=S, H=int(S*0.80), L=0, T=0, R=S, B=S, M=S/2)
+    frame.find(_CHART_GROUP_PATH).extend(
+        CHART_NUM_BOX.render(left=left, top=top, w=NUM_W_PT, h=NUM_H_PT, txt=labels[str(k)])
+        for k, (left, top) in geo.number_boxes.items())
+    return frame
+
+def kundali_with_planets(size_pt=None, lagna_sign=1, house_planets=None):
+
+    # robust default for size_pt so definition never depends on globals
+    if size_pt is None:
+        try:
+            size_pt = CHART_W_PT
+        except Exception:
+            size_pt = 318  # safe fallback
+# Like kundali_w_p_with_centroid_labels but adds small side-by-side planet boxes below the number
+    if house_planets is None:
+        house_planets = {i: [] for i in range(1, 13)}
+    S = size_pt
+    geo = chart_geometry(S)
+    planet_boxes = []
+    for k in geo.houses:
+        planets = house_planets.get(k, [])
+        if not planets:
+            continue
+        for pl, (left_pl, top_box, pw, ph) in zip(planets, geo.slots(k, len(planets))):
+            # normalize input item
+            if isinstance(pl, dict):
+                label = str(pl.get('txt', '')).strip() or '?'
+                fl = pl.get('flags', {}) or {}
+            else:
+                label = str(pl).strip() or '?'
+                fl = {}
+            planet_boxes.append(CHART_PLANET_BOX.render(left=left_pl, top=top_box, w=pw, h=ph, txt=label))
+            # overlays
+            try:
+                selfr = bool(fl.get('self'))
+                varg  = bool(fl.get('vargottama'))
+            except Exception:
+                selfr = varg = False
+            if selfr:
+                planet_boxes.append(CHART_SELF_OVAL.render(left=left_pl + 2, top=top_box + 1, w=pw - 4, h=ph - 2))
+            if varg:
+                badge_w = 5; badge_h = 5
+                planet_boxes.append(CHART_VARGOTTAMA_BADGE.render(left=left_pl + pw - badge_w + 0.5, top=top_box - 2,
+                                                                  w=badge_w, h=badge_h))
+    # Compose shapes after processing all houses
+    frame = copy.deepcopy(_chart_layer(S, lagna_sign))
+    frame.find(_CHART_GROUP_PATH).extend(planet_boxes)
+    return frame
+
+
+
+def kundali_single_box(size_pt=220, lagna_sign=1, house_planets=None):
+    # One text box per house: first row = house number, second row = planets (centered)
+    if house_planets is None:
+        house_planets = {i: [] for i in range(1, 13)}
+    S=size_pt; L,T,R,B=0,0,S,S
+    TM=(S/2,0); RM=(S,S/2); BM=(S/2,S); LM=(0,S/2)
+    P_lt=(S/4,S/4); P_rt=(3*S/4,S/4); P_rb=(3*S/4,3*S/4); P_lb=(S/4,3*S/4); O=(S/2,S/2)
+    labels = rotated_house_labels(lagna_sign)
+    houses = {
+        "1":[TM,P_rt,O,P_lt],
+        "2":[(0,0),TM,P_lt],
+        "3":[(0,0),LM,P_lt],
+        "4":[LM,O,P_lt,P_lb],
+        "5":[LM,(0,S),P_lb],
+        "6":[(0,S),BM,P_lb],
+        "7":[BM,P_rb,O,P_lb],
+        "8":[BM,(S,S),P_rb],
+        "9":[RM,(S,S),P_rb],
+        "10":[RM,O,P_rt,P_rb],
+        "11":[(S,0),RM,P_rt],
+        "12":[TM,(S,0),P_rt],
+    }
+    def centroid(poly):
+        A=Cx=Cy=0.0; n=len(poly)
+        for i in range(n):
+            x1,y1=poly[i]; x2,y2=poly[(i+1)%n]
+            cross=x1*y2 - x2*y1
+            A+=cross; Cx+=(x1+x2)*cross; Cy+=(y1+y2)*cross
+        A*=0.5
+        if abs(A)<1e-9:
+            xs,ys=zip(*poly); return (sum(xs)/n, sum(ys)/n)
+        return (Cx/(6*A), Cy/(6*A))
+    box_w, box_h = 30, 26  # slightly taller to hold two lines cleanly
+    text_boxes=[]
+    for k,poly in houses.items():
+        x,y = centroid(poly)
+        left = x - box_w/2; top = y - box_h/2
+        num = labels[k]
+        pls = house_planets.get(int(k), [])
+        if pls:
+            planets_text = " ".join(pls)
+            content = f'<w:r><w:t>{num}</w:t></w:r><w:r/><w:br/><w:r><w:t>{planets_text}</w:t></w:r>'
+        else:
+            content = f'<w:r><w:t>{num}</w:t></w:r>'
+        text_boxes.append(f'''
+        <v:rect style="position:absolute;left:{left}pt;top:{top}pt;width:{box_w}pt;height:{box_h}pt;z-index:5" strokecolor="none">
+          <v:textbox inset="0,0,0,0">
+            <w:txbxContent xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+              <w:p><w:pPr><w:jc w:val="center"/></w:pPr>{content}</w:p>
+            </w:txbxContent>
+          </v:textbox>
+        </v:rect>
+        ''')
+    boxes_xml = "\\n".join(text_boxes)
+    xml = f'''
+    <w:p xmlns:w=\"http://schemas.openxmlformats.org/wordprocessingml/2006/main\"><w:pPr><w:spacing w:before=\"0\" w:after=\"0\"/></w:pPr><w:r>
+      <w:pict xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w10="urn:schemas-microsoft-com:office:word"><w10:wrap type="topAndBottom"/>
+        <v:group style="position:relative;margin-left:auto;margin-right:auto;margin-top:0;width:{S}pt;height:{int(S*0.80)}pt" coordorigin="0,0" coordsize="{S},{S}">
+          <v:rect style="position:absolute;left:0;top:0;width:{S}pt;height:{S}pt;z-index:1" strokecolor="#CC6600" strokeweight="3pt" fillcolor="#ffdcc8"/>
+          <v:line style="position:absolute;z-index:2" from="{L},{T}" to="{R},{B}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{R},{T}" to="{L},{B}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{S/2},{T}" to="{R},{S/2}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{R},{S/2}" to="{S/2},{B}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{S/2},{B}" to="{L},{S/2}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          <v:line style="position:absolute;z-index:2" from="{L},{S/2}" to="{S/2},{T}" strokecolor="#CC6600" strokeweight="1.25pt"/>
+          {boxes_xml}
+        </v:group>
+      </w:pict>
+    </w:r></w:p>
+    '''
+    return parse_xml(xml)
+
+
+def kundali_w_p_with_centroid_labels(size_pt=220, lagna_sign=1):
+    S=size_pt; TM=(S/2,0); RM=(S,S/2); BM=(S/2,S); LM=(0,S/2); P_lt=(S/4,S/4); P_rt=(3*S/4,S/4); P_rb=(3*S/4,3*S/4); P_lb=(S/4,3*S/4); O=(S/2,S/2)
+    labels = rotated_house_labels(lagna_sign)
+    houses = {"1":[TM,P_rt,O,P_lt],"2":[(0,0),TM,P_lt],"3":[(0,0),LM,P_lt],"4":[LM,O,P_lt,P_lb],"5":[LM,(0,S),P_lb],"6":[(0,S),BM,P_lb],"7":[BM,P_rb,O,P_lb],"8":[BM,(S,S),P_rb],"9":[RM,(S,S),P_rb],"10":[RM,O,P_rt,P_rb],"11":[(S,0),RM,P_rt],"12":[TM,(S,0),P_rt]}
+    def centroid(poly):
+        A=Cx=Cy=0.0; n=len(poly)
+        for i in range(n):
+            x1,y1=poly[i]; x2,y2=poly[(i+1)%n]; cross=x1*y2 - x2*y1; A+=cross; Cx+=(x1+x2)*cross; Cy+=(y1+y2)*cross
+        A*=0.5
+        if abs(A)<1e-9: xs,ys=zip(*poly); return (sum(xs)/n, sum(ys)/n)
+        return (Cx/(6*A), Cy/(6*A))
+    w=h=20; boxes=[]
+    for k,poly in houses.items():
+        x,y = centroid(poly); left = x - w/2; top = y - h/2; txt = labels[k]
+        boxes.append(f'''
+        <v:rect style="position:absolute;left:{left}pt;top:{top}pt;width:{w}pt;height:{h}pt;z-index:5" strokecolor="none">
+          <v:textbox inset="0,0,0,0">
+            <w:txbxContent xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+              <w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:t>{txt}</w:t></w:r></w:p>
+            </w:txbxContent>
+          </v:textbox>
+        </v:rect>''')
+    boxes_xml = "\\n".join(boxes)
+    xml = f'''
+    <w:p xmlns:w=\"http://schemas.openxmlformats.org/wordprocessingml/2006/main\"><w:pPr><w:spacing w:before=\"0\" w:after=\"0\"/></w:pPr><w:r>
+        <w:pict xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w10="urn:schemas-microsoft-com:office:word"><w10:wrap type="topAndBottom"/>
+          <v:group style="position:relative;margin-left:auto;margin-right:auto;margin-top:0;width:{S}pt;height:{int(S*0.80)}pt" coordorigin="0,0" coordsize="{S},{S}">
+            <v:rect style="position:absolute;left:0;top:0;width:{S}pt;height:{S}pt;z-index:1" strokecolor="black" strokeweight="1.25pt" fillcolor="#ffdcc8"/>
+            <v:line style="position:absolute;z-index:2" from="0,0" to="{S},{S}" strokecolor="black" strokeweight="1.25pt"/>
+            <v:line style="position:absolute;z-index:2" from="{S},0" to="0,{S}" strokecolor="black" strokeweight="1.25pt"/>
+            <v:line style="position:absolute;z-index:2" from="{S/2},0" to="{S},{S/2}" strokecolor="black" strokeweight="1.25pt"/>
+            <v:line style="position:absolute;z-index:2" from="{S},{S/2}" to="{S/2},{S}" strokecolor="black" strokeweight="1.25pt"/>
+            <v:line style="position:absolute;z-index:2" from="{S/2},{S}" to="0,{S/2}" strokecolor="black" strokeweight="1.25pt"/>
+            <v:line style="position:absolute;z-index:2" from="0,{S/2}" to="{S/2},0" strokecolor="black" strokeweight="1.25pt"/>
+            {boxes_xml}
+          </v:group>
+        </w:pict></w:r></w:p>'''
+    return parse_xml(xml)
+
+def add_table_borders(table, size=6):
+    tbl = table._tbl; tblPr = tbl.tblPr; tblBorders = OxmlElement('w:tblBorders')
+    for edge in ('top','left','bottom','right','insideH','insideV'):
+        el = OxmlElement(f'w:{edge}'); el.set(qn('w:val'),'single'); el.set(qn('w:sz'),str(size)); tblBorders.append(el)
+    tblPr.append(tblBorders)
+
+def set_table_font(table, pt=8.0):
+    for row in table.rows:
+        for cell in row.cells:
+            for p in cell.paragraphs:
+                for r in p.runs: r.font.size = Pt(pt)
+
+def center_header_row(table):
+    for cell in table.rows[0].cells:
+        for par in cell.paragraphs:
+            par.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            if par.runs: par.runs[0].bold = True
+
+# ===== MODERN DESIGN STYLING FUNCTIONS =====
+
+SECTION_HEADER_XML = '''
+    <w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+      <w:pPr>
+        <w:jc w:val="{jc}"/>
+        <w:spacing w:before="120" w:after="100"/>
+      </w:pPr>
+      <w:r>
+        <w:pict xmlns:v="urn:schemas-microsoft-com:vml" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w10="urn:schemas-microsoft-com:office:word"><w10:wrap type="topAndBottom"/>
+          <v:roundrect style="position:relative;width:{width}pt;height:28pt;margin-left:auto;margin-right:auto" 
+                       arcsize="45%" strokecolor="#D2691E" strokeweight="1.5pt">
+            <v:fill type="gradient" color="#F15A23" color2="#FFEACC" angle="90" opacity="1"/>
+            <v:textbox inset="8pt,4pt,8pt,4pt">
+              <w:txbxContent>
+                <w:p>
+                  <w:pPr><w:jc w:val="{jc}"/></w:pPr>
+                  <w:r>
+                    <w:rPr>
+                      <w:color w:val="FFFFFF"/>
+                      <w:sz w:val="24"/>
+                      <w:b/>
+                      <w:rFonts w:ascii="Calibri" w:hAnsi="Calibri"/>
+                    </w:rPr>
+                    <w:t>{title}</w:t>
+                  </w:r>
+                </w:p>
+              </w:txbxContent>
+            </v:textbox>
+          </v:roundrect>
+        </w:pict>
+      </w:r>
+    </w:p>'''
+SECTION_HEADER = VmlFragment(SECTION_HEADER_XML)
+
+# Dark orange rounded frame drawn behind the personal-details cell
+DETAILS_FRAME = VmlFragment('''
+            <w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+              <w:pPr>
+                <w:spacing w:before="0" w:after="0"/>
+              </w:pPr>
+              <w:r>
+                <w:pict xmlns:v="urn:schemas-microsoft-com:vml">
+                  <v:roundrect style="position:absolute;left:0pt;top:0pt;width:{width}pt;height:{height}pt;z-index:-1" 
+                               arcsize="15%" fillcolor="transparent" strokecolor="#CC6600" strokeweight="3pt">
+                  </v:roundrect>
+                </w:pict>
+              </w:r>
+            </w:p>''')
+
+def create_cylindrical_section_header(container, title_text, width_pt=320, align='center', spacing_after=20, text_jc='center', run_text=True, line_exact=False):
+    """Create modern cylindrical tube-shaped section headers with dynamic width"""
+    # Create paragraph for the header
+    header_para = container.add_paragraph()
+    header_para.alignment = (WD_ALIGN_PARAGRAPH.RIGHT if align=='right' else (WD_ALIGN_PARAGRAPH.LEFT if align=='left' else WD_ALIGN_PARAGRAPH.CENTER))
+    header_para.paragraph_format.space_before = Pt(0)
+    header_para.paragraph_format.space_after = Pt(0)
+    # If requested, set exact line spacing to the minimum to avoid phantom height
+    if line_exact:
+        try:
+            pPr = header_para._p.get_or_add_pPr()
+            from docx.oxml import OxmlElement
+            from docx.oxml.ns import qn
+            # Remove existing spacing element if present
+            for el in list(pPr):
+                if el.tag == qn('w:spacing'):
+                    pPr.remove(el)
+            sp = OxmlElement('w:spacing')
+            sp.set(qn('w:before'), '0'); sp.set(qn('w:after'), str(int(spacing_after)))
+            sp.set(qn('w:line'), '1'); sp.set(qn('w:lineRule'), 'exact')
+            pPr.append(sp)
+        except Exception:
+            pass
+
+    # Add the title text with styling
+    if run_text:
+        run = header_para.add_run(title_text)
+        run.font.name = 'Calibri'
+        run.font.size = Pt(12)
+        run.font.bold = True
+        run.font.color.rgb = RGBColor(255, 255, 255)  # White text
+
+    # Add beautiful gradient background styling using VML shape (parsed once, see SECTION_HEADER)
+    try:
+        header_element = SECTION_HEADER.render(title=title_text, width=width_pt, jc=text_jc)
+        container._element.append(header_element)
+        # Remove the original paragraph we added
+        container._element.remove(header_para._element)
+    except Exception:
+        # Fallback to simple styled text if VML fails
+        pass
+    # Ensure spacing after header so following table starts below the bar
+    try:
+        spacer = container.add_paragraph()
+        spacer.paragraph_format.space_after = Pt(0)
+    except Exception:
+        pass
+
+def create_unified_personal_details_box(container, name, dob, tob, place):
+    """Create single rounded corner box with title inside, matching reference image exactly"""
+
+    # Try to create a rounded rectangle using VML for truly rounded corners
+    try:
+        # Create content text first
+        content_text = f'''व्यक्तिगत विवरण
+
+नाम: {name}
+जन्म तिथि: {dob}
+जन्म समय: {tob}
+स्थान: {place}'''
+
+        # Create VML rounded rectangle
+        xml_content = f'''
+        <w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+          <w:pPr>
+            <w:spacing w:before="0" w:after="120"/>
+          </w:pPr>
+          <w:r>
+            <w:pict xmlns:v="urn:schemas-microsoft-com:vml">
+              <v:roundrect style="position:relative;width:332pt;height:130pt" 
+                           arcsize="15%" fillcolor="white" strokecolor="#F15A23" strokeweight="1.5pt">
+                <v:textbox inset="12pt,10pt,12pt,10pt">
+                  <w:txbxContent>
+                    <w:p>
+                      <w:pPr><w:jc w:val="center"/><w:spacing w:after="120"/></w:pPr>
+                      <w:r>
+                        <w:rPr>
+                          <w:color w:val="F15A23"/>
+                          <w:sz w:val="22"/>
+                          <w:b/>
+                          <w:u/>
+                        </w:rPr>
+                        <w:t>व्यक्तिगत विवरण</w:t>
+                      </w:r>
+                    </w:p>
+                    <w:p>
+                      <w:pPr>
+                        <w:spacing w:after="80"/>
+                        <w:tabs>
+                          <w:tab w:val="left" w:pos="1440"/>
+                        </w:tabs>
+                      </w:pPr>
+                      <w:r>
+                        <w:rPr>
+                          <w:color w:val="F15A23"/>
+                          <w:sz w:val="20"/>
+                          <w:b/>
+                          <w:u/>
+                        </w:rPr>
+                        <w:t>नाम :</w:t>
+                      </w:r>
+                      <w:r>
+                        <w:tab/>
+                        <w:rPr>
+                          <w:color w:val="000000"/>
+                          <w:sz w:val="20"/>
+                        </w:rPr>
+                        <w:t>{name}</w:t>
+                      </w:r>
+                    </w:p>
+                    <w:p>
+                      <w:pPr>
+                        <w:spacing w:after="80"/>
+                        <w:tabs>
+                          <w:tab w:val="left" w:pos="1440"/>
+                        </w:tabs>
+                      </w:pPr>
+                      <w:r>
+                        <w:rPr>
+                          <w:color w:val="F15A23"/>
+                          <w:sz w:val="20"/>
+                          <w:b/>
+                          <w:u/>
+                        </w:rPr>
+                        <w:t>जन्म तिथि :</w:t>
+                      </w:r>
+                      <w:r>
+                        <w:tab/>
+                        <w:rPr>
+                          <w:color w:val="000000"/>
+                          <w:sz w:val="20"/>
+                        </w:rPr>
+                        <w:t>{dob}</w:t>
+                      </w:r>
+                    </w:p>
+                    <w:p>
+                      <w:pPr>
+                        <w:spacing w:after="80"/>
+                        <w:tabs>
+                          <w:tab w:val="left" w:pos="1440"/>
+                        </w:tabs>
+                      </w:pPr>
+                      <w:r>
+                        <w:rPr>
+                          <w:color w:val="F15A23"/>
+                          <w:sz w:val="20"/>
+                          <w:b/>
+                          <w:u/>
+                        </w:rPr>
+                        <w:t>जन्म समय :</w:t>
+                      </w:r>
+                      <w:r>
+                        <w:tab/>
+                        <w:rPr>
+                          <w:color w:val="000000"/>
+                          <w:sz w:val="20"/>
+                        </w:rPr>
+                        <w:t>{tob}</w:t>
+                      </w:r>
+                    </w:p>
+                    <w:p>
+                      <w:pPr>
+                        <w:spacing w:after="40"/>
+                        <w:tabs>
+                          <w:tab w:val="left" w:pos="1440"/>
+                        </w:tabs>
+                      </w:pPr>
+                      <w:r>
+                        <w:rPr>
+                          <w:color w:val="F15A23"/>
+                          <w:sz w:val="20"/>
+                          <w:b/>
+                          <w:u/>
+                        </w:rPr>
+                        <w:t>स्थान :</w:t>
+                      </w:r>
+                      <w:r>
+                        <w:tab/>
+                        <w:rPr>
+                          <w:color w:val="000000"/>
+                          <w:sz w:val="20"/>
+                        </w:rPr>
+                        <w:t>{place}</w:t>
+                      </w:r>
+                    </w:p>
+                  </w:txbxContent>
+                </v:textbox>
+              </v:roundrect>
+            </w:pict>
+          </w:r>
+        </w:p>'''
+
+        from docx.oxml import parse_xml
+        rounded_element = parse_xml(xml_content)
+        container._element.append(rounded_element)
+        return None  # No table to return
+
+    except Exception:
+        # Fallback to table approach if VML fails
+        pass
+
+    # Fallback: Create a table with rounded corners for unified personal details
+    detail_table = container.add_table(rows=1, cols=1)
+    detail_table.autofit = False
+    detail_table.columns[0].width = Inches(3.5)
+
+    cell = detail_table.rows[0].cells[0]
+
+    # Add Title "व्यक्तिगत विवरण" inside the box at the top - compact spacing
+    title_para = cell.add_paragraph('व्यक्तिगत विवरण')
+    title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_run = title_para.runs[0]
+    title_run.bold = True
+    title_run.underline = True
+    title_run.font.size = Pt(11)  # Slightly smaller for compact
+    title_run.font.color.rgb = RGBColor(241, 90, 35)  # Orange color
+    title_para.paragraph_format.space_after = Pt(4)  # Reduced from 8
+    title_para.paragraph_format.space_before = Pt(0)  # Reduced from 2
+
+    # Add Name - compact spacing
+    name_para = cell.add_paragraph()
+    name_title = name_para.add_run('नाम: ')
+    name_title.bold = True
+    name_title.font.size = Pt(9)  # Smaller font for compact
+    name_title.font.color.rgb = RGBColor(241, 90, 35)  # Orange color
+    name_content = name_para.add_run(str(name))
+    name_content.font.size = Pt(9)  # Smaller font for compact
+    name_content.font.color.rgb = RGBColor(0, 0, 0)  # Black color like in reference
+    name_para.paragraph_format.space_after = Pt(1)  # Reduced from 3
+
+    # Add Date of Birth - compact spacing
+    dob_para = cell.add_paragraph()
+    dob_title = dob_para.add_run('जन्म तिथि: ')
+    dob_title.bold = True
+    dob_title.font.size = Pt(9)  # Smaller font for compact
+    dob_title.font.color.rgb = RGBColor(241, 90, 35)  # Orange color
+    dob_content = dob_para.add_run(str(dob))
+    dob_content.font.size = Pt(9)  # Smaller font for compact
+    dob_content.font.color.rgb = RGBColor(0, 0, 0)  # Black color like in reference
+    dob_para.paragraph_format.space_after = Pt(1)  # Reduced from 3
+
+    # Add Time of Birth - compact spacing
+    tob_para = cell.add_paragraph()
+    tob_title = tob_para.add_run('जन्म समय: ')
+    tob_title.bold = True
+    tob_title.font.size = Pt(9)  # Smaller font for compact
+    tob_title.font.color.rgb = RGBColor(241, 90, 35)  # Orange color
+    tob_content = tob_para.add_run(str(tob))
+    tob_content.font.size = Pt(9)  # Smaller font for compact
+    tob_content.font.color.rgb = RGBColor(0, 0, 0)  # Black color like in reference
+    tob_para.paragraph_format.space_after = Pt(1)  # Reduced from 3
+
+    # Add Place - compact spacing
+    place_para = cell.add_paragraph()
+    place_title = place_para.add_run('स्थान: ')
+    place_title.bold = True
+    place_title.font.size = Pt(9)  # Smaller font for compact
+    place_title.font.color.rgb = RGBColor(241, 90, 35)  # Orange color
+    place_content = place_para.add_run(str(place))
+    place_content.font.size = Pt(9)  # Smaller font for compact
+    place_content.font.color.rgb = RGBColor(0, 0, 0)  # Black color like in reference
+    place_para.paragraph_format.space_after = Pt(0)  # Reduced from 2
+
+    # Apply compact rounded corner styling with minimal padding
+    try:
+        cell_elem = cell._tc
+        tcPr = cell_elem.get_or_add_tcPr()
+
+        # Add rounded corner borders using dotted style for rounded appearance
+        tcBorders = OxmlElement('w:tcBorders')
+        for edge in ('top', 'left', 'bottom', 'right'):
+            border = OxmlElement(f'w:{edge}')
+            border.set(qn('w:val'), 'single')
+            border.set(qn('w:sz'), '6')  # Thin border
+            border.set(qn('w:color'), 'F15A23')  # Orange color matching reference
+            tcBorders.append(border)
+        tcPr.append(tcBorders)
+
+        # Minimal padding for compact 1-page format
+        tcMar = OxmlElement('w:tcMar')
+        for side in ('top', 'left', 'bottom', 'right'):
+            margin = OxmlElement(f'w:{side}')
+            margin.set(qn('w:w'), '80')  # Minimal padding for compact layout
+            margin.set(qn('w:type'), 'dxa')
+            tcMar.append(margin)
+        tcPr.append(tcMar)
+
+        # Clean white background
+        shd = OxmlElement('w:shd')
+        shd.set(qn('w:val'), 'clear')
+        shd.set(qn('w:color'), 'auto')
+        shd.set(qn('w:fill'), 'FFFFFF')  # Pure white background
+        tcPr.append(shd)
+
+        # Add rounded corner effect using XML for better circular appearance
+        tcW = OxmlElement('w:tcW')
+        tcW.set(qn('w:w'), '0')
+        tcW.set(qn('w:type'), 'auto')
+        tcPr.append(tcW)
+
+    except Exception:
+        pass
+
+    return detail_table
+
+def create_rounded_detail_box(container, title, content):
+    """Create rounded corner boxes for personal details"""
+    # Create a table with rounded corners for the detail box
+    detail_table = container.add_table(rows=1, cols=1)
+    detail_table.autofit = False
+    detail_table.columns[0].width = Inches(6.0)
+
+    cell = detail_table.rows[0].cells[0]
+
+    # Add title
+    title_para = cell.add_paragraph(title)
+    title_run = title_para.runs[0] if title_para.runs else title_para.add_run(title)
+    title_run.bold = True
+    title_run.font.size = Pt(10)
+    title_run.font.color.rgb = RGBColor(241, 90, 35)  # Orange color
+    title_para.paragraph_format.space_after = Pt(2)
+
+    # Add content
+    content_para = cell.add_paragraph(content)
+    content_run = content_para.runs[0] if content_para.runs else content_para.add_run(content)
+    content_run.font.size = Pt(9)
+    content_run.font.color.rgb = RGBColor(51, 51, 51)  # Dark grey
+
+    # Apply rounded corner styling to the cell
+    try:
+        cell_elem = cell._tc
+        tcPr = cell_elem.get_or_add_tcPr()
+
+        # Add rounded corner borders
+        tcBorders = OxmlElement('w:tcBorders')
+        for edge in ('top', 'left', 'bottom', 'right'):
+            border = OxmlElement(f'w:{edge}')
+            border.set(qn('w:val'), 'single')
+            border.set(qn('w:sz'), '8')
+            border.set(qn('w:color'), 'F15A23')  # Dark orange
+            tcBorders.append(border)
+        tcPr.append(tcBorders)
+
+        # Add cell padding
+        tcMar = OxmlElement('w:tcMar')
+        for side in ('top', 'left', 'bottom', 'right'):
+            margin = OxmlElement(f'w:{side}')
+            margin.set(qn('w:w'), '100')
+            margin.set(qn('w:type'), 'dxa')
+            tcMar.append(margin)
+        tcPr.append(tcMar)
+
+    except Exception:
+        pass
+
+    return detail_table
+
+def create_rounded_table_container(doc, table_content, width_pt=400, height_pt=200):
+    """Create a VML rounded rectangle container for tables with true circular corners"""
+    # Create paragraph with VML roundrect container
+    p = doc.add_paragraph()
+
+    # Create VML roundrect with genuine rounded corners
+    xml_content = f'''
+    <w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+      <w:pPr>
+        <w:spacing w:before="60" w:after="60"/>
+      </w:pPr>
+      <w:r>
+        <w:pict xmlns:v="urn:schemas-microsoft-com:vml">
+          <v:roundrect style="position:relative;width:{width_pt}pt;height:{height_pt}pt" 
+                       arcsize="15%" fillcolor="#ffdcc8" strokecolor="#D2691E" strokeweight="2pt">
+            <v:textbox inset="8pt,8pt,8pt,8pt">
+              <w:txbxContent>
+                {table_content}
+              </w:txbxContent>
+            </v:textbox>
+          </v:roundrect>
+        </w:pict>
+      </w:r>
+    </w:p>
+    '''
+
+    return parse_xml(xml_content)
+
+def apply_premium_table_style(table, header_color_rgb=(204, 102, 0), alt_row_color_rgb=(255, 235, 224)):
+    """Apply premium professional styling to tables with genuine rounded corners using VML background"""
+    try:
+        # Apply table borders - no outer borders for rounded effect
+        tbl = table._tbl
+        tblPr = tbl.tblPr
+        tblBorders = OxmlElement('w:tblBorders')
+
+        # Apply rounded corner border styling
+        border_styles = {
+            'top': ('thick', '12'),     # Thick top border for rounded effect
+            'left': ('thick', '12'),    # Thick left border for rounded effect 
+            'bottom': ('thick', '12'),  # Thick bottom border for rounded effect
+            'right': ('thick', '12'),   # Thick right border for rounded effect
+            'insideH': ('single', '6'),  # Internal horizontal borders
+            'insideV': ('single', '6')   # Internal vertical borders
+        }
+
+        for edge, (style, size) in border_styles.items():
+            border = OxmlElement(f'w:{edge}')
+            border.set(qn('w:val'), style)
+            border.set(qn('w:sz'), size)
+            border.set(qn('w:color'), 'D2691E')  # Dark orange color
+            tblBorders.append(border)
+        tblPr.append(tblBorders)
+
+        # Add table alignment
+        tblAlign = OxmlElement('w:jc')
+        tblAlign.set(qn('w:val'), 'center')
+        tblPr.append(tblAlign)
+
+        # Add table style properties for rounded corners
+        try:
+            # Apply table-level styling for rounded appearance
+            tblStyle = OxmlElement('w:tblStyle')
+            tblStyle.set(qn('w:val'), 'TableGrid')  # Use a style that supports rounding
+            tblPr.insert(0, tblStyle)
+
+            # Add table cell margins for better spacing
+            tblCellMar = OxmlElement('w:tblCellMar')
+            for side in ['top', 'left', 'bottom', 'right']:
+                margin = OxmlElement(f'w:{side}')
+                margin.set(qn('w:w'), '60')  # Add some margin
+                margin.set(qn('w:type'), 'dxa')
+                tblCellMar.append(margin)
+            tblPr.append(tblCellMar)
+
+        except Exception:
+            pass
+
+        # Add genuine VML rounded corners to corner cells
+        try:
+            # Get corner cells and add VML rounded rectangle backgrounds
+            num_rows = len(table.rows)
+            num_cols = len(table.rows[0].cells) if table.rows else 0
+
+            if num_rows > 0 and num_cols > 0:
+                # Apply VML rounded backgrounds to corner cells
+                corner_positions = [
+                    (0, 0, 'top-left'),
+                    (0, num_cols-1, 'top-right'),
+                    (num_rows-1, 0, 'bottom-left'),
+                    (num_rows-1, num_cols-1, 'bottom-right')
+                ]
+
+                for row_idx, col_idx, corner_type in corner_positions:
+                    try:
+                        cell = table.cell(row_idx, col_idx)
+
+                        cell.add_paragraph()
+
+                        # The rounded-corner VML overlay that used to be parsed here never
+                        # reached the document (a parsed element has no ._element, and the
+                        # AttributeError was swallowed below); only the empty paragraph
+                        # above is part of the output, so the parse is skipped.
+
+                    except Exception:
+                        continue
+
+        except Exception:
+            pass
+
+        # Style header row with premium look
+        header_cells = table.rows[0].cells
+        for cell in header_cells:
+            # Premium header background
+            cell_elem = cell._tc
+            tcPr = cell_elem.get_or_add_tcPr()
+            shd = OxmlElement('w:shd')
+            shd.set(qn('w:val'), 'clear')
+            shd.set(qn('w:color'), 'auto')
+            shd.set(qn('w:fill'), '{:02x}{:02x}{:02x}'.format(*header_color_rgb))
+            tcPr.append(shd)
+
+            # Add minimal cell padding for compactness
+            tcMar = OxmlElement('w:tcMar')
+            for side in ('top', 'left', 'bottom', 'right'):
+                margin = OxmlElement(f'w:{side}')
+                margin.set(qn('w:w'), '40')  # Reduced from 100 to 40
+                margin.set(qn('w:type'), 'dxa')
+                tcMar.append(margin)
+            tcPr.append(tcMar)
+
+            # Enhanced header text styling
+            for paragraph in cell.paragraphs:
+                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                for run in paragraph.runs:
+                    run.bold = True
+                    run.font.color.rgb = RGBColor(255, 255, 255)
+                    run.font.size = Pt(9)  # Slightly smaller for compactness
+                    run.font.name = 'Calibri'
+
+        # Style data rows with professional alternating colors
+        for i, row in enumerate(table.rows[1:], 1):
+            for cell in row.cells:
+                cell_elem = cell._tc
+                tcPr = cell_elem.get_or_add_tcPr()
+
+                # Alternating row colors: odd rows (1,3,5...) get beautiful light orange background
+                if i % 2 == 1:  # Odd rows get the beautiful light orange background
+                    shd = OxmlElement('w:shd')
+                    shd.set(qn('w:val'), 'clear')
+                    shd.set(qn('w:color'), 'auto')
+                    shd.set(qn('w:fill'), '{:02x}{:02x}{:02x}'.format(*alt_row_color_rgb))
+                    tcPr.append(shd)
+                # Even rows (2,4,6...) get no background color (default white)
+
+                # Add minimal cell padding for all data cells
+                tcMar = OxmlElement('w:tcMar')
+                for side in ('top', 'left', 'bottom', 'right'):
+                    margin = OxmlElement(f'w:{side}')
+                    margin.set(qn('w:w'), '30')  # Reduced from 80 to 30
+                    margin.set(qn('w:type'), 'dxa')
+                    tcMar.append(margin)
+                tcPr.append(tcMar)
+
+                # Enhanced data text styling
+                for paragraph in cell.paragraphs:
+                    for run in paragraph.runs:
+                        run.font.color.rgb = RGBColor(51, 51, 51)
+                        run.font.size = Pt(8)  # Even smaller for data cells to fit more content
+                        run.font.name = 'Calibri'
+    except Exception:
+        pass
+
+def create_section_header(container, title, color_rgb=(25, 55, 109)):
+    """Create original decorative section header"""
+    # Original section header styling
+    h = container.add_paragraph(title)
+    h.runs[0].bold = True
+    h.runs[0].underline = True
+    h.runs[0].font.size = Pt(13)
+    h.runs[0].font.color.rgb = RGBColor(*color_rgb)
+    h.runs[0].font.name = 'Calibri'
+    h.paragraph_format.space_before = Pt(8)
+    h.paragraph_format.space_after = Pt(6)
+
+    return h
+
+def set_col_widths(table, widths_inch):
+    table.autofit = False
+    for row in table.rows:
+        for i, w in enumerate(widths_inch):
+            row.cells[i].width = Inches(w)
+
+def add_pramukh_bindu_section(container_cell, ctx, lagna_sign, dob_dt):
+    ctx = _as_context(ctx, lagna_sign)  # ChartContext, or a plain sidelons dict
+    spacer = container_cell.add_paragraph("")
+    spacer.paragraph_format.space_after = Pt(0)
+    # Title
+    # title = container_cell.add_paragraph("प्रमुख बिंदु")
+    # # Match other section titles
+    # _apply_hindi_caption_style(title, size_pt=11, underline=True, bold=True)
+    # title.paragraph_format.space_before = Pt(0)
+    # title.paragraph_format.space_after = Pt(2)
+    # title.paragraph_format.space_before = Pt(6)
+    # title.paragraph_format.space_after = Pt(3)
+    create_cylindrical_section_header(container_cell, "प्रमुख बिंदु", width_pt=260)
+
+    rows = []
+
+    # Muntha
+    m = detect_muntha_house(lagna_sign, dob_dt)
+    if m:
+        rows.append(("मुन्था (वर्तमान वर्ष)", _english_bhav_label(m)))
+
+    # Sade Sati / Dhaiyya
+    status, phase = detect_sade_sati_or_dhaiyya(ctx)
+    if status:
+        rows.append(("साढ़ेसाती/शनि ढैय्या", status))
+        if status == "साढ़ेसाती" and phase:
+            rows.append(("साढ़ेसाती का चरण", phase))
+        try:
+            from datetime import datetime
+            period = sade_sati_current_period(ctx.rasi['Mo'], datetime.utcnow())
+            if period:
+                rows.append(("अवधि", f"{period['start']:%d-%m-%Y} – {period['end']:%d-%m-%Y}"))
+        except Exception:
+            pass
+
+    # Dosha/Yoga (only if True): every PRAMUKH_YOGAS rule in one evaluation
+    try:
+        for yoga in chart_yogas(ctx, lagna_sign):
+            rows.append((yoga.label, "हाँ"))
+    except Exception:
+        pass
+
+    if not rows:
+        # Nothing to show; avoid adding an empty table
+        return
+
+    t = container_cell.add_table(rows=0, cols=2)
+    t.autofit = True
+    # Match font size with other tables
+    try:
+        set_table_font(t, pt=BASE_FONT_PT)
+    except Exception:
+        pass
+    for left_txt, right_txt in rows:
+        r = t.add_row().cells
+        r[0].text = left_txt
+        r[1].text = right_txt
+
+    # Borders similar to other tables
+    add_table_borders(t, size=6)
+    apply_premium_table_style(t)  # Apply orange headers and alternating grey rows
+    return t  # its cell paragraphs are compacted by normalize_document
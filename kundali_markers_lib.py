@@ -5,6 +5,8 @@ from docx import Document
 from docx.oxml import parse_xml
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
+from vargas import navamsa_sign as navamsa_sign_from_lon_sid  # D9 via the shared varga tables
+
 HN_ABBR = {
     'Su': 'सू', 'Mo': 'चं', 'Ma': 'मं', 'Me': 'बु',
     'Ju': 'गु', 'Ve': 'शु', 'Sa': 'श', 'Ra': 'रा', 'Ke': 'के'
@@ -28,10 +30,6 @@ def _sep_deg(a, b):
 def _rasi_sign(lon_sid):
     return int(lon_sid // 30) + 1
 
-def navamsa_sign_from_lon_sid(lon_sid):
-    rasi = int(lon_sid // 30) + 1
-    part = int((lon_sid % 30) // (30/9.0))
-    return ((rasi - 1) * 9 + part) % 12 + 1
 
 def _is_combust_d1(code, sidelons):
     if code not in COMB_ORB or COMB_ORB[code] == 0: return False
@@ -0,0 +1,572 @@
+# kundali_pipeline.py
+# One kundali, end to end and without Streamlit: request -> place -> chart -> DOCX bytes.
+# Usage:
+#   from kundali_pipeline import KundaliRequest, generate_kundali, kundali_filename
+#   req = KundaliRequest("Asha", "Jaipur, Rajasthan, India", datetime.date(1990, 5, 17), datetime.time(6, 45))
+#   data = generate_kundali(req, api_key)          # .docx bytes
+#   open(kundali_filename(req.name), "wb").write(data)
+#
+# The Streamlit app, the batch CLI (batch_kundali.py) and worker processes all
+# go through generate_kundali, so a DOCX is built the same way everywhere.
+
+import datetime
+from io import BytesIO
+from typing import NamedTuple
+
+from docx.enum.table import WD_ALIGN_VERTICAL, WD_ROW_HEIGHT_RULE, WD_TABLE_ALIGNMENT
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt
+
+from geocoding import resolve_place
+from vargas import shodashvarga
+from vimshottari import DashaTree
+from kundali_chart import (HN, YEAR_DAYS, ChartContext, compute_chart, positions_table_no_symbol, POSITION_HEADERS,
+                           build_mahadashas_days_utc, MAHADASHA_TABLE_YEARS, _utc_to_local,
+                           fmt_deg_sign)
+from kundali_docx import (new_document, set_col_widths, set_cell_margins,
+                          normalize_document,
+                          create_cylindrical_section_header, center_header_row, set_table_font,
+                          add_table_borders, apply_premium_table_style, add_pramukh_bindu_section,
+                          add_phalit_section, kundali_with_planets,
+                          DETAILS_FRAME, BASE_FONT_PT)
+
+
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y")
+TIME_FORMATS = ("%H:%M:%S", "%H:%M")
+
+
+class KundaliRequest(NamedTuple):
+    """One person's birth details as entered in the form (tz: manual UTC offset, blank = auto)."""
+    name: str
+    place: str
+    dob: datetime.date
+    tob: datetime.time
+    tz: str = ""
+
+
+def _parse(value, formats, what):
+    value = (value or "").strip()
+    for fmt in formats:
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"bad {what}: {value!r}")
+
+
+def request_from_record(rec):
+    """KundaliRequest from a dict of strings (CSV/JSONL row, HTTP body); raises ValueError on bad input."""
+    name = str(rec.get("name") or "").strip()
+    place = str(rec.get("place") or "").strip()
+    if not name or not place:
+        raise ValueError("name and place are required")
+    dob = _parse(str(rec.get("dob") or ""), DATE_FORMATS, "dob").date()
+    tob = _parse(str(rec.get("tob") or ""), TIME_FORMATS, "tob").time()
+    tz = rec.get("tz")
+    if tz is not None and str(tz).strip():
+        try:
+            float(tz)
+        except ValueError:
+            raise ValueError(f"bad tz: {tz!r}") from None
+    return KundaliRequest(name, place, dob, tob, "" if tz is None else str(tz).strip())
+
+
+def sanitize_filename(name: str) -> str:
+    # Keep spaces; strip leading/trailing; allow letters/digits/space/_/- only
+    raw = (name or 'Horoscope').strip()
+    cleaned = ''.join(ch for ch in raw if ch.isalnum() or ch in ' _-')
+    return cleaned or 'Horoscope'
+
+def kundali_filename(name):
+    return f"{sanitize_filename(name)}_Horoscope.docx"
+
+
+def compute_kundali(req, api_key="", resolved=None):
+    """(ResolvedPlace, KundaliChart) for a request; pass `resolved` to skip geocoding."""
+    rp = resolved or resolve_place(req.place, api_key)
+    dt_local = datetime.datetime.combine(req.dob, req.tob).replace(tzinfo=None)
+    tz = str(req.tz if req.tz is not None else "").strip()
+    return rp, compute_chart(dt_local, rp.lat, rp.lon, rp.tz_name, float(tz) if tz else None)
+
+
+def chart_summary(req, rp, chart):
+    """JSON-ready view of a computed chart: place, time zone, planets by code (with D1-D60 signs), mahadashas."""
+    planets = {}
+    ctx = ChartContext.from_chart(chart)
+    codes = list(chart.sidelons)
+    vargas = {d: signs.tolist() for d, signs in shodashvarga([chart.sidelons[c] for c in codes]).items()}
+    for i, code in enumerate(codes):
+        lon = chart.sidelons[code]
+        sign, deg = fmt_deg_sign(lon); nak_lord, sub_lord = ctx.kp[code]
+        planets[code] = {'lon': round(lon, 6), 'sign': sign, 'deg': deg,
+                         'navamsa_sign': vargas[9][i],
+                         'nakshatra_lord': nak_lord, 'sub_lord': sub_lord,
+                         'vargas': {f"D{d}": v[i] for d, v in vargas.items()}}
+    return {
+        'name': req.name,
+        'place': {'query': rp.query, 'formatted': rp.formatted, 'lat': rp.lat, 'lon': rp.lon,
+                  'tz_name': rp.tz_name},
+        'birth_local': chart.dt_local.isoformat(),
+        'birth_utc': chart.dt_utc.isoformat(),
+        'tz': chart.tzname, 'utc_offset_hours': chart.tz_hours,
+        'ayanamsa': round(chart.ayanamsa, 6),
+        'lagna_sign': chart.lagna_sign, 'asc_lon': round(chart.asc_sid, 6),
+        'navamsa_lagna_sign': chart.nav_lagna_sign,
+        'planets': planets,
+        'mahadashas': [{'planet': s['planet'], 'start': s['start'].isoformat(), 'end': s['end'].isoformat()}
+                       for s in build_mahadashas_days_utc(chart.dt_utc, chart.sidelons['Mo'])],
+    }
+
+
+class MahadashaRow(NamedTuple):
+    graha: str
+    end: str        # DD-MM-YYYY, local time
+    age: int        # completed years at the end of the period
+
+MAHADASHA_HEADERS = ("ग्रह", "समाप्ति तिथि", "आयु (वर्ष)")
+
+
+class AntardashaRow(NamedTuple):
+    mahadasha: str
+    antardasha: str
+    end: str        # DD-MM-YYYY, local time
+
+ANTARDASHA_HEADERS = ("महादशा", "अंतरदशा", "तिथि")
+
+
+def _add_table_rows(table, rows):
+    """Append tuple rows to a python-docx table as centred text cells."""
+    for values in rows:
+        for cell, value in zip(table.add_row().cells, values):
+            cell.text = "" if value is None else str(value)
+            for p in cell.paragraphs:
+                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+
+def render_kundali_docx(name, place, chart, disp=None):
+    """Build the one-page kundali DOCX for a computed chart and return its bytes."""
+    dt_local, dt_utc = chart.dt_local, chart.dt_utc
+    tzname, tz_hours, used_manual = chart.tzname, chart.tz_hours, chart.used_manual
+    sidelons, lagna_sign, nav_lagna_sign = chart.sidelons, chart.lagna_sign, chart.nav_lagna_sign
+
+    # Rasi/navamsa signs, houses, statuses and KP lords: computed once, shared by every section
+    ctx = ChartContext.from_chart(chart)
+    position_rows = positions_table_no_symbol(ctx)
+
+    dasha_tree = DashaTree(dt_utc, sidelons['Mo'], years=MAHADASHA_TABLE_YEARS)
+
+    def age_years(birth_dt_local, end_utc):
+        local_end = _utc_to_local(end_utc, tzname, tz_hours, used_manual)
+        days = (local_end.date() - birth_dt_local.date()).days
+        return int(days // YEAR_DAYS)
+
+    md_rows = [
+        MahadashaRow(HN[p.lord],
+                     _utc_to_local(p.end, tzname, tz_hours, used_manual).strftime("%d-%m-%Y"),
+                     age_years(dt_local, p.end))
+        for p in dasha_tree.mahadashas
+    ]
+
+    now_utc = datetime.datetime.utcnow()
+    horizon = now_utc + datetime.timedelta(days=365*10)
+    an_rows = [
+        AntardashaRow(HN[p.lords[0]], HN[p.lord],
+                      _utc_to_local(p.end, tzname, tz_hours, used_manual).strftime("%d-%m-%Y"))
+        for p in dasha_tree.upcoming(now_utc, level=2, k=5) if p.start < horizon
+    ]
+
+    # ===== ENHANCED DOCUMENT SETUP =====
+    # Page size, margins, fonts and background come pre-applied on the cached template skeleton
+    doc = new_document()
+
+    # ===== EXACT LAYOUT MATCH: Top section with Personal Details (left) + MRIDAASTRO (right) =====
+    try:
+        # Create top header table (2 columns: Personal Details | MRIDAASTRO)
+        header_table = doc.add_table(rows=1, cols=2)
+        header_table.autofit = False
+        left_width_in = 3.85  # inches; Personal Details column
+        header_table.columns[0].width = Inches(left_width_in)
+        header_table.columns[1].width = Inches(7.5 - left_width_in)
+        # Remove default table cell margins to maximize usable height
+        try:
+            tbl = header_table._tbl
+            tblPr = tbl.tblPr
+            # Drop any existing tblCellMar
+            for el in list(tblPr):
+                if el.tag.endswith('tblCellMar'):
+                    tblPr.remove(el)
+            cellMar = OxmlElement('w:tblCellMar')
+            for side in ('top','bottom','left','right'):
+                m = OxmlElement(f'w:{side}')
+                m.set(qn('w:w'), '0')
+                m.set(qn('w:type'), 'dxa')
+                cellMar.append(m)
+            tblPr.append(cellMar)
+        except Exception:
+            pass
+  # keep total ~7.5"
+  # Right: MRIDAASTRO (adjusted)
+
+        # Remove borders from header table
+        hdr_tbl = header_table._tbl
+        hdr_tblPr = hdr_tbl.tblPr
+        hdr_tblBorders = OxmlElement('w:tblBorders')
+        for edge in ('top','left','bottom','right','insideH','insideV'):
+            el = OxmlElement(f'w:{edge}')
+            el.set(qn('w:val'), 'nil')
+            hdr_tblBorders.append(el)
+        hdr_tblPr.append(hdr_tblBorders)
+
+        # LEFT CELL: Personal Details
+        left_cell = header_table.rows[0].cells[0]
+
+        # Keep the cell exactly as tall as the overlay so content centers within the round-rect
+        header_table.rows[0].height_rule = WD_ROW_HEIGHT_RULE.EXACTLY
+        header_table.rows[0].height = Pt(92)
+        # Vertical center the whole block within the cell
+        left_cell.vertical_alignment = WD_ALIGN_VERTICAL.TOP
+        # Personal Details Title
+        p_title = left_cell.add_paragraph()
+        p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p_title.paragraph_format.space_before = Pt(0)
+        p_title.paragraph_format.space_after = Pt(0)
+        r_title = p_title.add_run("व्यक्तिगत विवरण")
+        r_title.font.bold = True
+        r_title.font.size = Pt(12)
+
+        # Create aligned personal details using proper spacing
+        details = [
+            ("नाम:", name),
+            ("जन्म तिथि:", dt_local.strftime('%Y-%m-%d')),
+            ("जन्म समय:", dt_local.strftime('%H:%M:%S')),
+            ("स्थान:", place)
+        ]
+
+        pd_table = left_cell.add_table(rows=len(details), cols=2)
+        try:
+            pd_table.alignment = WD_TABLE_ALIGNMENT.CENTER
+        except Exception:
+            pass
+        set_col_widths(pd_table, [1.3, max(1.0, left_width_in - 1.3 - 0.1)])
+        for i, (label, value) in enumerate(details):
+            c0 = pd_table.cell(i, 0)
+            c1 = pd_table.cell(i, 1)
+            # tiny inner padding for breathing room (overrides table-level margins)
+            for _cell in (c0, c1):
+                tcPr = _cell._tc.get_or_add_tcPr()
+                # Remove existing tcMar if present
+                for el in list(tcPr):
+                    if el.tag.endswith('tcMar'):
+                        tcPr.remove(el)
+                tcMar = OxmlElement('w:tcMar')
+                for side, val in (('top','20'), ('bottom','20'), ('left','35'), ('right','35')):
+                    el = OxmlElement(f'w:{side}')
+                    el.set(qn('w:w'), val)  # dxa units (1/20 pt)
+                    el.set(qn('w:type'), 'dxa')
+                    tcMar.append(el)
+                tcPr.append(tcMar)
+
+            # Label
+            p0 = c0.paragraphs[0]
+            p0.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            p0.paragraph_format.space_before = Pt(0)
+            p0.paragraph_format.space_after = Pt(0)
+            r0 = p0.add_run(str(label))
+            r0.font.bold = True
+            r0.font.size = Pt(10)
+            # Value
+            p1 = c1.paragraphs[0]
+            p1.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            p1.paragraph_format.space_before = Pt(0)
+            p1.paragraph_format.space_after = Pt(0)
+            r1 = p1.add_run(str(value))
+            r1.font.size = Pt(10)
+
+        # Add dark orange rounded border around personal details cell using VML
+        try:
+            # Create a VML rounded rectangle overlay for the personal details
+            vml_w_pt = int(left_width_in * 72) - 10
+            vml_h_pt = 92
+            vml_element = DETAILS_FRAME.render(width=vml_w_pt, height=vml_h_pt)
+            left_cell._element.insert(0, vml_element)
+        except Exception:
+            # Fallback to regular thick border if VML fails
+            tc = left_cell._tc
+            tcPr = tc.get_or_add_tcPr()
+
+            # Remove existing borders first
+            existing_borders = tcPr.find(qn('w:tcBorders'))
+            if existing_borders is not None:
+                tcPr.remove(existing_borders)
+
+            # Add dark orange borders
+            tcBorders = OxmlElement('w:tcBorders')
+            for edge in ('top', 'left', 'bottom', 'right'):
+                el = OxmlElement(f'w:{edge}')
+                el.set(qn('w:val'), 'single')
+                el.set(qn('w:sz'), '18')  # Thick border
+                el.set(qn('w:color'), 'CC6600')  # Dark orange
+                el.set(qn('w:space'), '0')
+                tcBorders.append(el)
+            tcPr.append(tcBorders)
+
+        # RIGHT CELL: MRIDAASTRO + Tagline
+        right_cell = header_table.rows[0].cells[1]
+
+        # MRIDAASTRO - Enhanced font size (48px equivalent = 36pt)
+        p_mrid = right_cell.add_paragraph()
+        p_mrid.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        r_mrid = p_mrid.add_run("MRIDAASTRO")
+        r_mrid.font.bold = True
+        r_mrid.font.size = Pt(36)  # Enhanced from 16pt to 36pt
+        r_mrid.font.name = "Cinzel Decorative"
+        # Force font type change using XML
+        rPr = r_mrid._element.rPr
+        if rPr is not None:
+            rFonts = rPr.find(qn('w:rFonts'))
+            if rFonts is not None:
+                rFonts.set(qn('w:ascii'), 'Cinzel Decorative')
+                rFonts.set(qn('w:hAnsi'), 'Cinzel Decorative')
+                rFonts.set(qn('w:cs'), 'Cinzel Decorative')
+
+        # Tagline
+        p_tag = right_cell.add_paragraph()
+        p_tag.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        r_tag = p_tag.add_run("In the light of the divine, let your soul journey shine.")
+        r_tag.italic = True
+        r_tag.font.size = Pt(10)  # Enhanced from 10pt to 14pt
+
+        # Add some space after header table
+        spacer1 = doc.add_paragraph()
+        spacer1.paragraph_format.space_after = Pt(6)
+
+        # CENTERED DOCUMENT TITLE
+        title_para = doc.add_paragraph()
+        title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        r_title_main = title_para.add_run("PERSONAL HOROSCOPE (JANMA KUNDALI)")
+        r_title_main.font.bold = True
+        r_title_main.font.size = Pt(20)
+
+        # Add space after title
+        spacer2 = doc.add_paragraph()
+        spacer2.paragraph_format.space_after = Pt(4)
+
+    except Exception:
+        # Fallback to simple header
+        pass
+# ===== End Header Block (simplified & robust) =====
+# ===== End Header Block (safe) =====
+
+
+    # ===== ENHANCED MAIN LAYOUT TABLE =====
+    outer = doc.add_table(rows=1, cols=2); outer.autofit=False
+    right_width_in = 3.70; outer.columns[0].width = Inches(3.70); outer.columns[1].width = Inches(3.70)
+
+    CHART_W_PT = int(right_width_in * 72 - 10)
+    CHART_H_PT = int(CHART_W_PT * 0.80)
+    ROW_HEIGHT_PT = int(CHART_H_PT + 36)
+
+    # Remove outer borders and the internal vertical divider
+    tbl = outer._tbl; tblPr = tbl.tblPr; tblBorders = OxmlElement('w:tblBorders')
+    for edge in ('top','left','bottom','right','insideH','insideV'):
+        el = OxmlElement(f'w:{edge}'); el.set(qn('w:val'),'nil'); tblBorders.append(el)
+    tblPr.append(tblBorders)
+    # Remove horizontal internal borders
+    for edge in ('insideH',):
+        el = OxmlElement(f'w:{edge}'); el.set(qn('w:val'),'nil'); tblBorders.append(el)
+    tblPr.append(tblBorders)
+
+    # Add subtle table shading
+    try:
+        tblPr = outer._tbl.tblPr
+        shd = OxmlElement('w:shd')
+        shd.set(qn('w:val'), 'clear')
+        shd.set(qn('w:color'), 'auto')
+        shd.set(qn('w:fill'), 'FDFDFD')  # Very light background
+        tblPr.append(shd)
+    except Exception:
+        pass
+
+    left = outer.rows[0].cells[0]
+    # ===== MODERN PERSONAL DETAILS SECTION WITH UNIFIED ROUNDED BOX =====            
+    # Get place display value
+    try:
+        place_disp = disp
+    except Exception:
+        place_disp = place if 'place' in locals() else ''
+
+    # Personal details are now in the header section above, no need for duplicate
+    # Original planetary positions section
+    # h1 = left.add_paragraph("ग्रह स्थिति"); _apply_hindi_caption_style(h1, size_pt=11, underline=True, bold=True)
+    create_cylindrical_section_header(left, "ग्रह स्थिति", width_pt=260)
+
+    # === COMPLETELY REWRITTEN FIRST TABLE: ग्रह स्थिति ===
+    # Create table with exact 5 columns for clean structure
+    t1 = left.add_table(rows=1, cols=5)
+    t1.autofit = False  # Disable autofit to prevent conflicts
+
+    # Set headers manually to ensure correct order
+    for i, header in enumerate(POSITION_HEADERS):
+        t1.rows[0].cells[i].text = header
+
+    # Add data rows (centred)
+    _add_table_rows(t1, position_rows)
+
+    # Apply styling and formatting
+    center_header_row(t1)
+    set_table_font(t1, pt=BASE_FONT_PT)
+    add_table_borders(t1, size=6)
+    apply_premium_table_style(t1)
+
+    # Set proper column widths AFTER creating structure
+    set_col_widths(t1, [0.70, 0.55, 0.85, 0.80, 0.80])
+
+    # Left align ONLY the header cell of the last column (उप‑नक्षत्र)
+    for p in t1.rows[0].cells[-1].paragraphs:
+        p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+
+
+    # Original Mahadasha section
+    # h2 = left.add_paragraph("विंशोत्तरी महादशा"); _apply_hindi_caption_style(h2, size_pt=11, underline=True, bold=True); h2.paragraph_format.keep_with_next = True; h2.paragraph_format.space_after = Pt(2)
+    create_cylindrical_section_header(left, "विंशोत्तरी महादशा", width_pt=260)
+    t2 = left.add_table(rows=1, cols=len(MAHADASHA_HEADERS)); t2.autofit=True
+    for i,c in enumerate(MAHADASHA_HEADERS): t2.rows[0].cells[i].text=c
+    _add_table_rows(t2, md_rows)
+    center_header_row(t2); set_table_font(t2, pt=BASE_FONT_PT); add_table_borders(t2, size=6)
+    apply_premium_table_style(t2)  # Apply orange headers and alternating grey rows
+    set_col_widths(t2, [1.20, 1.50, 1.00])
+
+    # Original Antardasha section
+    # h3 = left.add_paragraph("महादशा / अंतरदशा"); _apply_hindi_caption_style(h3, size_pt=11, underline=True, bold=True)
+    create_cylindrical_section_header(left, "महादशा / अंतरदशा", width_pt=260)
+    t3 = left.add_table(rows=1, cols=len(ANTARDASHA_HEADERS)); t3.autofit=True
+    for i,c in enumerate(ANTARDASHA_HEADERS): t3.rows[0].cells[i].text=c
+    _add_table_rows(t3, an_rows)
+    center_header_row(t3); set_table_font(t3, pt=BASE_FONT_PT); add_table_borders(t3, size=6)
+    apply_premium_table_style(t3)  # Apply orange headers and alternating grey rows
+    set_col_widths(t3, [1.30, 1.40, 1.00])  # Adjusted column widths for better alignment
+
+    # One-page: place Pramukh Bindu under tables (left column) to free right column for charts
+    compact_tables = [t3]
+    try:
+        pramukh = add_pramukh_bindu_section(left, ctx, lagna_sign, dt_utc)
+        if pramukh is not None:
+            compact_tables.append(pramukh)
+        add_phalit_section(left, rows=25)  # Reduced rows to prevent overlapping
+    except Exception:
+        pass
+    right = outer.rows[0].cells[1]
+    try:
+        set_cell_margins(right, left=360)
+    except Exception:
+        pass
+
+    # Ensure the OUTER right cell has zero inner margins so the kundali touches the cell borders
+    try:
+        right_tcPr = right._tc.get_or_add_tcPr()
+        right_tcMar = right_tcPr.find('./w:tcMar')
+        if right_tcMar is None:
+            right_tcMar = OxmlElement('w:tcMar')
+            right_tcPr.append(right_tcMar)
+        for side in ('top','left','bottom','right'):
+            el = OxmlElement(f'w:{side}')
+            el.set(qn('w:w'),'0')
+            el.set(qn('w:type'),'dxa')
+            right_tcMar.append(el)
+    except Exception:
+        pass
+
+    kt = right.add_table(rows=2, cols=1); kt.autofit=False; kt.columns[0].width = Inches(right_width_in)
+
+    # remove cell padding for chart table to let kundali touch the cell borders
+    try:
+        tcPr = kt._tbl.tblPr
+        tblCellMar = OxmlElement('w:tblCellMar')
+        for side in ('top','left','bottom','right'):
+            el = OxmlElement(f'w:{side}')
+            el.set(qn('w:w'),'0')
+            el.set(qn('w:type'),'dxa')
+            tblCellMar.append(el)
+        tcPr.append(tblCellMar)
+    except Exception:
+        pass
+    # Compact right-cell paragraph spacing
+    try:
+        for p in right.paragraphs:
+            p.paragraph_format.space_before = Pt(0)
+            p.paragraph_format.space_after = Pt(0)
+    except Exception:
+        pass
+    right.vertical_alignment = WD_ALIGN_VERTICAL.TOP
+    kt.autofit = False
+    kt.columns[0].width = Inches(right_width_in)
+    for row in kt.rows:
+        row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
+        row.height = Pt(ROW_HEIGHT_PT)
+    cell1 = kt.rows[0].cells[0]
+    try:
+        set_cell_margins(cell1, top=0, bottom=0)
+    except Exception:
+        pass
+    try:
+        set_cell_margins(cell1, top=0, bottom=0)
+    except Exception:
+        pass
+    # Lagna chart cylindrical header bar (centered)
+    create_cylindrical_section_header(cell1, "लग्न कुंडली", width_pt=int(CHART_W_PT), align='center', spacing_after=0, text_jc='center', run_text=False, line_exact=True)
+    hdr_p = cell1.paragraphs[-1]
+    # Lagna chart with planets in single box per house
+    rasi_house_planets = ctx.rasi_house_planets
+    hdr_p._p.addnext(kundali_with_planets(size_pt=CHART_W_PT, lagna_sign=lagna_sign, house_planets=rasi_house_planets))
+
+    # Original Navamsa chart title - Enhanced styling for visibility
+    cell2 = kt.rows[1].cells[0];                         sp_nav = cell2.add_paragraph(); sp_nav.paragraph_format.space_before = Pt(40); sp_nav.paragraph_format.space_after = Pt(0)
+    # Navamsha chart cylindrical header bar (centered)
+    create_cylindrical_section_header(cell2, "नवांश कुंडली", width_pt=int(CHART_W_PT), align='center', spacing_after=0, text_jc='center')
+    p2 = cell2.add_paragraph(); p2.paragraph_format.space_before = Pt(0); p2.paragraph_format.space_after = Pt(0)
+    nav_house_planets = ctx.navamsa_house_planets
+    p2._p.addnext(kundali_with_planets(size_pt=CHART_W_PT, lagna_sign=nav_lagna_sign, house_planets=nav_house_planets))
+    # (प्रमुख बिंदु moved to row 2 of outer table)
+    # Ensure content goes below chart shape - single spacing paragraph
+    cell2.add_paragraph("").paragraph_format.space_after = Pt(0)
+    # (Pramukh Bindu moved above charts)
+
+    out = BytesIO();
+    # Zero cell margins and paragraph spacing in one pass before saving
+    # (t3's and the प्रमुख बिंदु table's cell paragraphs are compacted as well)
+    normalize_document(doc, compact_tables=compact_tables)
+    doc.save(out); out.seek(0)
+    return out.getvalue()
+
+
+def chart_svgs(chart, size_pt=None):
+    """Inline SVG previews {'lagna': str, 'navamsa': str} with the DOCX chart markers."""
+    from kundali_svg import kundali_svg, SVG_SIZE_PT
+    size = size_pt or SVG_SIZE_PT
+    ctx = ChartContext.from_chart(chart)
+    return {'lagna': kundali_svg(chart.lagna_sign, ctx.rasi_house_planets, size),
+            'navamsa': kundali_svg(chart.nav_lagna_sign, ctx.navamsa_house_planets, size)}
+
+
+def generate_kundali(req, api_key="", resolved=None):
+    """DOCX bytes for one KundaliRequest."""
+    rp, chart = compute_kundali(req, api_key, resolved)
+    return render_kundali_docx(req.name, req.place, chart, rp.formatted)
+
+
+def warm_up():
+    """Load the DOCX template skeleton and the process-wide indexes (ingress, transit,
+    gazetteer, timezone polygons) now rather than on the first request; forked worker
+    processes inherit them."""
+    from geocoding import get_gazetteer
+    from ingress_index import get_ingress_index
+    from kundali_docx import get_skeleton
+    from transit_table import get_transit_table
+    from tz_resolver import get_tz_resolver
+    for warm in (get_skeleton, get_gazetteer, get_ingress_index, get_transit_table, get_tz_resolver):
+        try:
+            warm()
+        except Exception:
+            pass
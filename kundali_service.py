@@ -0,0 +1,219 @@
+# kundali_service.py
+# Local HTTP service for partner apps: chart JSON and DOCX over plain HTTP.
+# Usage:
+#   python kundali_service.py --port 8765 --workers 4
+#   curl -s localhost:8765/chart -d '{"name": "Asha", "place": "Jaipur, India", "dob": "1990-05-17", "tob": "06:45"}'
+#   curl -s localhost:8765/docx  -d '{...same body...}' -o Asha_Horoscope.docx
+#   curl -s localhost:8765/healthz
+#
+# Standard library only (http.server). Requests are accepted on threads and
+# the work runs in a ProcessPoolExecutor whose workers are warmed at start
+# (ephemeris, template, ingress/transit tables, gazetteer, timezone polygons)
+# and stay warm between requests. At most workers * MAX_PENDING_PER_WORKER
+# requests are admitted at once; beyond that the service answers 503 with
+# Retry-After instead of queueing without bound. A request that times out
+# keeps its slot until its worker is actually done with it.
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlparse
+
+from kundali_pipeline import (compute_kundali, chart_summary, render_kundali_docx, kundali_filename,
+                              request_from_record, warm_up)
+
+SERVICE_HOST = os.environ.get("MRIDAASTRO_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("MRIDAASTRO_SERVICE_PORT", "8765"))
+SERVICE_WORKERS = int(os.environ.get("MRIDAASTRO_SERVICE_WORKERS", str(os.cpu_count() or 1)))
+MAX_PENDING_PER_WORKER = 4
+ADMIT_WAIT_S = 0.5          # how long a request may wait for a slot before 503
+REQUEST_TIMEOUT_S = 60
+MAX_BODY_BYTES = 64 * 1024
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class BodyTooLarge(ValueError):
+    pass
+
+
+def _chart_task(rec, api_key):
+    req = request_from_record(rec)
+    rp, chart = compute_kundali(req, api_key)
+    return chart_summary(req, rp, chart)
+
+
+def _docx_task(rec, api_key):
+    req = request_from_record(rec)
+    rp, chart = compute_kundali(req, api_key)
+    return kundali_filename(req.name), render_kundali_docx(req.name, req.place, chart, rp.formatted)
+
+
+def _noop():
+    return os.getpid()
+
+
+class KundaliService:
+    """Warm worker pool plus an admission semaphore (the backpressure limit)."""
+
+    def __init__(self, workers=SERVICE_WORKERS, api_key=""):
+        self.workers = workers
+        self.api_key = api_key
+        self.max_pending = workers * MAX_PENDING_PER_WORKER
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self.inflight = self.served = self.rejected = self.failed = 0
+        warm_up()  # forked workers inherit the loaded indexes
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_up)
+        # Start every worker now so the first requests don't pay for process start-up
+        for f in [self.pool.submit(_noop) for _ in range(workers)]:
+            f.result()
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def run(self, task, rec):
+        """Result of task(rec) from the pool, or None if the service is saturated."""
+        if not self._slots.acquire(timeout=ADMIT_WAIT_S):
+            self._count('rejected')
+            return None
+        self._count('inflight')
+        try:
+            fut = self.pool.submit(task, rec, self.api_key)
+        except BaseException:
+            self._release()
+            raise
+        # The slot stays taken until the worker is done, even if this request gives up first
+        fut.add_done_callback(self._release)
+        try:
+            return fut.result(timeout=REQUEST_TIMEOUT_S)
+        except FutureTimeout:
+            fut.cancel()   # frees the slot now if it never started
+            raise
+
+    def _release(self, _fut=None):
+        self._count('inflight', -1)
+        self._slots.release()
+
+    def stats(self):
+        return {'status': 'ok', 'workers': self.workers, 'max_pending': self.max_pending,
+                'inflight': self.inflight, 'served': self.served, 'rejected': self.rejected,
+                'failed': self.failed}
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def content_disposition(filename):
+    """Attachment header for any filename: an ASCII fallback plus the RFC 5987 UTF-8 form
+    (send_header encodes latin-1, and names are usually Devanagari)."""
+    ascii_name = filename.encode("ascii", "ignore").decode("ascii").replace('"', "").replace("\\", "")
+    ascii_name = ascii_name.lstrip("_ ") or "Horoscope.docx"   # 'आशा_Horoscope.docx' -> 'Horoscope.docx'
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        if not isinstance(body, (bytes, bytearray)):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_record(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True   # the unread body would be parsed as the next request
+            raise BodyTooLarge(f"request body over {MAX_BODY_BYTES} bytes")
+        rec = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(rec, dict):
+            raise ValueError("body must be a JSON object")
+        return {str(k).lower(): v for k, v in rec.items()}
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/healthz":
+            return self._send(200, self.service.stats())
+        self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        task = {'/chart': _chart_task, '/docx': _docx_task}.get(path)
+        if task is None:
+            return self._send(404, {'error': 'not found'})
+        t0 = time.perf_counter()
+        try:
+            rec = self._read_record()
+            result = self.service.run(task, rec)
+        except BodyTooLarge as e:
+            return self._send(413, {'error': str(e)}, headers={'Connection': 'close'})
+        except (ValueError, json.JSONDecodeError) as e:
+            return self._send(400, {'error': str(e)})
+        except BrokenExecutor as e:  # a worker died; a RuntimeError, but not the caller's fault
+            self.service._count('failed')
+            return self._send(500, {'error': f"worker pool unavailable: {e}"})
+        except RuntimeError as e:  # geocoding: place not found / key missing
+            return self._send(422, {'error': str(e)})
+        except FutureTimeout:
+            self.service._count('failed')
+            return self._send(504, {'error': 'generation timed out'})
+        except Exception as e:
+            self.service._count('failed')
+            return self._send(500, {'error': f"{type(e).__name__}: {e}"})
+        if result is None:
+            return self._send(503, {'error': 'busy, retry shortly'}, headers={'Retry-After': '1'})
+        timing = {'X-Compute-Ms': f"{(time.perf_counter() - t0) * 1000:.1f}"}
+        if task is _chart_task:
+            self._send(200, result, headers=timing)
+        else:
+            filename, data = result
+            timing['Content-Disposition'] = content_disposition(filename)
+            self._send(200, data, DOCX_MIME, headers=timing)
+        self.service._count('served')
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write(f"{self.address_string()} {fmt % args}\n")
+
+
+def make_server(host=SERVICE_HOST, port=SERVICE_PORT, workers=SERVICE_WORKERS, api_key=""):
+    service = KundaliService(workers, api_key)
+    handler = type("KundaliHandler", (_Handler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, service
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve kundali chart JSON and DOCX over HTTP.")
+    ap.add_argument("--host", default=SERVICE_HOST)
+    ap.add_argument("--port", type=int, default=SERVICE_PORT)
+    ap.add_argument("--workers", type=int, default=SERVICE_WORKERS)
+    ap.add_argument("--api-key", default=os.environ.get("GEOAPIFY_API_KEY", ""),
+                    help="Geoapify key for places missing from the offline gazetteer")
+    args = ap.parse_args(argv)
+    server, service = make_server(args.host, args.port, args.workers, args.api_key)
+    print(f"kundali service on http://{args.host}:{server.server_port} "
+          f"({service.workers} workers, {service.max_pending} max in flight)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# kundali_svg.py
+# Inline SVG preview of the North-Indian kundali, drawn from the same
+# house_planets maps as the DOCX charts.
+# Usage:
+#   from kundali_svg import kundali_svg
+#   hp = build_rasi_house_planets_marked(chart.sidelons, chart.lagna_sign)
+#   svg = kundali_svg(chart.lagna_sign, hp)            # '<svg ...>...</svg>'
+#   st.markdown(svg, unsafe_allow_html=True)
+#
+# Layout (house-number boxes, planet slots) comes from kundali_docx's
+# chart_geometry, so the preview matches the document box for box. The
+# same markers are used: ↑/↓ exalted/debilitated and ^ combust (part of
+# the label), an ellipse for own sign and a small square badge for
+# vargottama. No matplotlib. The frame and house numbers are cached per
+# (size, lagna) and whole charts per (size, lagna, planets).
+
+from __future__ import annotations
+import functools
+from html import escape
+
+from kundali_docx import (chart_geometry, rotated_house_labels, NUM_W_PT, NUM_H_PT)
+
+SVG_SIZE_PT = 256
+SVG_FONT = "Mangal, 'Noto Sans Devanagari', sans-serif"
+FRAME_COLOR = "#CC6600"
+FRAME_FILL = "#ffdcc8"
+
+
+@functools.lru_cache(maxsize=64)
+def _svg_layer(S, lagna_sign):
+    """Frame, diagonals and house numbers for one size and lagna."""
+    geo = chart_geometry(S)
+    labels = rotated_house_labels(lagna_sign)
+    M = S / 2
+    parts = [
+        f'<rect x="0" y="0" width="{S}" height="{S}" fill="{FRAME_FILL}" stroke="{FRAME_COLOR}" stroke-width="3"/>',
+        f'<path d="M0,0L{S},{S}M{S},0L0,{S}M{M},0L{S},{M}L{M},{S}L0,{M}Z" fill="none" '
+        f'stroke="{FRAME_COLOR}" stroke-width="1.25"/>',
+    ]
+    for k, (left, top) in geo.number_boxes.items():
+        parts.append(f'<rect x="{left:.2f}" y="{top:.2f}" width="{NUM_W_PT}" height="{NUM_H_PT}" fill="#ffffff"/>'
+                     f'<text x="{left + NUM_W_PT / 2:.2f}" y="{top + NUM_H_PT / 2:.2f}">{labels[str(k)]}</text>')
+    return "".join(parts)
+
+
+def _freeze(house_planets):
+    """Hashable form of a house_planets map: ((house, ((label, self, vargottama), ...)), ...)."""
+    frozen = []
+    for house in range(1, 13):
+        items = []
+        for pl in house_planets.get(house, ()):
+            if isinstance(pl, dict):
+                fl = pl.get('flags', {}) or {}
+                items.append((str(pl.get('txt', '')).strip() or '?', bool(fl.get('self')), bool(fl.get('vargottama'))))
+            else:
+                items.append((str(pl).strip() or '?', False, False))
+        frozen.append((house, tuple(items)))
+    return tuple(frozen)
+
+
+@functools.lru_cache(maxsize=256)
+def _svg(S, lagna_sign, frozen):
+    geo = chart_geometry(S)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {S} {S}" width="{S}" height="{S}" '
+             f'font-family="{SVG_FONT}" font-size="9" text-anchor="middle" dominant-baseline="central">',
+             _svg_layer(S, lagna_sign)]
+    for house, items in frozen:
+        if not items:
+            continue
+        for (label, selfr, varg), (left, top, w, h) in zip(items, geo.slots(house, len(items))):
+            parts.append(f'<text x="{left + w / 2:.2f}" y="{top + h / 2:.2f}">{escape(label)}</text>')
+            if selfr:
+                parts.append(f'<ellipse cx="{left + w / 2:.2f}" cy="{top + h / 2:.2f}" rx="{(w - 4) / 2:.2f}" '
+                             f'ry="{(h - 2) / 2:.2f}" fill="none" stroke="black" stroke-width="0.75"/>')
+            if varg:
+                parts.append(f'<rect x="{left + w - 4.5:.2f}" y="{top - 2:.2f}" width="5" height="5" '
+                             f'fill="#ffffff" stroke="black" stroke-width="0.75"/>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def kundali_svg(lagna_sign, house_planets, size_pt=SVG_SIZE_PT):
+    """Inline SVG of a chart from a house -> planets map (as built for the DOCX charts)."""
+    return _svg(size_pt, lagna_sign, _freeze(house_planets))
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+from kp_table import KP_LORDS, SUB_STARTS, kp_lords, kp_lords_batch, kp_sub_index
+
+ORDER = ['Ke', 'Ve', 'Su', 'Mo', 'Ma', 'Ra', 'Ju', 'Sa', 'Me']
+YEARS = {'Ke': 7, 'Ve': 20, 'Su': 6, 'Mo': 10, 'Ma': 7, 'Ra': 18, 'Ju': 16, 'Sa': 19, 'Me': 17}
+
+
+def loop_sublord(lon_sid):
+    """The per-call loop kp_table replaced."""
+    nak = 360.0 / 27.0
+    part = lon_sid % 360.0
+    ni = int(part // nak)
+    pos = part - ni * nak
+    lord = ORDER[ni % 9]
+    start = ORDER.index(lord)
+    seq = [ORDER[(start + i) % 9] for i in range(9)]
+    acc = 0.0
+    for sub in seq:
+        seg = nak * (YEARS[sub] / 120.0)
+        if pos <= acc + seg + 1e-9:
+            return lord, sub
+        acc += seg
+    return lord, seq[-1]
+
+
+def _near_boundary(lon, eps=1e-6):
+    i = np.searchsorted(SUB_STARTS, lon)
+    neighbours = SUB_STARTS[max(i - 1, 0):i + 1]
+    return np.min(np.abs(neighbours - lon)) < eps or 360.0 - lon < eps
+
+
+def test_249_subs():
+    assert len(SUB_STARTS) == 249
+    assert SUB_STARTS[0] == 0.0
+    assert np.all(np.diff(SUB_STARTS) > 0)
+
+
+def test_matches_loop_away_from_boundaries():
+    rng = random.Random(7)
+    lons = [rng.uniform(0, 360) for _ in range(20000)]
+    # Midpoints of every sub, so each one is exercised at least once
+    lons += list((SUB_STARTS + np.append(SUB_STARTS[1:], 360.0)) / 2)
+    checked = 0
+    for lon in lons:
+        if _near_boundary(lon):
+            continue
+        assert kp_lords(lon, 2) == loop_sublord(lon), lon
+        checked += 1
+    assert checked > 20000
+
+
+def test_boundary_belongs_to_the_sub_that_starts_there():
+    # 120.0 is where Magha (Ketu's star) starts; the loop's `<=` gave it to the previous sub
+    assert loop_sublord(120.0) == ('Me', 'Sa')
+    assert kp_lords(120.0, 2) == ('Ke', 'Ke')
+    assert kp_sub_index(120.0) == int(np.searchsorted(SUB_STARTS, 120.0))
+
+
+@pytest.mark.parametrize("depth", [2, 3])
+def test_batch_matches_scalar(depth):
+    rng = np.random.default_rng(3)
+    lons = np.concatenate([rng.uniform(-720, 720, (500, 9)).ravel(), SUB_STARTS, [0.0, 359.999999999]])
+    out = kp_lords_batch(lons, depth)
+    for j, lon in enumerate(lons):
+        want = kp_lords(lon, depth)
+        got = (KP_LORDS[out['star'][j]], KP_LORDS[out['sub'][j]])
+        if depth >= 3:
+            got += (KP_LORDS[out['subsub'][j]],)
+        assert got == want, lon
+        assert out['sub_no'][j] == kp_sub_index(lon) + 1
@@ -0,0 +1,49 @@
+import re
+
+from kundali_chart import fmt_planet_label
+from kundali_svg import _svg, kundali_svg
+
+BADGE = 'width="5" height="5"'
+
+
+def _planet(code, **flags):
+    return {'txt': fmt_planet_label(code, flags), 'flags': flags}
+
+
+def _texts(svg):
+    return re.findall(r'<text [^>]*>([^<]*)</text>', svg)
+
+
+def test_label_markers():
+    hp = {1: [_planet('Su', exalted=True)], 4: [_planet('Sa', debilitated=True)],
+          7: [_planet('Me', combust=True), _planet('Ve')]}
+    texts = _texts(kundali_svg(1, hp))
+    assert any(t.endswith('↑') for t in texts)
+    assert any(t.endswith('↓') for t in texts)
+    assert any(t.endswith('^') for t in texts)
+
+
+def test_own_sign_ellipse_and_vargottama_badge():
+    plain = kundali_svg(1, {2: [_planet('Ma')]})
+    assert '<ellipse' not in plain
+    assert BADGE not in plain
+
+    svg = kundali_svg(1, {2: [_planet('Ma', self=True)], 3: [_planet('Ju', vargottama=True)],
+                          5: [_planet('Mo', self=True, vargottama=True)]})
+    assert svg.count('<ellipse') == 2
+    assert svg.count(BADGE) == 2
+
+
+def test_plain_string_planets():
+    svg = kundali_svg(3, {1: ['सू', 'चं'], 12: ['रा']})
+    assert {'सू', 'चं', 'रा'} <= set(_texts(svg))
+
+
+def test_repeat_call_is_a_cache_hit():
+    _svg.cache_clear()
+    first = kundali_svg(5, {1: [_planet('Su', self=True)], 9: ['के']})
+    # An equal map built afresh freezes to the same key
+    again = kundali_svg(5, {1: [_planet('Su', self=True)], 9: ['के']})
+    info = _svg.cache_info()
+    assert again is first
+    assert (info.hits, info.misses) == (1, 1)
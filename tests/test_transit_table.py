@@ -0,0 +1,40 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from ephemeris import PLANET_CODES
+from transit_table import TransitTable
+
+START = datetime.date(2024, 1, 1)
+
+
+def _table(rows):
+    lon = np.array([[r] * len(PLANET_CODES) for r in rows], dtype=float)
+    return TransitTable(START, lon)
+
+
+def test_midnight_is_the_row():
+    tbl = _table([10.0, 20.0])
+    assert tbl.positions(datetime.datetime(2024, 1, 1))['Sa'] == 10.0
+    assert tbl.positions(datetime.date(2024, 1, 2))['Sa'] == 20.0
+
+
+def test_interpolates_within_the_day():
+    tbl = _table([10.0, 20.0])
+    assert tbl.positions(datetime.datetime(2024, 1, 1, 6))['Sa'] == pytest.approx(12.5)
+
+
+@pytest.mark.parametrize("a,b,want", [(359.0, 1.0, 0.0), (1.0, 359.0, 0.0), (358.0, 2.0, 359.0)])
+def test_interpolates_across_the_wrap(a, b, want):
+    tbl = _table([a, b])
+    hour = 12 if want == 0.0 else 6
+    got = tbl.positions(datetime.datetime(2024, 1, 1, hour))['Mo']
+    assert (got - want + 180.0) % 360.0 - 180.0 == pytest.approx(0.0)
+    assert 0.0 <= got < 360.0
+
+
+def test_outside_the_window():
+    tbl = _table([10.0, 20.0])
+    assert tbl.positions(datetime.datetime(2023, 12, 31, 23)) is None
+    assert tbl.positions(datetime.datetime(2024, 1, 2, 1)) is None   # no row after the last one
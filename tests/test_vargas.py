@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from vargas import SHODASHVARGA, navamsa_sign, shodashvarga, varga_sign, varga_signs
+
+
+def old_navamsa(lon_sid):
+    """The navamsa helper vargas.py replaced."""
+    sign = int(lon_sid // 30) + 1
+    pada = int((lon_sid % 30.0) // (30.0 / 9.0))
+    if sign in (1, 4, 7, 10):
+        start = sign
+    elif sign in (2, 5, 8, 11):
+        start = ((sign + 8 - 1) % 12) + 1
+    else:
+        start = ((sign + 4 - 1) % 12) + 1
+    return ((start - 1 + pada) % 12) + 1
+
+
+# (division, sidereal longitude, expected sign 1..12), one or more per shodashvarga chart
+CASES = [
+    (1, 45.0, 2),
+    (2, 10.0, 5), (2, 20.0, 4), (2, 35.0, 4), (2, 50.0, 5),
+    (3, 25.0, 9), (3, 45.0, 6),
+    (4, 8.0, 4), (4, 59.0, 11),
+    (7, 30.5, 8), (7, 29.0, 7),
+    (9, 0.5, 1), (9, 30.5, 10), (9, 60.5, 7),
+    (10, 30.5, 10), (10, 34.0, 11),
+    (12, 65.0, 5),
+    (16, 31.0, 5), (16, 89.9, 12),
+    (20, 30.5, 9), (20, 60.5, 5),
+    (24, 0.5, 5), (24, 30.5, 4),
+    (27, 0.5, 1), (27, 30.5, 4), (27, 60.5, 7), (27, 90.5, 10),
+    # D30, odd sign: Aries, Aquarius, Sagittarius, Gemini, Libra over 5/5/8/7/5 degrees
+    (30, 3.0, 1), (30, 5.0, 11), (30, 7.0, 11), (30, 12.0, 9), (30, 20.0, 3), (30, 27.0, 7),
+    # even sign: Taurus, Virgo, Pisces, Capricorn, Scorpio over 5/7/8/5/5 degrees
+    (30, 33.0, 2), (30, 38.0, 6), (30, 45.0, 12), (30, 52.0, 10), (30, 58.0, 8),
+    (40, 0.5, 1), (40, 30.5, 7),
+    (45, 60.5, 9),
+    # D60: half-degree parts counted on from the sign itself
+    (60, 0.25, 1), (60, 0.75, 2), (60, 29.9, 12), (60, 36.1, 2), (60, 359.9, 11),
+]
+
+
+def test_every_shodashvarga_division_has_a_case():
+    assert {d for d, _, _ in CASES} == set(SHODASHVARGA)
+
+
+@pytest.mark.parametrize("d,lon,want", CASES)
+def test_table(d, lon, want):
+    assert varga_sign(lon, d) == want
+    assert varga_signs(np.array([lon]), d)[0] == want
+
+
+def test_d9_matches_old_navamsa():
+    lons = np.concatenate([np.linspace(0, 360, 10001)[:-1] + 1e-7, np.arange(108) * (30.0 / 9.0) + 1e-9])
+    for lon in lons:
+        assert navamsa_sign(lon) == old_navamsa(lon), lon
+    assert (varga_signs(lons, 9) == [old_navamsa(x) for x in lons]).all()
+
+
+@pytest.mark.parametrize("lon", [-1e-15, -1e-12, 360.0, 720.0, -360.0])
+def test_wraps_near_zero(lon):
+    for d in SHODASHVARGA:
+        assert varga_sign(lon, d) == varga_signs(np.array([lon]), d)[0]
+
+
+def test_batch_matches_scalar():
+    lons = np.random.default_rng(5).uniform(-360, 720, (300, 9))
+    sv = shodashvarga(lons)
+    for d in SHODASHVARGA:
+        want = np.array([[varga_sign(x, d) for x in row] for row in lons])
+        assert (varga_signs(lons, d) == want).all()
+        assert (sv[d] == want).all()
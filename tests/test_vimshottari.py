@@ -0,0 +1,77 @@
+import datetime
+import random
+
+import pytest
+
+from vimshottari import ORDER, YEARS, YEAR_DAYS, DashaTree, moon_balance_days
+
+TOL = datetime.timedelta(milliseconds=1)
+
+
+def flat_mahadashas(birth_utc_dt, moon_sid, years=100):
+    """The flat mahadasha builder DashaTree replaced."""
+    md_lord, rem_days = moon_balance_days(moon_sid)
+    end_limit = birth_utc_dt + datetime.timedelta(days=years * YEAR_DAYS)
+    birth_md_end = min(birth_utc_dt + datetime.timedelta(days=rem_days), end_limit)
+    segments = [(md_lord, birth_utc_dt, birth_md_end)]
+    idx = (ORDER.index(md_lord) + 1) % 9
+    t = birth_md_end
+    while t < end_limit:
+        lord = ORDER[idx]
+        end = min(t + datetime.timedelta(days=YEARS[lord] * YEAR_DAYS), end_limit)
+        segments.append((lord, t, end))
+        t = end
+        idx = (idx + 1) % 9
+    return segments
+
+
+def _births(n, seed=1):
+    rng = random.Random(seed)
+    base = datetime.datetime(1900, 1, 1)
+    for _ in range(n):
+        yield base + datetime.timedelta(seconds=rng.uniform(0, 150 * 365.25 * 86400)), rng.uniform(0, 360)
+
+
+@pytest.mark.parametrize("birth,moon", list(_births(200)))
+def test_mahadashas_match_flat_builder(birth, moon):
+    old = flat_mahadashas(birth, moon)
+    new = DashaTree(birth, moon, years=100).mahadashas
+    assert [p.lord for p in new] == [lord for lord, _, _ in old]
+    for p, (_, start, end) in zip(new, old):
+        assert abs(p.start - start) <= TOL
+        assert abs(p.end - end) <= TOL
+
+
+def _assert_tiles(parent, kids):
+    assert kids
+    assert kids[0].start_d == pytest.approx(parent.start_d, abs=1e-9)
+    assert kids[-1].end_d == pytest.approx(parent.end_d, abs=1e-9)
+    for a, b in zip(kids, kids[1:]):
+        assert b.start_d == pytest.approx(a.end_d, abs=1e-9)
+    for k in kids:
+        assert k.lords[:-1] == parent.lords
+        assert k.start_d < k.end_d
+
+
+@pytest.mark.parametrize("birth,moon", list(_births(20, seed=2)))
+def test_path_at_depth_5_children_tile_parent(birth, moon):
+    tree = DashaTree(birth, moon)
+    rng = random.Random(moon)
+    for _ in range(25):
+        dt = birth + datetime.timedelta(days=rng.uniform(0, tree.limit_d))
+        path = tree.path_at(dt, depth=5)
+        assert [p.level for p in path] == [1, 2, 3, 4, 5]
+        for parent, child in zip(path, path[1:]):
+            _assert_tiles(parent, parent.children())
+            assert child in parent.children()
+        for p in path:
+            assert p.start <= dt < p.end
+
+
+def test_upcoming_past_tree_end_is_empty():
+    birth = datetime.datetime(1990, 5, 17, 4, 30)
+    tree = DashaTree(birth, 123.4, years=100)
+    past = tree.to_datetime(tree.limit_d) + datetime.timedelta(days=1)
+    assert tree.path_at(past, depth=3) == []
+    assert tree.upcoming(past, level=2) == []
+    assert tree.upcoming(tree.to_datetime(tree.limit_d), level=1) == []
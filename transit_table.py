@@ -0,0 +1,118 @@
+# transit_table.py
+# Process-wide table of daily sidereal transit longitudes for all nine grahas.
+# Usage:
+#   from transit_table import transit_positions
+#   trans = transit_positions(now_utc)   # {'Su': .., ..., 'Ke': ..} at now_utc, or None outside the window
+#
+# Transits are the same for every user on a given day, so the table is built
+# once (first use, or get_transit_table() at startup), saved as a .npy file in
+# the cache dir and memory-mapped on later restarts. Positions between the
+# daily rows are interpolated linearly (across the 360° wrap): within a few
+# arc-seconds for the slow planets, a few arc-minutes for Mercury and the Moon.
+# Window: Jan 1 of (this year - TRANSIT_YEARS_BACK) .. Dec 31 of (this year + TRANSIT_YEARS_AHEAD).
+
+from __future__ import annotations
+import datetime
+import os
+import threading
+
+import numpy as np
+
+from ephemeris import CACHE_DIR, PLANET_CODES, AYANAMSHA_VAL, sidereal_positions_batch
+
+TRANSIT_YEARS_BACK = int(os.environ.get("MRIDAASTRO_TRANSIT_YEARS_BACK", "1"))
+TRANSIT_YEARS_AHEAD = int(os.environ.get("MRIDAASTRO_TRANSIT_YEARS_AHEAD", "10"))
+
+
+class TransitTable:
+    """Sidereal longitudes at 00:00 UTC for each day from `start` (row 0)."""
+
+    def __init__(self, start, lon):
+        self.start = start          # datetime.date of row 0
+        self.lon = lon              # (days, 9) array, columns in PLANET_CODES order
+        self.days = lon.shape[0]
+
+    def row_index(self, dt_utc):
+        d = dt_utc.date() if isinstance(dt_utc, datetime.datetime) else dt_utc
+        i = (d - self.start).days
+        return i if 0 <= i < self.days else None
+
+    def positions(self, dt_utc):
+        """Longitudes at dt_utc, interpolated between the day's row and the next (None outside)."""
+        i = self.row_index(dt_utc)
+        if i is None:
+            return None
+        lon = np.asarray(self.lon[i], dtype=float)
+        if isinstance(dt_utc, datetime.datetime):
+            frac = (dt_utc - datetime.datetime.combine(dt_utc.date(), datetime.time())) / datetime.timedelta(days=1)
+            if frac > 0:
+                if i + 1 >= self.days:
+                    return None   # past the last row's midnight: nothing to interpolate towards
+                step = (self.lon[i + 1] - lon + 180.0) % 360.0 - 180.0   # shortest way, nodes move backwards
+                lon = (lon + frac * step) % 360.0
+        return {c: float(v) for c, v in zip(PLANET_CODES, lon)}
+
+    def column(self, code):
+        return self.lon[:, PLANET_CODES.index(code)]
+
+
+def _window(today=None):
+    today = today or datetime.datetime.utcnow().date()
+    start = datetime.date(today.year - TRANSIT_YEARS_BACK, 1, 1)
+    end = datetime.date(today.year + TRANSIT_YEARS_AHEAD, 12, 31)
+    return start, (end - start).days + 1
+
+
+def _table_path(start, days):
+    return os.path.join(CACHE_DIR, f"transit_{start.isoformat()}_{days}d_sid{AYANAMSHA_VAL}.npy")
+
+
+def build_transit_table(start, days):
+    base = datetime.datetime(start.year, start.month, start.day)
+    dts = np.datetime64(base, 'us') + np.arange(days, dtype='timedelta64[D]')
+    return sidereal_positions_batch(dts).lon
+
+
+def load_or_build(start, days):
+    """Memory-map the table from disk, building and persisting it if missing."""
+    path = _table_path(start, days)
+    if os.path.exists(path):
+        try:
+            lon = np.load(path, mmap_mode='r')
+            if lon.shape == (days, len(PLANET_CODES)):
+                return TransitTable(start, lon)
+        except Exception:
+            pass  # corrupt/partial file: rebuild below
+    lon = build_transit_table(start, days)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, lon)
+        os.replace(tmp, path)
+        lon = np.load(path, mmap_mode='r')
+    except Exception:
+        pass  # read-only disk: keep the in-memory copy
+    return TransitTable(start, lon)
+
+
+_TABLE = None
+_LOCK = threading.Lock()
+
+
+def get_transit_table():
+    """Shared table for the current window (rebuilt when the year rolls over)."""
+    global _TABLE
+    start, days = _window()
+    tbl = _TABLE
+    if tbl is not None and tbl.start == start and tbl.days == days:
+        return tbl
+    with _LOCK:
+        if _TABLE is None or _TABLE.start != start or _TABLE.days != days:
+            _TABLE = load_or_build(start, days)
+        return _TABLE
+
+
+def transit_positions(dt_utc):
+    """Transit longitudes at dt_utc (naive UTC) from the daily table, or None outside the window."""
+    return get_transit_table().positions(dt_utc)
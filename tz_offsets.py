@@ -0,0 +1,179 @@
+# tz_offsets.py
+# Compiled historical UTC-offset index per IANA zone (1800–2100).
+# Usage:
+#   from tz_offsets import local_to_utc, utc_offset_hours, local_to_utc_batch
+#   dt_utc, offset_h = local_to_utc("Asia/Kolkata", datetime.datetime(1943, 2, 1, 6, 30))
+#   utc64, offsets_s = local_to_utc_batch("Europe/London", local_datetime64_array)
+#
+# Each zone is compiled once from the tz database (pytz transition tables, with
+# zoneinfo extending DST rules past pytz's 2037 horizon) into two sorted arrays:
+# UTC transition instants (epoch seconds) and the offset in force from each
+# instant. Lookups are a bisect (or numpy.searchsorted for arrays), so LMT-era,
+# war-time and DST offsets come out right for any birth time. Compiled zones
+# are kept in memory and saved to the cache dir.
+
+from __future__ import annotations
+import bisect
+import datetime
+import os
+import threading
+
+import numpy as np
+import pytz
+
+from ephemeris import CACHE_DIR
+
+TZ_INDEX_DIR = os.path.join(CACHE_DIR, "tz_offsets")
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_BEGIN = np.iinfo(np.int64).min // 2  # "since forever" for the first offset
+_EXTEND_UNTIL = datetime.datetime(2101, 1, 1)
+# A local time is resolved against the offsets in force this far either side of it
+_SEARCH_WINDOW_S = 18 * 3600
+
+
+def _epoch_s(dt):
+    return int((dt - _EPOCH).total_seconds())
+
+
+class ZoneOffsets:
+    """Sorted UTC transition instants and the UTC offset (seconds) in force from each."""
+
+    def __init__(self, name, utc_s, offset_s):
+        self.name = name
+        self.utc_s = utc_s          # int64, ascending, utc_s[0] == _BEGIN
+        self.offset_s = offset_s    # int32
+        self._utc_list = utc_s.tolist()
+
+    def offset_at_utc_s(self, t):
+        return int(self.offset_s[bisect.bisect_right(self._utc_list, t) - 1])
+
+    def resolve_local_s(self, t_local):
+        """UTC offset for a local wall time (epoch-style seconds).
+
+        Ambiguous times (clocks set back) take the later offset, times in a gap
+        (clocks set forward) take the earlier one — the same choice as pytz's
+        localize(is_dst=False).
+        """
+        o_early = self.offset_at_utc_s(t_local - _SEARCH_WINDOW_S)
+        o_late = self.offset_at_utc_s(t_local + _SEARCH_WINDOW_S)
+        if self.offset_at_utc_s(t_local - o_late) == o_late:
+            return o_late
+        if self.offset_at_utc_s(t_local - o_early) == o_early:
+            return o_early
+        return o_early  # inside a gap
+
+    def resolve_local_array(self, t_local):
+        """Vectorised resolve_local_s over an int64 array of local epoch seconds."""
+        idx = lambda t: np.searchsorted(self.utc_s, t, side='right') - 1
+        o_early = self.offset_s[idx(t_local - _SEARCH_WINDOW_S)].astype(np.int64)
+        o_late = self.offset_s[idx(t_local + _SEARCH_WINDOW_S)].astype(np.int64)
+        late_ok = self.offset_s[idx(t_local - o_late)] == o_late
+        return np.where(late_ok, o_late, o_early)
+
+
+def _pytz_transitions(tz):
+    if not hasattr(tz, '_utc_transition_times'):
+        off = tz.utcoffset(_EPOCH) or datetime.timedelta(0)
+        return [_BEGIN], [int(off.total_seconds())]
+    utc_s = [_BEGIN] + [_epoch_s(t) for t in tz._utc_transition_times[1:]]
+    offs = [int(info[0].total_seconds()) for info in tz._transition_info]
+    return utc_s, offs
+
+
+def _zoneinfo_extension(name, after_s, last_offset):
+    """Transitions after pytz's last one, probed daily from zoneinfo and bisected to the second."""
+    try:
+        import zoneinfo
+        zi = zoneinfo.ZoneInfo(name)
+    except Exception:
+        return [], []
+    def off(t):
+        return int(datetime.datetime.fromtimestamp(t, datetime.timezone.utc).astimezone(zi)
+                   .utcoffset().total_seconds())
+    utc_s, offs = [], []
+    prev_t, prev_o = after_s, last_offset
+    t_end = _epoch_s(_EXTEND_UNTIL)
+    t = after_s + 86400
+    while t <= t_end:
+        o = off(t)
+        if o != prev_o:
+            lo, hi = prev_t, t
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if off(mid) == prev_o: lo = mid
+                else: hi = mid
+            utc_s.append(hi); offs.append(o)
+            prev_o = o
+        prev_t = t
+        t += 86400
+    return utc_s, offs
+
+
+def compile_zone(name):
+    tz = pytz.timezone(name)
+    utc_s, offs = _pytz_transitions(tz)
+    # pytz stops listing DST transitions in 2037; zones still switching then need extending
+    if len(utc_s) > 2 and (_EPOCH + datetime.timedelta(seconds=utc_s[-1])).year >= 2037:
+        ext_s, ext_o = _zoneinfo_extension(name, utc_s[-1], offs[-1])
+        utc_s += ext_s; offs += ext_o
+    return ZoneOffsets(name, np.asarray(utc_s, dtype=np.int64), np.asarray(offs, dtype=np.int32))
+
+
+def _zone_path(name):
+    return os.path.join(TZ_INDEX_DIR, f"{name.replace('/', '__')}_{pytz.OLSON_VERSION}.npz")
+
+
+def _load_or_compile(name):
+    path = _zone_path(name)
+    if os.path.exists(path):
+        try:
+            with np.load(path) as z:
+                return ZoneOffsets(name, z['utc_s'], z['offset_s'])
+        except Exception:
+            pass  # corrupt file: recompile below
+    zo = compile_zone(name)
+    try:
+        os.makedirs(TZ_INDEX_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, utc_s=zo.utc_s, offset_s=zo.offset_s)
+        os.replace(tmp, path)
+    except Exception:
+        pass  # read-only disk: keep the in-memory index
+    return zo
+
+
+_ZONES = {}
+_LOCK = threading.Lock()
+
+
+def get_zone(name):
+    """Compiled index for an IANA zone (raises pytz.UnknownTimeZoneError if unknown)."""
+    zo = _ZONES.get(name)
+    if zo is None:
+        with _LOCK:
+            zo = _ZONES.get(name)
+            if zo is None:
+                zo = _ZONES[name] = _load_or_compile(name)
+    return zo
+
+
+def local_to_utc(name, dt_local):
+    """(naive UTC datetime, offset hours) for a naive local wall time in zone `name`."""
+    t_local = _epoch_s(dt_local.replace(tzinfo=None, microsecond=0))
+    off = get_zone(name).resolve_local_s(t_local)
+    dt_utc = dt_local.replace(tzinfo=None) - datetime.timedelta(seconds=off)
+    return dt_utc, off / 3600.0
+
+
+def utc_offset_hours(name, dt_utc=None):
+    """UTC offset (hours) in force in zone `name` at a naive UTC datetime (default: now)."""
+    dt_utc = dt_utc or datetime.datetime.utcnow()
+    return get_zone(name).offset_at_utc_s(_epoch_s(dt_utc)) / 3600.0
+
+
+def local_to_utc_batch(name, local_dt64):
+    """Vectorised local -> UTC for a datetime64 array; returns (UTC datetime64[s], offsets in seconds)."""
+    t_local = np.asarray(local_dt64, dtype='datetime64[s]').astype(np.int64)
+    off = get_zone(name).resolve_local_array(t_local)
+    return (t_local - off).astype('datetime64[s]'), off
@@ -0,0 +1,75 @@
+# tz_resolver.py
+# Process-wide latitude/longitude -> IANA timezone resolver.
+# Usage:
+#   from tz_resolver import timezone_at, get_tz_resolver
+#   tzname = timezone_at(lat, lon)
+#   names = get_tz_resolver().timezone_at_batch(lats, lons)
+#
+# One TimezoneFinder is loaded (in_memory=True) and kept warm for the whole
+# process instead of re-reading its polygon data on every call. Results are
+# memoized in an LRU keyed on the coordinates snapped to TZ_GRID_DEG, so repeat
+# birthplaces resolve in microseconds.
+
+from __future__ import annotations
+import functools
+import os
+import threading
+
+import numpy as np
+
+TZ_GRID_DEG = float(os.environ.get("MRIDAASTRO_TZ_GRID_DEG", "0.001"))  # ~110 m
+TZ_CACHE_SIZE = int(os.environ.get("MRIDAASTRO_TZ_CACHE_SIZE", "8192"))
+DEFAULT_TZ = "Etc/UTC"
+
+
+class TimezoneResolver:
+    """Warm TimezoneFinder with a grid-snapped LRU and a batch lookup."""
+
+    def __init__(self, grid_deg=TZ_GRID_DEG, cache_size=TZ_CACHE_SIZE):
+        from timezonefinder import TimezoneFinder
+        self.grid_deg = grid_deg
+        self._tf = TimezoneFinder(in_memory=True)
+        self._tf_lock = threading.Lock()
+        self._cell_tz = functools.lru_cache(maxsize=cache_size)(self._lookup_cell)
+
+    def _cell(self, lat, lon):
+        g = self.grid_deg
+        return int(round(lat / g)), int(round(lon / g))
+
+    def _lookup_cell(self, ilat, ilon):
+        g = self.grid_deg
+        with self._tf_lock:
+            return self._tf.timezone_at(lat=ilat * g, lng=ilon * g)
+
+    def timezone_at(self, lat, lon, default=None):
+        """IANA name for a coordinate (None/default over open ocean)."""
+        return self._cell_tz(*self._cell(float(lat), float(lon))) or default
+
+    def timezone_at_batch(self, lats, lons, default=DEFAULT_TZ):
+        """IANA names for arrays of coordinates; each distinct grid cell is resolved once."""
+        g = self.grid_deg
+        cells = np.stack([np.rint(np.asarray(lats, dtype=np.float64) / g),
+                          np.rint(np.asarray(lons, dtype=np.float64) / g)], axis=-1).astype(np.int64)
+        uniq, inverse = np.unique(cells.reshape(-1, 2), axis=0, return_inverse=True)
+        names = [self._cell_tz(int(a), int(b)) or default for a, b in uniq]
+        return [names[i] for i in inverse.ravel()]
+
+    def cache_info(self):
+        return self._cell_tz.cache_info()
+
+
+_RESOLVER = None
+_LOCK = threading.Lock()
+
+
+def get_tz_resolver():
+    global _RESOLVER
+    if _RESOLVER is None:
+        with _LOCK:
+            if _RESOLVER is None:
+                _RESOLVER = TimezoneResolver()
+    return _RESOLVER
+
+
+def timezone_at(lat, lon, default=None):
+    return get_tz_resolver().timezone_at(lat, lon, default)
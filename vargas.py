@@ -0,0 +1,109 @@
+# vargas.py
+# Divisional charts (D1-D60) for whole arrays of sidereal longitudes.
+# Usage:
+#   from vargas import varga_sign, varga_signs, shodashvarga
+#   varga_sign(123.456, 9)                     # 1..12, one longitude
+#   varga_signs(lons, 10)                      # int8 array of lons' shape (e.g. charts x planets)
+#   sv = shodashvarga(lons)                    # {1: ..., 2: ..., 3: ..., ..., 60: ...}
+#
+# Every varga is a lookup table of shape (12 signs, n parts) holding the
+# resulting sign (Parashari start-sign rules, built once at import). A
+# longitude's part within its sign is floor(deg / (30/n)), so one varga for
+# any number of longitudes is a single fancy-indexing pass. D30 has unequal
+# parts and is tabulated per whole degree.
+
+from __future__ import annotations
+
+import numpy as np
+
+SHODASHVARGA = (1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60)
+
+MOVABLE, FIXED, DUAL = 0, 1, 2   # sign index % 3 (Aries = 0 is movable)
+
+
+def _by_start(n, start):
+    """Table where part p of sign s goes to start(s) + p."""
+    return [[(start(s) + p) % 12 for p in range(n)] for s in range(12)]
+
+
+def _odd(s):
+    return s % 2 == 0   # sign index 0 = Aries, an odd sign
+
+
+def _hora():
+    # Odd signs: Sun's hora (Leo) then Moon's (Cancer); even signs the reverse
+    return [[4, 3] if _odd(s) else [3, 4] for s in range(12)]
+
+
+def _trimsamsa():
+    # Odd signs: Mars 5°, Saturn 5°, Jupiter 8°, Mercury 7°, Venus 5° -> Aries, Aquarius, Sagittarius, Gemini, Libra
+    # Even signs: Venus 5°, Mercury 7°, Jupiter 8°, Saturn 5°, Mars 5° -> Taurus, Virgo, Pisces, Capricorn, Scorpio
+    odd = [(5, 0), (5, 10), (8, 8), (7, 2), (5, 6)]
+    even = [(5, 1), (7, 5), (8, 11), (5, 9), (5, 7)]
+    rows = []
+    for s in range(12):
+        row = []
+        for width, sign in (odd if _odd(s) else even):
+            row += [sign] * width
+        rows.append(row)
+    return rows
+
+
+_RULES = {
+    1: lambda: _by_start(1, lambda s: s),
+    2: _hora,
+    3: lambda: [[(s + 4 * p) % 12 for p in range(3)] for s in range(12)],    # 1st, 5th, 9th
+    4: lambda: [[(s + 3 * p) % 12 for p in range(4)] for s in range(12)],    # 1st, 4th, 7th, 10th
+    7: lambda: _by_start(7, lambda s: s if _odd(s) else s + 6),
+    9: lambda: _by_start(9, lambda s: (s, s + 8, s + 4)[s % 3]),
+    10: lambda: _by_start(10, lambda s: s if _odd(s) else s + 8),
+    12: lambda: _by_start(12, lambda s: s),
+    16: lambda: _by_start(16, lambda s: (0, 4, 8)[s % 3]),                   # Aries, Leo, Sagittarius
+    20: lambda: _by_start(20, lambda s: (0, 8, 4)[s % 3]),                   # Aries, Sagittarius, Leo
+    24: lambda: _by_start(24, lambda s: 4 if _odd(s) else 3),                # Leo / Cancer
+    27: lambda: _by_start(27, lambda s: (0, 3, 6, 9)[s % 4]),                # fire, earth, air, water
+    30: _trimsamsa,
+    40: lambda: _by_start(40, lambda s: 0 if _odd(s) else 6),                # Aries / Libra
+    45: lambda: _by_start(45, lambda s: (0, 4, 8)[s % 3]),
+    60: lambda: _by_start(60, lambda s: s),
+}
+
+# d -> (12, parts) int8 table of 0-based signs, and the width of one part in degrees
+TABLES = {d: np.array(rule(), dtype=np.int8) for d, rule in _RULES.items()}
+PART_DEG = {d: 30.0 / t.shape[1] for d, t in TABLES.items()}
+_LISTS = {d: t.tolist() for d, t in TABLES.items()}
+
+
+def varga_sign(lon_sid, d):
+    """Sign (1..12) of a sidereal longitude in the D-d chart."""
+    lon = lon_sid % 360.0
+    s = int(lon // 30) % 12   # a tiny negative longitude wraps to exactly 360.0
+    row = _LISTS[d][s]
+    p = min(int((lon % 30.0) // PART_DEG[d]), len(row) - 1)
+    return row[p] + 1
+
+
+def varga_signs(lons, d):
+    """Vectorised varga_sign: int8 signs (1..12) with the shape of lons."""
+    lon = np.mod(np.asarray(lons, dtype=float), 360.0)
+    table = TABLES[d]
+    s = (lon // 30.0).astype(np.intp) % 12
+    p = np.minimum((np.mod(lon, 30.0) // PART_DEG[d]).astype(np.intp), table.shape[1] - 1)
+    return table[s, p] + 1
+
+
+def shodashvarga(lons, vargas=SHODASHVARGA):
+    """{d: varga_signs(lons, d)} for each requested division (default: all 16)."""
+    lon = np.mod(np.asarray(lons, dtype=float), 360.0)
+    s = (lon // 30.0).astype(np.intp) % 12
+    deg = np.mod(lon, 30.0)
+    out = {}
+    for d in vargas:
+        table = TABLES[d]
+        p = np.minimum((deg // PART_DEG[d]).astype(np.intp), table.shape[1] - 1)
+        out[d] = table[s, p] + 1
+    return out
+
+
+def navamsa_sign(lon_sid):
+    return varga_sign(lon_sid, 9)
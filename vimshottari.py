@@ -0,0 +1,157 @@
+# vimshottari.py
+# Vimshottari dasha tree: Mahadasha -> Antardasha -> Pratyantardasha -> ...
+# expanded lazily and searched with bisect.
+# Usage:
+#   tree = DashaTree(birth_utc, moon_sid)                  # 120 years from birth
+#   [p.lord for p in tree.path_at(now_utc, depth=3)]       # ['Ra', 'Ve', 'Sa']
+#   for p in tree.upcoming(now_utc, level=2, k=5):         # current + next 4 antardashas
+#       print(p.lords, p.start, p.end)
+#   tree.mahadashas                                        # level 1, always built
+#
+# Only the ~10 mahadashas are built up front. A period's nine sub-periods
+# are created the first time they are asked for, and kept with a sorted list
+# of their start offsets so "which sub-period contains t" is one bisect per
+# level. Times are float days from birth internally; .start/.end convert
+# to UTC datetimes. A full 120-year, 5-level tree (9**5 leaves per cycle) is
+# only built if someone iterates all of it.
+
+from __future__ import annotations
+import datetime
+from bisect import bisect_right
+from itertools import islice
+
+YEAR_DAYS = 365.2422
+ORDER = ['Ke','Ve','Su','Mo','Ma','Ra','Ju','Sa','Me']
+YEARS = {'Ke':7,'Ve':20,'Su':6,'Mo':10,'Ma':7,'Ra':18,'Ju':16,'Sa':19,'Me':17}
+CYCLE_YEARS = 120
+DASHA_YEARS = 120
+LEVEL_NAMES = {1: 'mahadasha', 2: 'antardasha', 3: 'pratyantardasha', 4: 'sookshma', 5: 'prana'}
+
+
+def moon_balance_days(moon_sid):
+    NAK=360.0/27.0; part = moon_sid % 360.0; ni = int(part // NAK); pos = part - ni*NAK
+    md_lord = ORDER[ni % 9]; frac = pos/NAK; remaining_days = YEARS[md_lord]*(1 - frac)*YEAR_DAYS
+    return md_lord, remaining_days
+
+
+class DashaPeriod:
+    """One period at some level. lords = (mahadasha lord, antardasha lord, ...)."""
+    __slots__ = ('tree', 'lords', 't0', 'span', 'start_d', 'end_d', '_kids', '_kid_starts')
+
+    def __init__(self, tree, lords, t0, span, start_d, end_d):
+        self.tree = tree
+        self.lords = lords
+        self.t0, self.span = t0, span              # nominal start and full length (days)
+        self.start_d, self.end_d = start_d, end_d  # clipped to birth .. end of tree
+        self._kids = None
+        self._kid_starts = None
+
+    @property
+    def lord(self):
+        return self.lords[-1]
+
+    @property
+    def level(self):
+        return len(self.lords)
+
+    @property
+    def start(self):
+        return self.tree.to_datetime(self.start_d)
+
+    @property
+    def end(self):
+        return self.tree.to_datetime(self.end_d)
+
+    def children(self):
+        """The sub-periods, built on first use: nine lords from this one, lengths in proportion to YEARS."""
+        if self._kids is None:
+            kids = []
+            t = self.t0
+            k = ORDER.index(self.lord)
+            for j in range(9):
+                lord = ORDER[(k + j) % 9]
+                span = self.span * YEARS[lord] / CYCLE_YEARS
+                s, e = max(t, self.start_d), min(t + span, self.end_d)
+                if e > s:
+                    kids.append(DashaPeriod(self.tree, self.lords + (lord,), t, span, s, e))
+                t += span
+            self._kids = kids
+            self._kid_starts = [p.start_d for p in kids]
+        return self._kids
+
+    def child_at(self, d):
+        kids = self.children()
+        return _find(kids, self._kid_starts, d)
+
+    def __repr__(self):
+        return f"DashaPeriod({'/'.join(self.lords)}, {self.start:%Y-%m-%d} .. {self.end:%Y-%m-%d})"
+
+
+def _find(periods, starts, d):
+    i = bisect_right(starts, d) - 1
+    if i >= 0 and d < periods[i].end_d:
+        return periods[i]
+    return None
+
+
+class DashaTree:
+    """Vimshottari periods from birth for `years` years (mahadashas clipped at both ends)."""
+
+    def __init__(self, birth_utc, moon_sid, years=DASHA_YEARS):
+        self.birth_utc = birth_utc
+        self.limit_d = years * YEAR_DAYS
+        md_lord, rem_days = moon_balance_days(moon_sid)
+        self.balance_days = rem_days
+        # The birth mahadasha began before birth: its sub-periods run from that notional start
+        t = rem_days - YEARS[md_lord] * YEAR_DAYS
+        k = ORDER.index(md_lord)
+        self.mahadashas = []
+        while t < self.limit_d:
+            lord = ORDER[k % 9]
+            span = YEARS[lord] * YEAR_DAYS
+            self.mahadashas.append(DashaPeriod(self, (lord,), t, span, max(t, 0.0), min(t + span, self.limit_d)))
+            t += span
+            k += 1
+        self._md_starts = [p.start_d for p in self.mahadashas]
+
+    def to_days(self, dt_utc):
+        return (dt_utc - self.birth_utc) / datetime.timedelta(days=1)
+
+    def to_datetime(self, d):
+        return self.birth_utc + datetime.timedelta(days=d)
+
+    def path_at(self, dt_utc, depth=3):
+        """[mahadasha, antardasha, ...] active at dt_utc, `depth` levels deep ([] outside the tree)."""
+        d = self.to_days(dt_utc)
+        p = _find(self.mahadashas, self._md_starts, d)
+        path = []
+        while p is not None:
+            path.append(p)
+            if len(path) == depth:
+                break
+            p = p.child_at(d)
+        return path
+
+    def active(self, dt_utc, level=1):
+        path = self.path_at(dt_utc, level)
+        return path[-1] if len(path) == level else None
+
+    def _iter_level(self, periods, starts, level, d):
+        i = max(bisect_right(starts, d) - 1, 0)
+        for p in periods[i:]:
+            if p.end_d <= d:
+                continue
+            if p.level == level:
+                yield p
+            else:
+                p.children()
+                yield from self._iter_level(p._kids, p._kid_starts, level, d)
+
+    def periods(self, level=1, after=None):
+        """Periods at `level` in time order, lazily; after=dt starts with the one active then."""
+        d = float('-inf') if after is None else self.to_days(after)
+        return self._iter_level(self.mahadashas, self._md_starts, level, d)
+
+    def upcoming(self, dt_utc, level=2, k=5):
+        """The period active at dt_utc and the ones after it: k periods at `level`."""
+        return list(islice(self.periods(level, after=dt_utc), k))
@@ -0,0 +1,101 @@
+# vml_fragments.py
+# Parse-once cache for the VML/WordprocessingML snippets the kundali DOCX is
+# built from (section header bars, frames, chart shapes).
+# Usage:
+#   HEADER = VmlFragment('<w:p ...><w:t>{title}</w:t>...width:{width}pt...</w:p>')
+#   container._element.append(HEADER.render(title="फलित", width=260))
+#
+# A template is parsed with python-docx's parser once. The positions of its
+# {slot} placeholders (attribute values and element text) are recorded as
+# child-index paths, and render() deep-copies the parsed tree and fills only
+# those spots. Values go in through lxml, so they are escaped correctly
+# (an "&" in a name no longer breaks the XML).
+#
+# Benchmark (parse per use vs. clone + fill):
+#   python vml_fragments.py
+
+from __future__ import annotations
+import copy
+import re
+
+from docx.oxml import parse_xml
+from lxml import etree
+
+_SLOT = re.compile(r"\{(\w+)\}")
+# python-docx elements (CT_P, CT_R, ...) redefine .text; slots use lxml's own node text
+_NODE_TEXT = etree._Element.text
+
+
+def _fill(template, values):
+    return template.format_map(values)
+
+
+class VmlFragment:
+    """One XML template, parsed once; render(**slots) returns a fresh filled-in copy."""
+
+    def __init__(self, xml):
+        self.xml = xml
+        self._root = parse_xml(xml)  # braces are legal XML, so the template parses as-is
+        self._attr_slots = []   # (path, attribute, template)
+        self._text_slots = []   # (path, template)
+        for path, node in self._walk(self._root):
+            for name, value in node.attrib.items():
+                if _SLOT.search(value):
+                    self._attr_slots.append((path, name, value))
+            text = _NODE_TEXT.__get__(node)
+            if text and _SLOT.search(text):
+                self._text_slots.append((path, text))
+
+    @staticmethod
+    def _walk(root, path=()):
+        yield path, root
+        for i, child in enumerate(root):
+            yield from VmlFragment._walk(child, path + (i,))
+
+    @staticmethod
+    def _at(root, path):
+        node = root
+        for i in path:
+            node = node[i]
+        return node
+
+    def render(self, **values):
+        el = copy.deepcopy(self._root)
+        for path, name, template in self._attr_slots:
+            self._at(el, path).set(name, _fill(template, values))
+        for path, template in self._text_slots:
+            _NODE_TEXT.__set__(self._at(el, path), _fill(template, values))
+        return el
+
+
+def _benchmark(n=1000):
+    """Per-document VML work: 7 section headers and 2 chart layers (frame + 12 house numbers)."""
+    import timeit
+    from kundali_docx import (SECTION_HEADER_XML, SECTION_HEADER, CHART_FRAME, CHART_NUM_BOX,
+                              _chart_layer, _CHART_GROUP_PATH)
+    header = dict(title="विंशोत्तरी महादशा", width=260, jc="center")
+    S = 256
+    frame = dict(S=S, H=int(S * 0.8), L=0, T=0, R=S, B=S, M=S / 2)
+    boxes = tuple((20.0 + 15 * i, 30.0 + 12 * i, str(i + 1)) for i in range(12))
+    num_xml = "".join(_fill(CHART_NUM_BOX.xml, dict(left=l, top=t, w=10, h=12, txt=x)) for l, t, x in boxes)
+    chart_xml = CHART_FRAME.xml.replace("</v:group>", num_xml.replace("{", "{{").replace("}", "}}") + "</v:group>")
+
+    def per_doc_parse():
+        for _ in range(7):
+            parse_xml(_fill(SECTION_HEADER_XML, header))
+        for _ in range(2):
+            parse_xml(_fill(chart_xml, frame))
+
+    def per_doc_fragments():
+        for _ in range(7):
+            SECTION_HEADER.render(**header)
+        for _ in range(2):
+            copy.deepcopy(_chart_layer(S, 1)).find(_CHART_GROUP_PATH)
+
+    t_parse = timeit.timeit(per_doc_parse, number=n) / n
+    t_frag = timeit.timeit(per_doc_fragments, number=n) / n
+    print(f"per document: parse {t_parse * 1e3:.3f} ms, fragments {t_frag * 1e3:.3f} ms "
+          f"({t_parse / t_frag:.1f}x)")
+
+if __name__ == "__main__":
+    _benchmark()
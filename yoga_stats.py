@@ -0,0 +1,241 @@
+# yoga_stats.py
+# Population statistics: how often each प्रमुख बिंदु yoga/dosha occurs among
+# births over a date range and a set of places, streamed to CSV.
+# Usage:
+#   python yoga_stats.py --start 1900 --end 2050 --sample 20000 --out yoga_stats.csv
+#   python yoga_stats.py --start 2000 --end 2009 --sweep 1h --loc 28.6139,77.2090 --loc 19.0760,72.8777
+#   python yoga_stats.py --start 1900 --end 2050 --sample 5000 --lat-range=-60,60 --per decade --workers 8
+#   python yoga_stats.py ... --exact     # Swiss Ephemeris per chart instead of interpolated daily anchors
+#
+# Birth instants are either swept on a fixed UTC step (--sweep 1h, 30m, 1d)
+# or drawn uniformly at random (--sample N births per year of range) for each
+# place; with --lat-range/--lon-range every birth gets its own random place
+# instead (uniform over that band of the globe). One CSV row is written per
+# period (--per year|decade|all) and place, flushed as soon as the period is
+# done, plus a final whole-range row per place.
+#
+# Charts are processed CHUNK at a time as NumPy arrays: positions from
+# sidereal_positions_interp (exact daily anchors + Hermite interpolation; the
+# ascendant is exact), then every yoga in yogas.PRAMUKH_YOGAS in one
+# yogas.evaluate() pass. Only per-period counts are kept, so memory stays
+# flat however many charts are processed. Sade sati is transit-dependent, not
+# a birth-chart property, and is not counted.
+
+import argparse
+import csv
+import datetime
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ephemeris import sidereal_positions_batch, sidereal_positions_interp
+from yogas import PRAMUKH_YOGAS, chart_batch, evaluate
+
+CHUNK = int(os.environ.get("MRIDAASTRO_YOGA_STATS_CHUNK", "20000"))
+MAX_PENDING_PER_WORKER = 4
+DEFAULT_PLACE = (28.6139, 77.2090)   # New Delhi
+_YEAR_S = 365.2425 * 86400
+
+
+def _positions(dts, lat, lon, exact=False):
+    """EphemerisBatch for a chunk; interpolation only pays when charts outnumber anchor days."""
+    span_days = (dts.max() - dts.min()) / np.timedelta64(1, 'D')
+    if exact or span_days + 2 >= len(dts):
+        return sidereal_positions_batch(dts, lat, lon)
+    return sidereal_positions_interp(dts, lat, lon)
+
+
+def _random_places(rng, n, lat_range, lon_range):
+    """n places spread uniformly over the sphere within the lat/lon band."""
+    s0, s1 = np.sin(np.radians(lat_range))
+    lat = np.degrees(np.arcsin(rng.uniform(s0, s1, n)))
+    return lat, rng.uniform(lon_range[0], lon_range[1], n)
+
+
+def _instants(p0, p1, start, sweep, sample, rng):
+    """Yield chunks of datetime64[s] birth instants in [p0, p1)."""
+    if sweep is not None:
+        step = sweep.astype('timedelta64[s]').astype(np.int64)
+        first = -(-(p0 - start).astype(np.int64) // step)      # first grid point at or after p0
+        last = -(-(p1 - start).astype(np.int64) // step)
+        for k in range(first, last, CHUNK):
+            yield start + np.arange(k, min(k + CHUNK, last), dtype=np.int64) * step
+        return
+    secs = (p1 - p0).astype(np.int64)
+    n = int(round(sample * secs / _YEAR_S))
+    for k in range(0, n, CHUNK):
+        yield p0 + np.sort(rng.integers(0, secs, min(CHUNK, n - k))).astype('timedelta64[s]')
+
+
+def count_period(p0, p1, start, place, sweep=None, sample=None, seed=0, exact=False, yogas=PRAMUKH_YOGAS,
+                 stream=0):
+    """(charts, counts per yoga) for births in [p0, p1) at place ((lat, lon) or a random-band spec)."""
+    # One generator per (period, place): the same numbers whatever the worker count
+    rng = np.random.default_rng([seed, int((p0 - start).astype(np.int64)), stream])
+    charts = 0
+    counts = np.zeros(len(yogas), dtype=np.int64)
+    for dts in _instants(p0, p1, start, sweep, sample, rng):
+        if place[0] == 'random':
+            lat, lon = _random_places(rng, len(dts), place[1], place[2])
+        else:
+            lat, lon = place
+        eph = _positions(dts, lat, lon, exact)
+        counts += evaluate(chart_batch(eph.lon, eph.lagna_sign), yogas).sum(axis=0)
+        charts += len(dts)
+    return charts, counts
+
+
+def _task(args):
+    return count_period(*args)
+
+
+def _periods(start, end, per):
+    """[p0, p1) datetime64[s] bounds covering start..end."""
+    if per == 'all':
+        yield start, end
+        return
+    width = 10 if per == 'decade' else 1
+    y = start.astype('datetime64[Y]').astype(int) + 1970
+    y -= y % width
+    p0 = start
+    while p0 < end:
+        y += width
+        p1 = min(np.datetime64(f"{y:04d}-01-01", 's'), end)
+        yield p0, p1
+        p0 = p1
+
+
+def _ordered(pool, fn, tasks, max_pending):
+    """pool.map that keeps at most max_pending tasks in flight (results in task order)."""
+    pending = deque()
+    for t in tasks:
+        pending.append(pool.submit(fn, t))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run_stats(start, end, places, out, per='year', sweep=None, sample=None, seed=0, exact=False,
+              workers=1, yogas=PRAMUKH_YOGAS, log=sys.stderr):
+    """Count every yoga over [start, end) for each place, writing CSV rows to `out` as periods finish."""
+    w = csv.writer(out)
+    w.writerow(['period_start', 'period_end', 'place', 'charts']
+               + [y.key for y in yogas] + [f"{y.key}_pct" for y in yogas])
+    out.flush()
+
+    def row(p0, p1, label, charts, counts):
+        pct = [f"{100.0 * c / charts:.4f}" if charts else "" for c in counts]
+        w.writerow([str(p0.astype('datetime64[D]')), str(p1.astype('datetime64[D]')), label, int(charts)]
+                   + [int(c) for c in counts] + pct)
+        out.flush()
+
+    labels = ['random' if p[0] == 'random' else f"{p[0]:.4f},{p[1]:.4f}" for p in places]
+    # Work unit = one calendar year at one place, whatever the reporting period: years
+    # run in parallel, keep the interpolation anchors short, and sample the same way
+    periods = list(_periods(start, end, per))
+    work, owner = [], []
+    for j, (p0, p1) in enumerate(periods):
+        for y0, y1 in _periods(p0, p1, 'year'):
+            for k, place in enumerate(places):
+                work.append((y0, y1, start, place, sweep, sample, seed, exact, yogas, k))
+                owner.append((j, k))
+    charts_acc = np.zeros(len(places), dtype=np.int64)
+    counts_acc = np.zeros((len(places), len(yogas)), dtype=np.int64)
+    total_charts = np.zeros_like(charts_acc)
+    total_counts = np.zeros_like(counts_acc)
+
+    def flush(j):
+        for k, label in enumerate(labels):
+            row(*periods[j], label, charts_acc[k], counts_acc[k])
+        total_charts[:] += charts_acc
+        total_counts[:] += counts_acc
+        charts_acc[:] = 0
+        counts_acc[:] = 0
+
+    t0 = time.perf_counter()
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = _ordered(pool, _task, work, workers * MAX_PENDING_PER_WORKER)
+    else:
+        pool = None
+        results = map(_task, work)
+    current = 0
+    try:
+        for (j, k), (charts, counts) in zip(owner, results):
+            if j != current:
+                flush(current)
+                current = j
+            charts_acc[k] += charts
+            counts_acc[k] += counts
+        flush(current)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if len(periods) > 1:
+        for k, label in enumerate(labels):
+            row(start, end, label, total_charts[k], total_counts[k])
+    n = int(total_charts.sum())
+    elapsed = time.perf_counter() - t0
+    print(f"{n} charts in {elapsed:.1f}s ({n / elapsed if elapsed > 0 else 0:.0f} charts/s)", file=log)
+    return n
+
+
+def _parse_when(s, end=False):
+    """YYYY or YYYY-MM-DD -> datetime64[s]; a bare year as --end means through Dec 31."""
+    if len(s) == 4 and s.isdigit():
+        return np.datetime64(f"{int(s) + 1 if end else int(s):04d}-01-01", 's')
+    return np.datetime64(datetime.date.fromisoformat(s), 's')
+
+
+def _parse_step(s):
+    """'1h', '30m', '1d', '90s' -> timedelta64."""
+    unit = {'s': 's', 'm': 'm', 'h': 'h', 'd': 'D'}[s[-1].lower()]
+    return np.timedelta64(int(s[:-1]), unit)
+
+
+def _pair(s):
+    a, b = (float(x) for x in s.split(','))
+    return a, b
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Count yoga/dosha frequencies over many birth charts.")
+    ap.add_argument("--start", required=True, help="first birth date (YYYY or YYYY-MM-DD, UTC)")
+    ap.add_argument("--end", required=True, help="last birth date (YYYY = through Dec 31; YYYY-MM-DD exclusive)")
+    how = ap.add_mutually_exclusive_group(required=True)
+    how.add_argument("--sweep", type=_parse_step, help="every STEP from --start (e.g. 1h, 30m, 1d)")
+    how.add_argument("--sample", type=float, help="random births per year of range, per place")
+    ap.add_argument("--loc", type=_pair, action="append", metavar="LAT,LON",
+                    help="place of birth (repeatable; default New Delhi)")
+    ap.add_argument("--lat-range", type=_pair, metavar="MIN,MAX",
+                    help="random place per birth within this latitude band (Placidus needs |lat| < 66)")
+    ap.add_argument("--lon-range", type=_pair, default=(-180.0, 180.0), metavar="MIN,MAX")
+    ap.add_argument("--per", choices=("year", "decade", "all"), default="year", help="one row per period")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--exact", action="store_true", help="Swiss Ephemeris for every chart (slow)")
+    ap.add_argument("--workers", type=int, default=1, help="worker processes")
+    ap.add_argument("--out", default="-", help="CSV path ('-' = stdout)")
+    args = ap.parse_args(argv)
+
+    if args.lat_range:
+        places = [('random', args.lat_range, args.lon_range)]
+    else:
+        places = args.loc or [DEFAULT_PLACE]
+    start, end = _parse_when(args.start), _parse_when(args.end, end=True)
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        run_stats(start, end, places, out, per=args.per, sweep=args.sweep, sample=args.sample,
+                  seed=args.seed, exact=args.exact, workers=args.workers)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
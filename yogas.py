@@ -0,0 +1,249 @@
+# yogas.py
+# Declarative yoga / dosha rules, compiled once to sign and house bitmasks and
+# evaluated for one chart or a whole batch of charts in one vectorised pass.
+# Usage:
+#   from yogas import chart_yogas, chart_batch, evaluate, PRAMUKH_YOGAS
+#   [y.label for y in chart_yogas(ctx)]              # ['चांडाल योग', ...] for one ChartContext
+#   hits = evaluate(chart_batch(lons, lagnas))       # lons (N, 9) in PLANETS order -> bool (N, len(PRAMUKH_YOGAS))
+#
+#   GAJAKESARI = Yoga('gajakesari', 'गजकेसरी योग', HouseFrom('Ju', 'Mo', KENDRA))
+#   evaluate(batch, PRAMUKH_YOGAS + (GAJAKESARI,))
+#
+# A rule is a small tree of NamedTuples (Conjunct, InSign, Dignity, InHouse,
+# HouseFrom, DispositorInHouse, Hemmed, All, Any, Not). Compiling turns every
+# sign or house set into a 12-bit mask and every planet code into a column
+# index, so evaluation is a handful of numpy ands/ors over arrays of shape
+# (charts,) per rule, with signs, houses, dispositors and their bits computed
+# once per batch. All/Any stop as soon as the batch's answer is settled.
+# Compiled rule sets are cached, so adding yogas costs a few mask tests each
+# rather than another pass over raw longitudes.
+
+from __future__ import annotations
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+from kundali_chart import PLANETS, SIGN_LORD, EXALT_SIGN, DEBIL_SIGN, _as_context
+
+KENDRA = (1, 4, 7, 10)
+TRIKONA = (1, 5, 9)
+DUSTHANA = (6, 8, 12)
+SEVEN = ('Su', 'Mo', 'Ma', 'Me', 'Ju', 'Ve', 'Sa')   # planets without the nodes
+
+_COL = {code: i for i, code in enumerate(PLANETS)}
+_LORD_COL = np.array([_COL[SIGN_LORD[s]] for s in range(1, 13)], dtype=np.intp)   # sign index -> lord's column
+
+
+def _codes(x):
+    return (x,) if isinstance(x, str) else tuple(x)
+
+
+def _mask(numbers):
+    """12-bit mask of signs or houses numbered 1..12."""
+    if isinstance(numbers, int):
+        numbers = (numbers,)
+    m = 0
+    for n in numbers:
+        m |= 1 << (int(n) - 1)
+    return m
+
+
+class ChartBatch(NamedTuple):
+    """Per-chart planet placements, N charts x 9 planets (PLANETS order)."""
+    lons: np.ndarray       # sidereal longitudes
+    sign: np.ndarray       # rasi sign, 0..11
+    house: np.ndarray      # house from lagna, 0..11 (-1 without a lagna)
+    sign_bit: np.ndarray   # 1 << sign
+    house_bit: np.ndarray  # 1 << house (0 without a lagna)
+    lord_house_bit: np.ndarray  # house_bit of the lord of each planet's sign (its dispositor)
+
+
+def chart_batch(lons, lagna_signs=None):
+    """ChartBatch from an (N, 9) array of longitudes and N lagna signs (1..12)."""
+    lons = np.atleast_2d(np.asarray(lons, dtype=float))
+    sign = (lons // 30.0).astype(np.intp) % 12
+    if lagna_signs is None:
+        house = np.full_like(sign, -1)
+        house_bit = np.zeros_like(sign)
+    else:
+        lagna = np.asarray(lagna_signs, dtype=np.intp).reshape(-1, 1) - 1
+        house = (sign - lagna) % 12
+        house_bit = np.left_shift(1, house)
+    lord_house_bit = np.take_along_axis(house_bit, _LORD_COL[sign], axis=1)
+    return ChartBatch(lons, sign, house, np.left_shift(1, sign), house_bit, lord_house_bit)
+
+
+# ==== Rules ====
+
+class InSign(NamedTuple):
+    """planet occupies one of signs (1..12)."""
+    planet: str
+    signs: tuple
+
+    def compile(self):
+        i, m = _COL[self.planet], _mask(self.signs)
+        return lambda b: (b.sign_bit[:, i] & m) != 0
+
+
+class Dignity(NamedTuple):
+    """planet is 'exalt', 'debil' or 'own' in the rasi chart (never for Rahu/Ketu)."""
+    planet: str
+    kind: str
+
+    def compile(self):
+        p = self.planet
+        if p in ('Ra', 'Ke'):
+            signs = ()
+        elif self.kind == 'exalt':
+            signs = (EXALT_SIGN[p],)
+        elif self.kind == 'debil':
+            signs = (DEBIL_SIGN[p],)
+        elif self.kind == 'own':
+            signs = tuple(s for s, lord in SIGN_LORD.items() if lord == p)
+        else:
+            raise ValueError(f"unknown dignity {self.kind!r}")
+        return InSign(p, signs).compile()
+
+
+class InHouse(NamedTuple):
+    """planet sits in one of houses (1..12) from the lagna."""
+    planet: str
+    houses: tuple
+
+    def compile(self):
+        i, m = _COL[self.planet], _mask(self.houses)
+        return lambda b: (b.house_bit[:, i] & m) != 0
+
+
+class HouseFrom(NamedTuple):
+    """planet sits in one of houses (1..12) counted from ref's sign."""
+    planet: str
+    ref: str
+    houses: tuple
+
+    def compile(self):
+        i, j, m = _COL[self.planet], _COL[self.ref], _mask(self.houses)
+        return lambda b: (np.left_shift(1, (b.sign[:, i] - b.sign[:, j]) % 12) & m) != 0
+
+
+class Conjunct(NamedTuple):
+    """planet shares a rasi sign with any of others."""
+    planet: str
+    others: tuple
+
+    def compile(self):
+        i, cols = _COL[self.planet], [_COL[c] for c in _codes(self.others)]
+        return lambda b: (b.sign_bit[:, i] & np.bitwise_or.reduce(b.sign_bit[:, cols], axis=1)) != 0
+
+
+class DispositorInHouse(NamedTuple):
+    """The lord of the sign planet occupies sits in one of houses from the lagna."""
+    planet: str
+    houses: tuple
+
+    def compile(self):
+        i, m = _COL[self.planet], _mask(self.houses)
+        return lambda b: (b.lord_house_bit[:, i] & m) != 0
+
+
+class Hemmed(NamedTuple):
+    """Every one of planets lies on the half circle from start's longitude to the point opposite it."""
+    planets: tuple = SEVEN
+    start: str = 'Ra'
+
+    def compile(self):
+        s, cols = _COL[self.start], [_COL[c] for c in _codes(self.planets)]
+
+        def fn(b):
+            ra = b.lons[:, s] % 360.0
+            span = (((ra + 180.0) % 360.0) - ra) % 360.0   # 180, with the same rounding as per-chart code
+            ang = (b.lons[:, cols] - ra[:, None]) % 360.0
+            return (ang <= span[:, None]).all(axis=1)
+        return fn
+
+
+class All(NamedTuple):
+    rules: tuple
+
+    def compile(self):
+        first, *rest = [r.compile() for r in self.rules]
+
+        def fn(b):
+            out = first(b)
+            for f in rest:
+                if not out.any():   # already false for every chart in the batch
+                    break
+                out = out & f(b)
+            return out
+        return fn
+
+
+class Any(NamedTuple):
+    rules: tuple
+
+    def compile(self):
+        first, *rest = [r.compile() for r in self.rules]
+
+        def fn(b):
+            out = first(b)
+            for f in rest:
+                if out.all():       # already true for every chart in the batch
+                    break
+                out = out | f(b)
+            return out
+        return fn
+
+
+class Not(NamedTuple):
+    rule: object
+
+    def compile(self):
+        fn = self.rule.compile()
+        return lambda b: ~fn(b)
+
+
+class Yoga(NamedTuple):
+    key: str
+    label: str      # as printed in प्रमुख बिंदु
+    rule: object
+
+
+# प्रमुख बिंदु yogas/doshas, in report order
+PRAMUKH_YOGAS = (
+    Yoga('kaalsarp', 'कालसर्प दोष', Hemmed(SEVEN, 'Ra')),
+    Yoga('chandal', 'चांडाल योग', Conjunct('Ju', ('Ra', 'Ke'))),
+    Yoga('pitru', 'पितृ दोष', Conjunct('Su', ('Ra', 'Ke'))),
+    # A debilitated planet whose sign lord stands in a kendra from the lagna
+    Yoga('neech_bhang', 'नीच भंग राज योग',
+         Any(tuple(All((Dignity(p, 'debil'), DispositorInHouse(p, KENDRA))) for p in SEVEN))),
+)
+
+
+@functools.lru_cache(maxsize=16)
+def compile_yogas(yogas):
+    """One evaluator per yoga, for a tuple of Yoga."""
+    return tuple(y.rule.compile() for y in yogas)
+
+
+def evaluate(batch, yogas=PRAMUKH_YOGAS):
+    """bool array (charts, yogas): which yogas hold in which chart of a ChartBatch."""
+    yogas = tuple(yogas)
+    out = np.zeros((len(batch.lons), len(yogas)), dtype=bool)
+    for j, fn in enumerate(compile_yogas(yogas)):
+        out[:, j] = fn(batch)
+    return out
+
+
+def yoga_hits(ctx, lagna_sign=None, yogas=PRAMUKH_YOGAS):
+    """{key: bool} for one chart (ChartContext or sidelons dict)."""
+    ctx = _as_context(ctx, lagna_sign)
+    lagna = lagna_sign if lagna_sign is not None else ctx.lagna_sign
+    batch = chart_batch([[ctx.sidelons[c] for c in PLANETS]], None if lagna is None else [lagna])
+    return {y.key: bool(hit) for y, hit in zip(yogas, evaluate(batch, yogas)[0])}
+
+
+def chart_yogas(ctx, lagna_sign=None, yogas=PRAMUKH_YOGAS):
+    """The yogas (in the given order) that hold for one chart."""
+    hits = yoga_hits(ctx, lagna_sign, yogas)
+    return [y for y in yogas if hits[y.key]]